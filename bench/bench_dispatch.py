@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+"""Micro-benchmarks on message path
+
+- 'bench': message_create -> Hub.publish -> queue -> dispatch,
+  'Dispatcher' compared with an 'is_message_type' if/elif chain over
+  screen message types (message at the end of the chain is the worst
+  case).
+
+- 'tick_allocations': bytes allocated per idle clock tick (messages
+  created in clock_coro and master_coro) measured with 'tracemalloc',
+  compared with polling tick (STATUS_QUERY, status reply, full clock
+  update) using plain (dict based, not interned) dataclass messages.
+
+Usage (in repository root):
+
+    python -m bench.bench_dispatch [messages]
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from src.constants import TOPICS
+from src.dispatch import Dispatcher
+from src.messages import (is_message_type, message_create, message_types,
+                       message_clock_update)
+from src.publish_subsrcibe import Hub, Subscription
+
+# Screen message types, chain order as in screen_coro
+CHAIN_TYPES = [getattr(TOPICS.SCREEN_MESSAGES, name) for name in [
+    "INIT", "CLEAR", "SLEEP", "WAKEUP", "CLOSE", "UPDATE", "BUTTON_TXT",
+    "SPRITE", "MSG_INFO", "CLOCK", "ERROR", "QUESTION", "FIRMAWRE",
+    "NOW_PLAYING", "NETWORK_INFO", "CONFIG_TITLE", "DSCREEN", "STREAM_ICON",
+]]
+
+
+def _chain_action(msg) -> int:
+    """Baseline: linear if/elif chain."""
+    for i, message_type in enumerate(CHAIN_TYPES):
+        if is_message_type(msg, message_type):
+            return i
+    return -1
+
+
+def _dispatcher() -> Dispatcher:
+    dispatcher = Dispatcher("bench", default=lambda msg: -1)
+    for i, message_type in enumerate(CHAIN_TYPES):
+        dispatcher.register(message_type, lambda msg, i=i: i)
+    return dispatcher
+
+
+async def _publish_and_consume(action: Callable, messages: List, topic: str = "bench") -> float:
+    """Publish 'messages' to hub, consume and 'action' them.
+
+    :return: elapsed secs
+    """
+    hub = Hub()
+    with Subscription(hub=hub, topic=topic) as queue:
+        start = time.perf_counter()
+        for msg in messages:
+            hub.publish(topic=topic, message=msg)
+            action(await queue.get())
+        return time.perf_counter() - start
+
+
+def bench(n: int = 10000) -> Dict[str, float]:
+    """Return usecs per message for each path."""
+    # worst case for chain: last type
+    message_type = TOPICS.SCREEN_MESSAGES.STREAM_ICON
+    assert message_type in message_types()
+    dispatcher = _dispatcher()
+
+    start = time.perf_counter()
+    messages = [message_create(message_type=TOPICS.SCREEN_MESSAGES.DSCREEN,
+                               d={"screen_name": "bench"})
+                for _ in range(n)]
+    create = time.perf_counter() - start
+
+    messages = [message_create(message_type=message_type, d={"icon": "x.png"})
+                for _ in range(n)]
+    chain = asyncio.run(_publish_and_consume(_chain_action, messages))
+    table = asyncio.run(_publish_and_consume(dispatcher.dispatch, messages))
+    return {
+        "message_create": 1e6 * create / n,
+        "publish+chain": 1e6 * chain / n,
+        "publish+dispatch": 1e6 * table / n,
+    }
+
+
+# ------------------------------------------------------------------
+# Allocations per clock tick
+
+
+@dataclass
+class _PlainClockUpdate:
+    message_type: str
+    network_status: bool
+    streaming_status: bool
+    keyboard_status: bool
+    jrr_version: str
+
+
+@dataclass
+class _PlainStatusReply:
+    message_type: str
+    status_str: str
+    running: bool
+
+
+def _tick_messages() -> List:
+    """Messages created on one idle clock tick (statuses pushed on
+    change)."""
+    return [
+        # clock_coro
+        message_create(message_type=TOPICS.COMMON_MESSAGES.CLOCK_TICK),
+        # master_coro
+        message_clock_update(time=time.strftime("%H:%M:%S")),
+    ]
+
+
+def _plain_tick_messages() -> List:
+    """Polling tick messages as plain dataclasses created from dicts."""
+    return [
+        str(TOPICS.COMMON_MESSAGES.CLOCK_TICK),
+        str(TOPICS.STREAMER_MESSAGES.STATUS_QUERY),
+        _PlainClockUpdate(**{"message_type": TOPICS.SCREEN_MESSAGES.CLOCK,
+                             "network_status": True, "streaming_status": True,
+                             "keyboard_status": False, "jrr_version": "jrr-0.1.0"}),
+        _PlainStatusReply(**{"message_type": TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY,
+                             "status_str": "running", "running": True}),
+    ]
+
+
+def _bytes_per_tick(tick: Callable[[], List], n: int) -> float:
+    # warm up caches
+    tick()
+    ticks: List = [None] * n
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(n):
+            # keep messages alive as in queues waiting for consumers
+            ticks[i] = tick()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / n
+
+
+def tick_allocations(n: int = 1000) -> Dict[str, float]:
+    """Return bytes allocated per clock tick: messages module and
+    plain dataclass baseline."""
+    return {
+        "tick messages": _bytes_per_tick(_tick_messages, n),
+        "tick plain dataclasses": _bytes_per_tick(_plain_tick_messages, n),
+    }
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for path, usecs in bench(n).items():
+        print(f"{path:25s} {usecs:8.2f} us/msg")
+    for path, size in tick_allocations().items():
+        print(f"{path:25s} {size:8.1f} bytes/tick")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import pytest
+import json
+import os
+import time
+
+from src import channel_catalog
+from src.constants import APP_CONTEXT
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Fixtures
+
+
+def _write_catalog(path, count: int):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"name": "YLE Radio Suomi", "url": "http://yle/suomi",
+                            "icon": "icons/YLE-SUOMI.png", "tags": "news,fi"}) + "\n")
+        f.write(json.dumps({"name": "Yle Vega", "url": "http://yle/vega",
+                            "icon": "icons/YLE-Vega.png", "tags": ["SE", "news"]}) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps({"name": "no url"}) + "\n")
+        for i in range(count):
+            f.write(json.dumps({"name": f"Station {i:05d}", "url": f"http://s/{i}",
+                                "icon": f"icons/{i}.png", "tags": "jazz" if i % 2 else "rock"}) + "\n")
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    _write_catalog(tmp_path / APP_CONTEXT.CATALOG.FILE, count=20000)
+    return tmp_path
+
+
+@pytest.fixture
+def catalog(catalog_dir):
+    catalog = channel_catalog.open_catalog(str(catalog_dir))
+    yield catalog
+    catalog.close()
+    channel_catalog._catalogs.clear()
+
+# ------------------------------------------------------------------
+# Parsing and index
+
+
+def test_iter_catalog_skips_invalid(tmp_path):
+    path = tmp_path / "c.jsonl"
+    _write_catalog(path, count=1)
+    parsed = list(channel_catalog.iter_catalog(str(path)))
+    assert [c.name for c, _ in parsed] == ["YLE Radio Suomi", "Yle Vega", "Station 00000"]
+    assert parsed[1][1] == ["se", "news"]
+
+
+def test_open_catalog_missing(tmp_path):
+    assert channel_catalog.open_catalog(str(tmp_path)) is None
+
+
+def test_catalog_search_substring(catalog):
+    page = catalog.search("radio")
+    assert [c.name for c in page.channels] == ["YLE Radio Suomi"]
+    assert page.total == 1
+
+
+def test_catalog_search_prefix_and_tags(catalog):
+    assert [c.name for c in catalog.search("yl").channels] == [
+        "YLE Radio Suomi", "Yle Vega"]
+    assert [c.name for c in catalog.search("yle #se").channels] == ["Yle Vega"]
+    assert catalog.search("#jazz").total == 10000
+    assert catalog.search("vega suomi").total == 0
+
+
+def test_catalog_paging(catalog):
+    page1 = catalog.search("station", limit=10)
+    page2 = catalog.search("station", offset=10, limit=10)
+    assert page1.total == page2.total == 20000
+    assert page1.channels[0].name == "Station 00000"
+    assert page2.channels[0].name == "Station 00010"
+    assert page2.offset == 10
+
+
+def test_catalog_paging_exclude(catalog):
+    active = [f"Station {i:05d}" for i in range(10)]
+    page = catalog.search("station", limit=10, exclude=active)
+    assert page.total == 20000 - 10
+    assert [c.name for c in page.channels] == [
+        f"Station {i:05d}" for i in range(10, 20)]
+    # no query
+    assert catalog.search(exclude=["Yle Vega"]).total == 20000 + 1
+    assert catalog.search("yle #news", exclude=["Yle Vega"]).total == 1
+
+
+def test_catalog_index_reused(catalog_dir, catalog):
+    index_mtime = os.stat(catalog.index_path).st_mtime_ns
+    channel_catalog._catalogs.clear()
+    again = channel_catalog.open_catalog(str(catalog_dir))
+    assert os.stat(again.index_path).st_mtime_ns == index_mtime
+    again.close()
+
+
+def test_catalog_index_rebuilt_on_change(catalog_dir, catalog):
+    _write_catalog(catalog_dir / APP_CONTEXT.CATALOG.FILE, count=5)
+    again = channel_catalog.open_catalog(str(catalog_dir))
+    assert again.search("station").total == 5
+
+
+def test_catalog_search_latency(catalog):
+    start = time.monotonic()
+    for query in ["s", "st", "sta", "station 1234", "#rock", "radio suomi"]:
+        catalog.search(query)
+    assert (time.monotonic() - start) / 6 < 0.1
@@ -1,9 +1,13 @@
 import pytest
+from unittest.mock import patch, PropertyMock
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import time
 from typing import List
 from dataclasses import asdict
 
-from src import channel_manager
+from src import channel_manager, config, yaml_cache
 
 
 def test_framework():
@@ -34,3 +38,198 @@ def test_init_streams_extension_relative_path():
     print(f"{channels=}")
     assert channels is not None
     assert len(channels) == 1
+
+
+# ------------------------------------------------------------------
+# Shared http client and channel icons
+
+CHANNEL_INDEX = os.path.join(
+    os.path.dirname(__file__), "..", "resources", "channels", "index.yaml")
+
+
+@pytest.fixture
+def mock_icon_directory(tmp_path):
+    with patch.object(config.Config, 'icon_directory', new_callable=PropertyMock) as mock_property:
+        mock_property.return_value = str(tmp_path)
+        yield tmp_path
+
+
+def test_http_client_shared():
+    assert channel_manager.http_client() is channel_manager.http_client()
+
+
+def test_add_channel_icons_progress(mock_icon_directory):
+    channels = [
+        channel_manager.StreamConfig(name=icon, icon=f"icons/{icon}", url="")
+        for icon in ["YLE-1.png", "YLE-SUOMI.png", "YLE-Vega.png",
+                     "bluegrass-country.png"]
+    ]
+    calls = []
+    threads = set()
+
+    def _progress(done, total, channel):
+        calls.append((done, total))
+        threads.add(threading.current_thread().name)
+
+    channel_manager.add_channel_icons(
+        channels, yaml_url=CHANNEL_INDEX, progress=_progress)
+
+    assert calls == [(i + 1, len(channels)) for i in range(len(channels))]
+    # progress reported in calling thread
+    assert threads == {threading.current_thread().name}
+    for channel in channels:
+        assert os.path.exists(channel_manager.icon_path(channel))
+
+
+def test_add_channel_icons_error(mock_icon_directory):
+    channels = [
+        channel_manager.StreamConfig(name="ok", icon="icons/YLE-1.png", url=""),
+        channel_manager.StreamConfig(name="nok", icon="icons/missing.png", url=""),
+    ]
+    with pytest.raises(FileNotFoundError):
+        channel_manager.add_channel_icons(channels, yaml_url=CHANNEL_INDEX)
+    # error on one icon does not stop others
+    assert os.path.exists(channel_manager.icon_path(channels[0]))
+
+
+# ------------------------------------------------------------------
+# Conditional request cache
+
+@pytest.fixture
+def mock_http_cache_directory(tmp_path):
+    with patch.object(config.Config, 'http_cache_directory', new_callable=PropertyMock) as mock_property:
+        mock_property.return_value = str(tmp_path / "http-cache")
+        yield mock_property
+
+
+@pytest.fixture
+def etag_server():
+    """Local http server: '/<name>' answers body 'name' with ETag,
+    supports 'If-None-Match'. Records request paths and statuses."""
+    log = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = self.path.encode() * 10
+            etag = f'"{self.path}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                log.append((self.path, 304))
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            log.append((self.path, 200))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", log
+    server.shutdown()
+
+
+def test_read_file_revalidates(mock_http_cache_directory, etag_server):
+    base_url, log = etag_server
+    content1, status1 = channel_manager.read_file(f"{base_url}/index.yaml")
+    content2, status2 = channel_manager.read_file(f"{base_url}/index.yaml")
+    assert status1 and status2
+    assert content1 == content2 == "/index.yaml" * 10
+    assert log == [("/index.yaml", 200), ("/index.yaml", 304)]
+
+
+def test_http_cache_content_addressed(tmp_path):
+    cache = channel_manager.HttpCache(tmp_path, max_bytes=1000)
+    cache.put("http://a/1.png", b"same", {"ETag": "x"})
+    cache.put("http://b/2.png", b"same", {})
+    assert len(os.listdir(cache.objects_dir)) == 1
+    assert cache.get("http://b/2.png") == b"same"
+    assert cache.conditional_headers("http://a/1.png") == {"If-None-Match": "x"}
+    # index persisted
+    assert channel_manager.HttpCache(tmp_path, 1000).get("http://a/1.png") == b"same"
+
+
+def test_http_cache_lru_eviction(tmp_path):
+    cache = channel_manager.HttpCache(tmp_path, max_bytes=25)
+    cache.put("u1", b"1" * 10, {})
+    cache.put("u2", b"2" * 10, {})
+    time.sleep(0.01)
+    cache.get("u1")                       # u2 least recently used
+    cache.put("u3", b"3" * 10, {})
+    assert cache.get("u1") is not None
+    assert cache.get("u2") is None
+    assert cache.get("u3") is not None
+    assert len(os.listdir(cache.objects_dir)) == 2
+
+
+def test_http_cache_get_saves_use_time_lazily(tmp_path):
+    cache = channel_manager.HttpCache(tmp_path, max_bytes=1000, flush_interval=3600)
+    cache.put("u1", b"1", {})
+    saved = os.stat(cache.index_path).st_mtime_ns
+    used = cache._index["u1"]["used"]
+    time.sleep(0.01)
+    assert cache.get("u1") == b"1"
+    assert os.stat(cache.index_path).st_mtime_ns == saved
+    cache.flush()
+    reloaded = channel_manager.HttpCache(tmp_path, 1000)
+    assert reloaded._index["u1"]["used"] > used
+
+
+# ------------------------------------------------------------------
+# Channel store
+
+@pytest.fixture
+def mock_streams_yaml(tmp_path):
+    streams_yaml = tmp_path / "jrr_streams.yaml"
+    streams_yaml.write_text(
+        "- {name: a, icon: a.png, url: 'http://a'}\n"
+        "- {name: b, icon: b.png, url: 'http://b'}\n"
+        "- {name: c, icon: c.png, url: 'http://c'}\n")
+    with patch.object(config.Config, 'streams_yaml', new_callable=PropertyMock) as mock_property:
+        mock_property.return_value = str(streams_yaml)
+        yield streams_yaml
+
+
+def test_channel_store_cached(mock_streams_yaml, monkeypatch):
+    store = channel_manager.ChannelStore()
+    streams, factory_reset_done = store.load()
+    assert not factory_reset_done
+    assert [s.name for s in streams] == ["a", "b", "c"]
+    assert store.neighbours() == [("b", "c"), ("c", "a"), ("a", "b")]
+    version = store.version
+
+    # unchanged file not parsed again
+    def _fail(_):
+        raise AssertionError("parsed again")
+    monkeypatch.setattr(channel_manager, "parse_channels", _fail)
+    assert store.load()[0] is streams
+    assert store.version == version
+
+
+def test_channel_store_reload_on_change(mock_streams_yaml):
+    store = channel_manager.ChannelStore()
+    store.load()
+    mock_streams_yaml.write_text("- {name: x, icon: x.png, url: 'http://x'}\n")
+    streams, _ = store.load()
+    assert [s.name for s in streams] == ["x"]
+    assert store.neighbours() == [("x", "x")]
+
+
+def test_channel_store_save_atomic(mock_streams_yaml):
+    store = channel_manager.ChannelStore()
+    streams, _ = store.load()
+    version = store.version
+    store.save(streams[:2])
+    assert store.version == version + 1
+    # only streams yaml and its snapshot in directory (no temporary files left)
+    assert sorted(os.listdir(mock_streams_yaml.parent)) == sorted([
+        mock_streams_yaml.name,
+        os.path.basename(yaml_cache.snapshot_path(str(mock_streams_yaml)))])
+    assert [s.name for s in channel_manager.ChannelStore().load()[0]] == ["a", "b"]
+    # own write does not cause re-read
+    assert store.load()[0] is store._streams
@@ -109,3 +109,14 @@ def test_string(capsys):
     assert f"moc_publish:command='!', topic='{topic}'" in captured.out
     assert f"message_type:command='|', message_type='{msg1}'" in captured.out
     assert f"mock_clear:command='.'" in captured.out
+
+
+def test_command_stats(capsys):
+    hub = Hub()
+    hub.publish(topic="t", message="PING")
+    ret = debugger.process_cmd(line="%", hub=hub)
+    assert ret
+    captured = capsys.readouterr()
+    assert "PING" in captured.out
+    debugger.process_cmd(line="%-", hub=hub)
+    assert hub.stats.published == {}
@@ -0,0 +1,102 @@
+import pytest
+
+import asyncio
+
+from src.constants import TOPICS
+from src.dispatch import Dispatcher
+from src.messages import (message_create, message_type_of, is_message_type,
+                          message_exit, message_halt, message_halt_ack,
+                          message_streamer_status_reply, MsgScreenIcon)
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# messages
+
+
+def test_message_create_keeps_input():
+    d = {"icon": "x.png"}
+    msg = message_create(message_type=TOPICS.SCREEN_MESSAGES.STREAM_ICON, d=d)
+    assert isinstance(msg, MsgScreenIcon)
+    assert msg.message_type == TOPICS.SCREEN_MESSAGES.STREAM_ICON
+    assert d == {"icon": "x.png"}
+
+    # message_type in dict
+    msg = message_create(d={"message_type": TOPICS.SCREEN_MESSAGES.STREAM_ICON,
+                            "icon": "y.png"})
+    assert msg.icon == "y.png"
+
+    # simple message is string
+    assert message_create(message_type=TOPICS.SCREEN_MESSAGES.CLEAR) == \
+        TOPICS.SCREEN_MESSAGES.CLEAR
+
+
+def test_message_create_error_note():
+    with pytest.raises(TypeError) as e:
+        message_create(message_type=TOPICS.SCREEN_MESSAGES.STREAM_ICON, d={"bad": 1})
+    assert "icon" in "".join(e.value.__notes__)
+
+
+def test_is_message_type():
+    msg = message_exit(source=TOPICS.HALT_SOURCE.MESSAGE)
+    assert message_type_of(msg) == TOPICS.COMMON_MESSAGES.EXIT
+    assert is_message_type(msg, TOPICS.COMMON_MESSAGES.EXIT)
+    assert is_message_type(msg, [TOPICS.COMMON_MESSAGES.PING, TOPICS.COMMON_MESSAGES.EXIT])
+    assert is_message_type(TOPICS.SCREEN_MESSAGES.CLEAR, TOPICS.SCREEN_MESSAGES.CLEAR)
+    assert not is_message_type(TOPICS.SCREEN_MESSAGES.CLEAR, TOPICS.SCREEN_MESSAGES.INIT)
+
+# ------------------------------------------------------------------
+# Dispatcher
+
+
+def test_dispatcher():
+    dispatcher = Dispatcher("test")
+
+    @dispatcher.on(TOPICS.SCREEN_MESSAGES.CLEAR, TOPICS.SCREEN_MESSAGES.INIT)
+    def _clear_or_init(msg, hub):
+        return ("clear_or_init", msg, hub)
+
+    @dispatcher.on(TOPICS.SCREEN_MESSAGES.STREAM_ICON)
+    async def _icon(msg, hub):
+        return msg.icon
+
+    assert dispatcher.dispatch(TOPICS.SCREEN_MESSAGES.INIT, "hub") == \
+        ("clear_or_init", TOPICS.SCREEN_MESSAGES.INIT, "hub")
+    icon = message_create(message_type=TOPICS.SCREEN_MESSAGES.STREAM_ICON,
+                          d={"icon": "x.png"})
+    assert asyncio.run(dispatcher.dispatch(icon, hub=None)) == "x.png"
+    assert TOPICS.SCREEN_MESSAGES.CLEAR in dispatcher
+
+    # no handler, no default
+    with pytest.raises(KeyError):
+        dispatcher.dispatch(TOPICS.COMMON_MESSAGES.PING, None)
+
+    @dispatcher.otherwise
+    def _default(msg, hub):
+        return "default"
+    assert dispatcher.dispatch(TOPICS.COMMON_MESSAGES.PING, None) == "default"
+
+    # one handler per type
+    with pytest.raises(ValueError):
+        dispatcher.register(TOPICS.SCREEN_MESSAGES.CLEAR, _default)
+
+
+def test_payload_free_messages_interned():
+    assert message_create(message_type=TOPICS.CONTROL_MESSAGES.REBOOT) is \
+        message_create(message_type=TOPICS.CONTROL_MESSAGES.REBOOT)
+    assert message_exit(TOPICS.HALT_SOURCE.SIGNAL) is message_exit(TOPICS.HALT_SOURCE.SIGNAL)
+    assert message_halt(TOPICS.HALT_SOURCE.GPIO) is not message_halt_ack(TOPICS.HALT_SOURCE.GPIO)
+    assert message_streamer_status_reply(status_str="ok", running=True) is \
+        message_streamer_status_reply(status_str="ok", running=True)
+
+
+def test_messages_frozen_and_slotted():
+    msg = message_create(message_type=TOPICS.SCREEN_MESSAGES.STREAM_ICON, d={"icon": "x.png"})
+    assert not hasattr(msg, "__dict__")
+    with pytest.raises(AttributeError):
+        msg.icon = "y.png"
+    # interned message cannot be modified by a consumer
+    with pytest.raises(AttributeError):
+        message_exit(TOPICS.HALT_SOURCE.SIGNAL).source = TOPICS.HALT_SOURCE.GPIO
@@ -3,8 +3,9 @@ import pytest
 import re
 
 from src import dscreen
-from src.constants import KEYBOARD, DSCREEN
-from src.messages import MsgDScreen
+from src.constants import KEYBOARD, DSCREEN, TOPICS
+from src.messages import (MsgDScreen, MsgKeyVal, message_dscreen, message_keys,
+                          message_props)
 # from constants import DSCREEN
 
 
@@ -468,3 +469,56 @@ def test_dapp_no_such_screen():
     assert dapp.lastError is not None
     assert dapp.lastError.startswith(
         dscreen.DSCREEN.MISC_ERRORS.UNKNOWN_SCREEN[0:10])
+
+
+# ------------------------------------------------------------------
+# Delta messages
+
+def test_dapp_delta_message():
+    dapp = dscreen.DApp()
+    dscreen1 = dscreen.DScreen(fieldTypes=[ft_text1, ft_text2, ft_text3])
+    dapp.addScreen("s1", dscreen1)
+    dapp.activateScreen("s1", [(ft_text2.name, "init")])
+
+    # first message after activation is full
+    msg = dapp.deltaMessage()
+    assert msg.full
+    assert msg.fieldCount == 3
+
+    # no change - no message
+    assert dapp.deltaMessage() is None
+
+    # one keystroke - one field
+    dapp.putInput("a")
+    dapp.putInput("b")
+    msg = dapp.deltaMessage()
+    assert not msg.full
+    assert [(kv.key, kv.val) for kv in msg.fields] == [(ft_text1.name, "ab")]
+
+    # cursor move only - nothing to show
+    dapp.putInput(KEYBOARD.LEFT)
+    assert dapp.deltaMessage() is None
+
+    # full message resets baseline
+    dapp.putInput("x")
+    assert dapp.message().fieldStrValue(ft_text1.name) == "axb"
+    assert dapp.deltaMessage() is None
+
+    # re-activation shows screen from scratch
+    dapp.activateScreen("s1")
+    assert dapp.deltaMessage().full
+
+
+def test_msg_dscreen_field_lookup():
+    msg = message_dscreen(screen_name="s", key_values=[("a", "1"), ("b", None)])
+    assert msg.fieldStrValue("a") == "1"
+    assert msg.fieldStrValue("b") == ""
+    assert msg.fieldStrValue("c") is None
+    assert msg.fieldByName("a") == MsgKeyVal(key="a", val="1")
+    # immutable
+    with pytest.raises(AttributeError):
+        msg.screen_name = "other"
+    # lookup index is not a message field
+    assert message_keys(TOPICS.SCREEN_MESSAGES.DSCREEN) == \
+        ["message_type", "screen_name", "fields", "full"]
+    assert "_index" not in message_props(msg)
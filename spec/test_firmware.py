@@ -3,7 +3,15 @@ from unittest.mock import patch, PropertyMock
 
 import os
 from pathlib import Path
+import glob
+import hashlib
+import json
 import shutil
+import stat
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from src import firmware, config
 from src import github
@@ -653,3 +661,477 @@ def test_firmware_cleanup_empty_repo(
     # No cleanup for empty local repo
     ret = firmware.firmware_cleanup()
     assert not ret
+
+# ------------------------------------------------------------------
+# firmware_download
+
+
+FIRMWARE_BYTES = bytes(range(256)) * 1000
+
+
+@pytest.fixture
+def range_server():
+    """Local http server supporting Range requests, first response
+    is cut in the middle."""
+    log = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start = 0
+            if "Range" in self.headers:
+                start = int(self.headers["Range"].split("=")[1].split("-")[0])
+            body = FIRMWARE_BYTES[start:]
+            log.append(start)
+            self.send_response(206 if start > 0 else 200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if len(log) == 1:
+                # connection dropped after half of content
+                self.wfile.write(body[:len(body) // 2])
+                self.wfile.flush()
+                self.connection.close()
+                return
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/jrr-0.2.0.zip", log
+    server.shutdown()
+
+
+def test_firmware_download_resumes_http(tmp_path, range_server):
+    url, log = range_server
+    dest = str(tmp_path / "jrr-0.2.0.zip")
+    progress = []
+    with patch.object(APP_CONTEXT.FIRMWARE_DOWNLOAD, "RETRY_DELAY", 0):
+        digest = firmware.firmware_download(
+            url, dest,
+            expected_sha256=hashlib.sha256(FIRMWARE_BYTES).hexdigest(),
+            progress=lambda done, total: progress.append((done, total)))
+    assert Path(dest).read_bytes() == FIRMWARE_BYTES
+    assert digest == hashlib.sha256(FIRMWARE_BYTES).hexdigest()
+    # second request continued from bytes written before the cut
+    assert log[0] == 0 and 0 < log[1] <= len(FIRMWARE_BYTES) // 2
+    assert progress[-1] == (len(FIRMWARE_BYTES), len(FIRMWARE_BYTES))
+    assert not os.path.exists(dest + APP_CONTEXT.FIRMWARE_DOWNLOAD.PART_SUFFIX)
+
+
+def test_firmware_download_resumes_part_file(tmp_path):
+    src = tmp_path / "jrr-0.2.0.zip"
+    src.write_bytes(FIRMWARE_BYTES)
+    dest = str(tmp_path / "local" / "jrr-0.2.0.zip")
+    os.makedirs(os.path.dirname(dest))
+    Path(dest + APP_CONTEXT.FIRMWARE_DOWNLOAD.PART_SUFFIX).write_bytes(
+        FIRMWARE_BYTES[:1000])
+    progress = []
+    firmware.firmware_download(
+        f"file://{src}", dest,
+        expected_sha256=hashlib.sha256(FIRMWARE_BYTES).hexdigest(),
+        progress=lambda done, total: progress.append(done))
+    assert Path(dest).read_bytes() == FIRMWARE_BYTES
+    assert progress[0] == 1000 + APP_CONTEXT.FIRMWARE_DOWNLOAD.CHUNK
+
+
+def test_firmware_download_checksum_mismatch(tmp_path):
+    src = tmp_path / "jrr-0.2.0.zip"
+    src.write_bytes(FIRMWARE_BYTES)
+    dest = str(tmp_path / "dest.zip")
+    with pytest.raises(firmware.FirmwareChecksumError):
+        firmware.firmware_download(f"file://{src}", dest, expected_sha256="00" * 32)
+    assert not os.path.exists(dest)
+    assert not os.path.exists(dest + APP_CONTEXT.FIRMWARE_DOWNLOAD.PART_SUFFIX)
+
+
+def test_firmware_choose_verifies_sidecar(tmp_path):
+    repo, local = tmp_path / "repo", tmp_path / "local"
+    os.makedirs(repo)
+    os.makedirs(local)
+    (repo / "jrr-0.2.0.zip").write_bytes(FIRMWARE_BYTES)
+    (repo / "jrr-0.2.0.zip.sha256").write_text("00" * 32 + "  jrr-0.2.0.zip\n")
+    fw = firmware.FirmwareVersion.create_repo_version(str(repo / "jrr-0.2.0.zip"))
+    with patch.object(config.Config, 'firmware_local_root',
+                      new_callable=PropertyMock) as mock_root:
+        mock_root.return_value = str(local)
+        with pytest.raises(firmware.FirmwareChecksumError):
+            firmware.firmware_choose(fw)
+        # no pending link for unverified firmware
+        assert os.listdir(local) == []
+
+        (repo / "jrr-0.2.0.zip.sha256").write_text(
+            hashlib.sha256(FIRMWARE_BYTES).hexdigest() + "  jrr-0.2.0.zip\n")
+        firmware.firmware_choose(fw)
+        assert sorted(os.listdir(local)) == sorted(
+            ["jrr-0.2.0.zip", APP_CONTEXT.FIRMWARE_PENDING_LINK])
+
+# ------------------------------------------------------------------
+# github tag cache, memoised local index
+
+
+@pytest.fixture
+def tags_server(tmp_path):
+    """Paged tag API stand-in with ETags, 'state["status"]' forces
+    error responses."""
+    state = {"log": [], "status": None}
+    pages = {"/tags": (["jrr-0.2.0", "jrr-0.1.9"], "/tags?page=2"),
+             "/tags?page=2": (["jrr-0.1.8"], None)}
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.replace("?per_page=100", "").replace("&per_page=100", "")
+            state["log"].append((path, self.headers.get("If-None-Match")))
+            if state["status"] is not None:
+                self.send_response(state["status"])
+                self.end_headers()
+                return
+            tags, next_page = pages[path]
+            etag = f'"{path}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps([{"name": t} for t in tags]).encode()
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            if next_page is not None:
+                base = f"http://127.0.0.1:{self.server.server_address[1]}"
+                self.send_header(
+                    "Link", f'<{base}{next_page}&per_page=100>; rel="next", '
+                    f'<{base}{next_page}&per_page=100>; rel="last"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch.object(config.Config, 'http_cache_directory',
+                      new_callable=PropertyMock) as mock_dir:
+        mock_dir.return_value = str(tmp_path)
+        yield f"http://127.0.0.1:{server.server_address[1]}/tags", state
+    server.shutdown()
+
+
+def test_github_tags_paged_and_cached(tags_server):
+    url, state = tags_server
+    assert github.github_tags(url) == ["jrr-0.2.0", "jrr-0.1.9", "jrr-0.1.8"]
+    assert [p for p, _ in state["log"]] == ["/tags", "/tags?page=2"]
+    # within TTL: no requests
+    assert github.github_tags(url) == ["jrr-0.2.0", "jrr-0.1.9", "jrr-0.1.8"]
+    assert len(state["log"]) == 2
+
+
+def test_github_tags_lazy(tags_server):
+    url, state = tags_server
+    assert next(github.iter_github_tags(url)) == "jrr-0.2.0"
+    assert [p for p, _ in state["log"]] == ["/tags"]
+
+
+def test_github_tags_conditional_and_stale(tags_server):
+    url, state = tags_server
+    github.github_tags(url)
+    with patch.object(APP_CONTEXT.GITHUB, "TAGS_TTL", -1):
+        # expired: revalidated with ETag
+        assert len(github.github_tags(url)) == 3
+        assert state["log"][2] == ("/tags", '"/tags"')
+        # rate limited: stale content served
+        state["status"] = 403
+        assert len(github.github_tags(url)) == 3
+
+
+def test_github_tags_error_without_cache(tags_server):
+    url, state = tags_server
+    state["status"] = 403
+    with pytest.raises(Exception):
+        github.github_tags(url)
+
+
+def test_firmware_local_index_memoised(mock_create_empty_local_root):
+    os.mkdir(os.path.join(LOCAL_ROOT_STAGE, "jrr-0.1.1"))
+    with patch("glob.glob", wraps=glob.glob) as mock_glob:
+        assert len(firmware.firmware_local_index()) == 1
+        assert len(firmware.firmware_local_index()) == 1
+        assert mock_glob.call_count == 1
+        os.mkdir(os.path.join(LOCAL_ROOT_STAGE, "jrr-0.1.2"))
+        assert len(firmware.firmware_local_index()) == 2
+        assert mock_glob.call_count == 2
+
+# ------------------------------------------------------------------
+# delta updates
+
+
+@pytest.fixture
+def delta_repo(tmp_path):
+    """Local root with current version jrr-jrr-0.1.1 and repo with
+    release jrr-0.1.2 (manifest + src files, 'b.py' changed)."""
+    local, repo = tmp_path / "local", tmp_path / "repo"
+    current = local / "jrr-jrr-0.1.1"
+    release = repo / "jrr-0.1.2" / "src"
+    for directory in [current / "sub", release / "sub"]:
+        os.makedirs(directory)
+    for root in [current, release]:
+        (root / "a.py").write_text("a = 1\n" * 100)
+        (root / "sub" / "c.py").write_text("c = 1\n")
+    (current / "b.py").write_text("b = 1\n")
+    (release / "b.py").write_text("b = 2\n")
+    (release / "new.py").write_text("new = 1\n")
+    os.symlink(current, local / APP_CONTEXT.FIRMWARE_CURRENT_LINK)
+    (repo / "jrr-0.1.2.zip").write_bytes(b"full archive")
+    firmware.firmware_write_manifest(
+        str(release),
+        str(repo / ("jrr-0.1.2.zip" + APP_CONTEXT.FIRMWARE_DELTA.MANIFEST_SUFFIX)),
+        version="jrr-0.1.2")
+    with patch.object(config.Config, 'firmware_local_root',
+                      new_callable=PropertyMock) as mock_root:
+        mock_root.return_value = str(local)
+        yield local, repo, current
+
+
+def test_firmware_delta_update(delta_repo):
+    local, repo, current = delta_repo
+    fw = firmware.FirmwareVersion.create_repo_version(str(repo / "jrr-0.1.2.zip"))
+    progress = []
+    dest = firmware.firmware_delta_update(
+        fw, progress=lambda done, total: progress.append((done, total)))
+
+    assert dest == str(local / "jrr-jrr-0.1.2")
+    assert os.path.realpath(firmware.firmware_pending_link()) == dest
+    release_manifest = firmware.firmware_manifest(
+        str(repo / "jrr-0.1.2" / "src"))
+    assert firmware.firmware_manifest(dest)["files"] == release_manifest["files"]
+    # unchanged files hard linked, changed downloaded
+    assert os.stat(os.path.join(dest, "a.py")).st_ino == os.stat(current / "a.py").st_ino
+    assert os.stat(os.path.join(dest, "sub", "c.py")).st_ino == \
+        os.stat(current / "sub" / "c.py").st_ino
+    assert os.stat(os.path.join(dest, "b.py")).st_ino != os.stat(current / "b.py").st_ino
+    assert progress[-1][0] == progress[-1][1]
+    assert not os.path.exists(dest + ".tmp")
+
+
+def test_firmware_delta_update_checksum_error(delta_repo):
+    local, repo, _ = delta_repo
+    (repo / "jrr-0.1.2" / "src" / "new.py").write_text("tampered\n")
+    fw = firmware.FirmwareVersion.create_repo_version(str(repo / "jrr-0.1.2.zip"))
+    with pytest.raises(firmware.FirmwareChecksumError):
+        firmware.firmware_delta_update(fw)
+    assert not os.path.exists(local / "jrr-jrr-0.1.2")
+    assert not os.path.lexists(firmware.firmware_pending_link())
+
+
+def test_firmware_delta_update_cancel_and_resume(delta_repo):
+    local, repo, _ = delta_repo
+    fw = firmware.FirmwareVersion.create_repo_version(str(repo / "jrr-0.1.2.zip"))
+    tmp_dir = str(local / "jrr-jrr-0.1.2") + ".tmp"
+    with pytest.raises(firmware.FirmwareDownloadCancelled):
+        firmware.firmware_delta_update(fw, cancel=lambda: True)
+    # linked before cancel, kept for resume
+    a_ino = os.stat(os.path.join(tmp_dir, "a.py")).st_ino
+    # mismatching file replaced
+    Path(tmp_dir, "new.py").write_text("corrupted\n")
+
+    dest = firmware.firmware_delta_update(fw)
+    assert not os.path.exists(tmp_dir)
+    release_manifest = firmware.firmware_manifest(
+        str(repo / "jrr-0.1.2" / "src"))
+    assert firmware.firmware_manifest(dest)["files"] == release_manifest["files"]
+    assert os.stat(os.path.join(dest, "a.py")).st_ino == a_ino
+
+
+def test_firmware_delta_update_no_manifest(delta_repo):
+    _, repo, _ = delta_repo
+    os.remove(repo / ("jrr-0.1.2.zip" + APP_CONTEXT.FIRMWARE_DELTA.MANIFEST_SUFFIX))
+    fw = firmware.FirmwareVersion.create_repo_version(str(repo / "jrr-0.1.2.zip"))
+    assert firmware.firmware_delta_update(fw) is None
+
+
+# ------------------------------------------------------------------
+# Prefetch
+
+
+def test_firmware_download_rate_limit(tmp_path):
+    src = tmp_path / "jrr-0.2.0.zip"
+    src.write_bytes(FIRMWARE_BYTES)
+    rate_limit = 1024 * 1024
+    start = time.monotonic()
+    firmware.firmware_download(f"file://{src}", str(tmp_path / "dest.zip"),
+                               rate_limit=rate_limit)
+    assert time.monotonic() - start >= 0.9 * len(FIRMWARE_BYTES) / rate_limit
+
+
+def test_firmware_download_cancel_and_resume(tmp_path):
+    src = tmp_path / "jrr-0.2.0.zip"
+    src.write_bytes(FIRMWARE_BYTES)
+    dest = str(tmp_path / "dest.zip")
+    progress = []
+    with pytest.raises(firmware.FirmwareDownloadCancelled):
+        firmware.firmware_download(
+            f"file://{src}", dest,
+            progress=lambda done, total: progress.append(done),
+            cancel=lambda: len(progress) > 0)
+    assert not os.path.exists(dest)
+    assert os.path.getsize(dest + APP_CONTEXT.FIRMWARE_DOWNLOAD.PART_SUFFIX) == \
+        APP_CONTEXT.FIRMWARE_DOWNLOAD.CHUNK
+
+    firmware.firmware_download(
+        f"file://{src}", dest,
+        expected_sha256=hashlib.sha256(FIRMWARE_BYTES).hexdigest())
+    assert Path(dest).read_bytes() == FIRMWARE_BYTES
+
+
+@pytest.fixture
+def prefetch_repo(delta_repo):
+    local, repo, current = delta_repo
+    with patch.object(config.Config, 'firmware_repo_url',
+                      new_callable=PropertyMock) as mock_repo:
+        mock_repo.return_value = str(repo)
+        yield local, repo, current
+
+
+def test_firmware_prefetch_delta(prefetch_repo):
+    local, repo, current = prefetch_repo
+    staged = firmware.firmware_prefetch_newest()
+
+    assert staged == os.path.join(firmware.firmware_prefetch_root(), "jrr-jrr-0.1.2")
+    assert not os.path.lexists(firmware.firmware_pending_link())
+    # still offered in menu
+    available = firmware.firmware_available_versions()
+    assert [os.path.basename(fw.repo_url) for fw in available] == ["jrr-0.1.2.zip"]
+    assert firmware.firmware_prefetch_newest() == staged
+
+    dest = firmware.firmware_activate_prefetched(available[0])
+    assert dest == str(local / "jrr-jrr-0.1.2")
+    assert os.path.realpath(firmware.firmware_pending_link()) == dest
+    assert os.stat(os.path.join(dest, "a.py")).st_ino == os.stat(current / "a.py").st_ino
+    assert firmware.firmware_prefetched(available[0]) is None
+
+
+def test_firmware_prefetch_zip(prefetch_repo):
+    local, repo, _ = prefetch_repo
+    os.remove(repo / ("jrr-0.1.2.zip" + APP_CONTEXT.FIRMWARE_DELTA.MANIFEST_SUFFIX))
+    _release_zip(repo / "jrr-0.1.2.zip", {"jrr-jrr-0.1.2/src/a.py": b"a = 2\n"})
+    # stale entry of older prefetch removed
+    os.makedirs(os.path.join(firmware.firmware_prefetch_root(), "jrr-jrr-0.1.0"))
+
+    staged = firmware.firmware_prefetch_newest()
+    # zip extracted and removed
+    assert sorted(os.listdir(firmware.firmware_prefetch_root())) == ["jrr-jrr-0.1.2"]
+
+    fw = firmware.FirmwareVersion.create_repo_version(str(repo / "jrr-0.1.2.zip"))
+    assert firmware.firmware_prefetched(fw) == staged
+    dest = firmware.firmware_activate_prefetched(fw)
+    assert dest == str(local / "jrr-jrr-0.1.2")
+    assert os.path.realpath(firmware.firmware_pending_link()) == dest
+    assert Path(dest, "a.py").read_bytes() == b"a = 2\n"
+
+
+def test_firmware_activate_not_prefetched(prefetch_repo):
+    _, repo, _ = prefetch_repo
+    fw = firmware.FirmwareVersion.create_repo_version(str(repo / "jrr-0.1.2.zip"))
+    assert firmware.firmware_activate_prefetched(fw) is None
+
+
+# ------------------------------------------------------------------
+# Unpack
+
+
+def _release_zip(path, members):
+    """Write zip 'path' with 'members' (name -> bytes)."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+
+
+RELEASE_MEMBERS = {
+    "jrr-jrr-0.2.0/README.md": b"readme\n",
+    "jrr-jrr-0.2.0/spec/test_x.py": b"assert 1\n",
+    "jrr-jrr-0.2.0/src/": b"",
+    "jrr-jrr-0.2.0/src/jrr.py": b"print('jrr')\n",
+    "jrr-jrr-0.2.0/src/sub/a.py": b"a = 1\n" * 1000,
+}
+
+
+def test_firmware_extract_only_src(tmp_path):
+    _release_zip(tmp_path / "jrr-0.2.0.zip", RELEASE_MEMBERS)
+    dest = firmware.firmware_extract(
+        str(tmp_path / "jrr-0.2.0.zip"), str(tmp_path / "jrr-jrr-0.2.0"))
+    assert dest == str(tmp_path / "jrr-jrr-0.2.0")
+    assert sorted(str(p.relative_to(dest)) for p in Path(dest).rglob("*")) == \
+        ["jrr.py", "sub", "sub/a.py"]
+    assert Path(dest, "sub", "a.py").read_bytes() == b"a = 1\n" * 1000
+    assert sorted(os.listdir(tmp_path)) == ["jrr-0.2.0.zip", "jrr-jrr-0.2.0"]
+
+
+def test_firmware_extract_crc_error(tmp_path):
+    zip_path = tmp_path / "jrr-0.2.0.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("jrr-jrr-0.2.0/src/jrr.py", b"print('jrr')\n")
+    content = zip_path.read_bytes()
+    zip_path.write_bytes(content.replace(b"print('jrr')", b"print('JRR')"))
+    with pytest.raises(zipfile.BadZipFile):
+        firmware.firmware_extract(str(zip_path), str(tmp_path / "jrr-jrr-0.2.0"))
+    assert sorted(os.listdir(tmp_path)) == ["jrr-0.2.0.zip"]
+
+
+def test_firmware_extract_no_src(tmp_path):
+    _release_zip(tmp_path / "x.zip", {"jrr-jrr-0.2.0/README.md": b"readme\n"})
+    with pytest.raises(ValueError):
+        firmware.firmware_extract(str(tmp_path / "x.zip"), str(tmp_path / "out"))
+    assert not os.path.exists(tmp_path / "out")
+
+
+def test_firmware_unpack_pending(mock_create_empty_local_root):
+    local = firmware.firmware_local_root()
+    _release_zip(os.path.join(local, "jrr-0.2.0.zip"), RELEASE_MEMBERS)
+    fw = firmware.FirmwareVersion.create_repo_version(
+        "https://github.com/jarjuk/jrr/archive/refs/tags/jrr-0.2.0.zip")
+    dest = firmware.firmware_unpack_pending(fw)
+    assert dest == os.path.join(local, "jrr-jrr-0.2.0")
+    assert os.path.realpath(firmware.firmware_pending_link()) == os.path.realpath(dest)
+    assert not os.path.exists(os.path.join(local, "jrr-0.2.0.zip"))
+    # replaced atomically by next version
+    _release_zip(os.path.join(local, "jrr-0.2.1.zip"), {
+        name.replace("0.2.0", "0.2.1"): content
+        for name, content in RELEASE_MEMBERS.items()})
+    fw = firmware.FirmwareVersion.create_repo_version(
+        "https://github.com/jarjuk/jrr/archive/refs/tags/jrr-0.2.1.zip")
+    dest = firmware.firmware_unpack_pending(fw)
+    assert os.path.realpath(firmware.firmware_pending_link()) == os.path.realpath(dest)
+
+
+def _release_zip_link(path, link_name, link, members):
+    """Write zip 'path' with symlink 'link_name' -> 'link' followed by
+    'members'."""
+    info = zipfile.ZipInfo(link_name)
+    info.external_attr = (stat.S_IFLNK | 0o777) << 16
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(info, link)
+        for name, content in members.items():
+            zf.writestr(name, content)
+
+
+@pytest.mark.parametrize("link", ["/etc", "../../..", "sub/../.."])
+def test_firmware_extract_symlink_escape(tmp_path, link):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    zip_path = tmp_path / "evil.zip"
+    _release_zip_link(zip_path, "jrr-jrr-0.2.0/src/x", link,
+                      {"jrr-jrr-0.2.0/src/x/outside/passwd": b"pwned\n"})
+    with pytest.raises(ValueError):
+        firmware.firmware_extract(str(zip_path), str(tmp_path / "out" / "jrr"))
+    assert os.listdir(outside) == []
+    assert not os.path.exists(tmp_path / "out" / "jrr")
+
+
+def test_firmware_extract_symlink_inside(tmp_path):
+    zip_path = tmp_path / "jrr-0.2.0.zip"
+    _release_zip_link(zip_path, "jrr-jrr-0.2.0/src/link.py", "sub/a.py",
+                      {"jrr-jrr-0.2.0/src/sub/a.py": b"a = 1\n"})
+    dest = firmware.firmware_extract(str(zip_path), str(tmp_path / "jrr"))
+    assert os.readlink(os.path.join(dest, "link.py")) == "sub/a.py"
+    assert Path(dest, "link.py").read_bytes() == b"a = 1\n"
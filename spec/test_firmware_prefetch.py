@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+
+import asyncio
+import threading
+
+from src import firmware_prefetch
+from src.firmware import FirmwareDownloadCancelled
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# FirmwarePrefetcher
+
+
+def test_prefetcher_runs_when_idle_once_per_interval():
+    calls = []
+
+    def _prefetch(rate_limit, cancel):
+        calls.append((rate_limit, threading.current_thread().name))
+        return "staged"
+
+    async def _run():
+        prefetcher = firmware_prefetch.FirmwarePrefetcher(
+            interval=3600, rate_limit=1000)
+        assert prefetcher.maybe_start(idle=False) is None
+        task = prefetcher.maybe_start(idle=True)
+        assert task is not None
+        assert await task == "staged"
+        # interval not passed
+        assert prefetcher.maybe_start(idle=True) is None
+
+    with patch.object(firmware_prefetch, "firmware_prefetch_newest", _prefetch):
+        asyncio.run(_run())
+    assert len(calls) == 1
+    assert calls[0][0] == 1000
+    assert calls[0][1].startswith("fw-prefetch")
+
+
+def test_prefetcher_cancelled_on_user_activity():
+    started = threading.Event()
+
+    def _prefetch(rate_limit, cancel):
+        started.set()
+        while not cancel():
+            threading.Event().wait(0.01)
+        raise FirmwareDownloadCancelled("cancelled")
+
+    async def _run():
+        prefetcher = firmware_prefetch.FirmwarePrefetcher(interval=3600)
+        task = prefetcher.maybe_start(idle=True)
+        await asyncio.to_thread(started.wait, 5)
+        prefetcher.cancel()
+        assert await task is None
+        # cancelled prefetch is resumed on next idle period
+        assert prefetcher.maybe_start(idle=True) is not None
+        await prefetcher.stop()
+        assert not prefetcher.running
+
+    with patch.object(firmware_prefetch, "firmware_prefetch_newest", _prefetch):
+        asyncio.run(_run())
@@ -0,0 +1,66 @@
+import pytest
+
+import asyncio
+
+from src.helpers import Coalescer
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Coalescer
+
+
+def test_coalescer_one_call_per_burst():
+    calls = []
+
+    async def _run():
+        burst = Coalescer(window=0.05)
+        for i in range(5):
+            burst.schedule(lambda i=i: calls.append(i))
+            await asyncio.sleep(0.001)
+        assert burst.pending
+        assert calls == []
+        await asyncio.sleep(0.1)
+        assert not burst.pending
+        # next burst
+        burst.schedule(lambda: calls.append("next"))
+        await asyncio.sleep(0.1)
+
+    asyncio.run(_run())
+    # latest callback of each burst
+    assert calls == [4, "next"]
+
+
+def test_coalescer_zero_window_drains_backlog():
+    calls = []
+
+    async def _run():
+        burst = Coalescer()
+        queue = asyncio.Queue()
+        for key in "abc":
+            queue.put_nowait(key)
+        while not queue.empty():
+            key = await queue.get()
+            burst.schedule(lambda key=key: calls.append(key))
+        await asyncio.sleep(0)
+
+    asyncio.run(_run())
+    assert calls == ["c"]
+
+
+def test_coalescer_flush_and_cancel():
+    calls = []
+
+    async def _run():
+        burst = Coalescer(window=10)
+        burst.schedule(lambda: calls.append("flushed"))
+        burst.flush()
+        burst.flush()
+        burst.schedule(lambda: calls.append("cancelled"))
+        burst.cancel()
+        assert not burst.pending
+
+    asyncio.run(_run())
+    assert calls == ["flushed"]
@@ -0,0 +1,106 @@
+import pytest
+
+import asyncio
+
+from src.constants import DSCREEN, TOPICS
+from src.hub_record import HubRecorder, read_records, replay, replay_bench
+from src.messages import (message_create, message_dscreen, message_exit,
+                          message_network_status, MsgDScreen)
+from src.publish_subsrcibe import Hub, Subscription
+
+
+def test_framework():
+    assert 1 == 1
+
+
+def _record(file_path, messages):
+    hub = Hub()
+    with HubRecorder(str(file_path)).attach(hub) as recorder:
+        for topic, message in messages:
+            hub.publish(topic=topic, message=message)
+    assert hub.taps == []
+    return recorder
+
+
+MESSAGES = [
+    (TOPICS.CONTROL, message_create(message_type=TOPICS.COMMON_MESSAGES.CLOCK_TICK)),
+    (TOPICS.SCREEN, message_dscreen(screen_name="s", key_values=[("a", "1")])),
+    (TOPICS.CONTROL, message_exit(source=TOPICS.HALT_SOURCE.SIGNAL)),
+]
+
+
+def test_record_read(tmp_path):
+    file_path = tmp_path / "hub.rec"
+    recorder = _record(file_path, MESSAGES)
+    assert recorder.recorded == 3
+    records = list(read_records(str(file_path)))
+    assert [(topic, message) for _, topic, message in records] == MESSAGES
+    assert isinstance(records[1][2], MsgDScreen)
+    assert records[1][2].fieldByName("a").val == "1"
+    secs = [secs for secs, _, _ in records]
+    assert secs == sorted(secs)
+
+
+def test_record_append_sessions(tmp_path):
+    file_path = tmp_path / "hub.rec"
+    _record(file_path, MESSAGES)
+    _record(file_path, MESSAGES)
+    records = list(read_records(str(file_path)))
+    assert len(records) == 6
+    secs = [secs for secs, _, _ in records]
+    assert secs == sorted(secs)
+
+
+def test_read_truncated(tmp_path):
+    file_path = tmp_path / "hub.rec"
+    _record(file_path, MESSAGES)
+    with open(file_path, "rb") as file:
+        data = file.read()
+    with open(file_path, "wb") as file:
+        file.write(data[:-3])
+    assert len(list(read_records(str(file_path)))) == 2
+
+
+def test_unpicklable_skipped(tmp_path):
+    file_path = tmp_path / "hub.rec"
+    class _Local:
+        # local class cannot be pickled
+        message_type = "local"
+    recorder = _record(file_path, [("t", _Local()), MESSAGES[0]])
+    assert recorder.skipped == 1
+    assert recorder.recorded == 1
+
+
+def test_replay_topics(tmp_path):
+    file_path = tmp_path / "hub.rec"
+    _record(file_path, MESSAGES)
+
+    async def _run():
+        hub = Hub()
+        with Subscription(hub=hub, topic=TOPICS.SCREEN) as queue:
+            published = await replay(hub=hub, file_path=str(file_path),
+                                     topics=[TOPICS.SCREEN])
+            assert published == 1
+            assert queue.qsize() == 1
+            return await queue.get()
+    msg = asyncio.run(_run())
+    assert msg == MESSAGES[1][1]
+
+
+def test_replay_bench(tmp_path):
+    # screen and controller need display/gpio libraries
+    pytest.importorskip("src.jrr_radio")
+    file_path = tmp_path / "hub.rec"
+    messages = [
+        (TOPICS.CONTROL, message_create(message_type=TOPICS.COMMON_MESSAGES.CLOCK_TICK)),
+        (TOPICS.CONTROL, message_network_status(status=True)),
+        (TOPICS.SCREEN, message_dscreen(screen_name=DSCREEN.SCREEN_OVERLAYS.WIFI_SETUP,
+                                        key_values=[(DSCREEN.WIFI_OVERLAY.SSID, "home")])),
+    ]
+    _record(file_path, messages * 10)
+    result, hub = asyncio.run(replay_bench(str(file_path)))
+    assert result["messages"] == 30
+    assert result["msg/s"] > 0
+    assert hub.stats.published[TOPICS.SCREEN][TOPICS.SCREEN_MESSAGES.DSCREEN] == 10
+    # replayed messages only (no handler output, no closing EXITs)
+    assert sum(sum(counts.values()) for counts in hub.stats.published.values()) == 30
@@ -0,0 +1,82 @@
+import pytest
+
+import asyncio
+
+from src.constants import TOPICS
+from src.hub_stats import HubStats, LatencyHistogram
+from src.messages import message_create
+from src.publish_subsrcibe import Hub, Subscription
+from src.reader_coro import reader_coro
+
+
+def test_framework():
+    assert 1 == 1
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(bounds=(1, 10))
+    histogram.add(0.0005)
+    histogram.add(0.005)
+    histogram.add(0.020)
+    assert histogram.counts == [1, 1, 1]
+    assert histogram.n == 3
+    assert histogram.max == pytest.approx(20)
+    assert histogram.mean == pytest.approx(25.5 / 3)
+
+
+def test_publish_counts_and_queue_depth():
+    async def _run():
+        hub = Hub()
+        with Subscription(hub=hub, topic="t", name="sub") as queue:
+            for _ in range(3):
+                hub.publish(topic="t", message=message_create(
+                    message_type=TOPICS.COMMON_MESSAGES.CLOCK_TICK))
+            hub.publish(topic="t", message=message_create(
+                message_type=TOPICS.CONTROL_MESSAGES.REBOOT))
+            await queue.get()
+            queue_stats = hub.stats.queues[queue]
+            assert queue_stats.name == "sub"
+            assert queue_stats.high_water == 4
+            assert queue_stats.depth == 3
+        # subscription gone, counts remain
+        assert hub.stats.queues == {}
+        return hub.stats
+    stats = asyncio.run(_run())
+    assert stats.published["t"] == {TOPICS.COMMON_MESSAGES.CLOCK_TICK: 3,
+                                    TOPICS.CONTROL_MESSAGES.REBOOT: 1}
+    report = stats.report()
+    assert TOPICS.COMMON_MESSAGES.CLOCK_TICK in report
+    stats.reset()
+    assert stats.published == {}
+
+
+def test_handler_latency_sampled():
+    async def _run(hub):
+        def _action(msg, hub):
+            return True
+        task = asyncio.create_task(reader_coro(name="reader", hub=hub, topic="t",
+                                               action=_action))
+        await asyncio.sleep(0)
+        for _ in range(8):
+            hub.publish(topic="t", message=TOPICS.COMMON_MESSAGES.PING)
+        hub.publish(topic="t", message=TOPICS.COMMON_MESSAGES.EXIT)
+        await task
+    hub = Hub(stats=HubStats(latency_sample=4))
+    asyncio.run(_run(hub))
+    # 9 handled, every 4th timed
+    assert hub.stats.latency[("reader", TOPICS.COMMON_MESSAGES.PING)].n == 2
+
+
+def test_stats_disabled():
+    hub = Hub(stats=HubStats(enabled=False))
+    hub.publish(topic="t", message=TOPICS.COMMON_MESSAGES.PING)
+    assert hub.stats.published == {}
+    assert hub.stats.handling() is None
+
+
+def test_stats_dump(tmp_path):
+    hub = Hub()
+    hub.publish(topic="t", message=TOPICS.COMMON_MESSAGES.PING)
+    file_path = hub.stats.dump(str(tmp_path / "stats.txt"))
+    with open(file_path) as file:
+        assert TOPICS.COMMON_MESSAGES.PING in file.read()
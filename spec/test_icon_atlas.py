@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import patch, PropertyMock
+import os
+import time
+
+from PIL import Image
+
+from src import icon_atlas, config
+from src.jrr_converter import image_resize
+from src.screen import ScreenEntryImage
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Fixtures
+
+
+ICONS = ["a.png", "b.png", "c.png"]
+
+
+@pytest.fixture
+def icon_dir(tmp_path):
+    for i, name in enumerate(ICONS):
+        Image.new("RGB", (40, 20), color=(i * 100, 50, 0)).save(tmp_path / name)
+    with patch.object(config.Config, 'icon_directory',
+                      new_callable=PropertyMock) as mock_dir, \
+        patch.object(config.Config, 'streaming_icon_size',
+                     new_callable=PropertyMock) as mock_size:
+        mock_dir.return_value = str(tmp_path)
+        mock_size.return_value = (16, 16)
+        yield tmp_path
+    for _, atlas in icon_atlas._atlases.values():
+        atlas.close()
+    icon_atlas._atlases.clear()
+
+# ------------------------------------------------------------------
+# Atlas
+
+
+def test_build_and_tile(icon_dir):
+    assert icon_atlas.build_atlas(
+        str(icon_dir), ICONS + ["missing.png"], size=(16, 16)) == 3
+    atlas = icon_atlas.icon_atlas(str(icon_dir))
+    assert sorted(atlas.tiles) == ICONS
+    tile = atlas.tile("icons/b.png")
+    expect = image_resize(Image.open(icon_dir / "b.png"), width=16, height=16)
+    assert tile.size == (16, 16)
+    assert tile.tobytes() == expect.tobytes()
+    assert atlas.tile("missing.png") is None
+
+
+def test_update_atlas_incremental(icon_dir):
+    assert icon_atlas.update_atlas(str(icon_dir), ICONS)
+    assert not icon_atlas.update_atlas(str(icon_dir), ICONS)
+    # channel set changes
+    assert icon_atlas.update_atlas(str(icon_dir), ICONS[:2])
+    assert sorted(icon_atlas.icon_atlas(str(icon_dir)).tiles) == ICONS[:2]
+
+
+def test_atlas_tile_stale_source(icon_dir):
+    icon_atlas.update_atlas(str(icon_dir), ICONS)
+    assert icon_atlas.atlas_tile(str(icon_dir), "a.png") is not None
+    time.sleep(0.01)
+    Image.new("RGB", (30, 30)).save(icon_dir / "a.png")
+    assert icon_atlas.atlas_tile(str(icon_dir), "a.png") is None
+    assert icon_atlas.atlas_tile(str(icon_dir), "b.png") is not None
+
+
+def test_invalid_atlas(icon_dir):
+    (icon_dir / icon_atlas.APP_CONTEXT.ICON_ATLAS.FILE).write_bytes(b"garbage!" * 4)
+    assert icon_atlas.icon_atlas(str(icon_dir)) is None
+    assert icon_atlas.update_atlas(str(icon_dir), ICONS)
+
+
+def test_screen_entry_uses_atlas(icon_dir):
+    icon_atlas.update_atlas(str(icon_dir), ICONS)
+    entry = ScreenEntryImage(name="x", x=0, y=0,
+                             imagepath=str(icon_dir / "no-such.png"),
+                             atlas_icon="c.png")
+    assert entry.img.size == (16, 16)
+    # falls back to imagepath when not in atlas
+    entry = ScreenEntryImage(name="x", x=0, y=0,
+                             imagepath=str(icon_dir / "c.png"),
+                             atlas_icon="other.png")
+    assert entry.img.size == (40, 20)
@@ -0,0 +1,281 @@
+import asyncio
+
+import pytest
+
+from src import icy
+from src import streamer_coro
+from src.publish_subsrcibe import Hub, Subscription
+from src.constants import APP_CONTEXT, TOPICS
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Helpers
+
+
+def _meta_block(text: str) -> bytes:
+    """Length byte + NUL padded metadata."""
+    data = text.encode("utf-8")
+    blocks = (len(data) + 15) // 16
+    return bytes([blocks]) + data.ljust(blocks * 16, b"\0")
+
+
+def _icy_stream(metaint: int, audio: bytes, titles) -> bytes:
+    """Interleave 'audio' with metadata for 'titles' (None = empty block)."""
+    out = bytearray()
+    for i, title in enumerate(titles):
+        out += audio[i * metaint:(i + 1) * metaint]
+        out += b"\0" if title is None else _meta_block(f"StreamTitle='{title}';")
+    return bytes(out)
+
+# ------------------------------------------------------------------
+# Metadata parsing
+
+
+def test_parse_metadata():
+    meta = icy.parse_metadata(
+        b"StreamTitle='Guns N' Roses - Patience';StreamUrl='';\0\0\0")
+    assert meta == {"StreamTitle": "Guns N' Roses - Patience",
+                    "StreamUrl": ""}
+
+
+def test_parse_metadata_latin1():
+    meta = icy.parse_metadata("StreamTitle='Päivä';".encode("latin-1"))
+    assert meta["StreamTitle"] == "Päivä"
+
+
+def test_parse_metadata_empty():
+    assert icy.parse_metadata(b"\0" * 16) == {}
+
+
+def test_parse_headers_icy():
+    status, headers = icy.parse_headers(b"ICY 200 OK\r\nicy-br: 128\r\n\r\n")
+    assert status == 200
+    assert icy.bitrate(headers) == 128
+
+
+def test_bitrate():
+    assert icy.bitrate({"icy-br": "96,96"}) == 96
+    assert icy.bitrate({"icy-br": "x"}) is None
+    assert icy.bitrate({}) is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 16, 100, 10000])
+def test_metadata_parser_chunks(chunk_size):
+    metaint = 32
+    audio = bytes(range(256)) * 1
+    stream = _icy_stream(metaint, audio, ["A - 1", None, "B - 2", "B - 2"])
+    parser = icy.IcyMetadataParser(metaint)
+    got_audio = bytearray()
+    titles = []
+    for pos in range(0, len(stream), chunk_size):
+        a, metadata = parser.feed(stream[pos:pos + chunk_size])
+        got_audio += a
+        titles += [m["StreamTitle"] for m in metadata]
+    assert bytes(got_audio) == audio[:4 * metaint]
+    assert titles == ["A - 1", "B - 2", "B - 2"]
+
+# ------------------------------------------------------------------
+# Connection and pumping
+
+
+async def _stand_in(response: bytes, redirect: bool = False,
+                    relative: bool = False):
+    """Local http server answering 'response', optionally after a
+    redirect (with 'relative' location)."""
+    async def _handle(reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        assert b"Icy-MetaData: 1" in request
+        if redirect and b"GET /redirect" in request:
+            location = "/stream" if relative else url.replace("/redirect", "/stream")
+            writer.write(b"HTTP/1.0 302 Found\r\nLocation: " +
+                         location.encode() + b"\r\n\r\n")
+        else:
+            writer.write(response)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/redirect"
+    return server, url
+
+
+def test_icy_open_redirect():
+    async def main():
+        server, url = await _stand_in(
+            b"ICY 200 OK\r\nicy-metaint: 16\r\n\r\nbody", redirect=True)
+        async with server:
+            response = await icy.icy_open(url)
+            body = await response.reader.read()
+            await response.close()
+            return response, body
+
+    response, body = asyncio.run(main())
+    assert response.url.endswith("/stream")
+    assert response.metaint == 16
+    assert body == b"body"
+
+
+def test_icy_open_relative_redirect():
+    async def main():
+        server, url = await _stand_in(
+            b"ICY 200 OK\r\nicy-metaint: 16\r\n\r\nbody", redirect=True,
+            relative=True)
+        async with server:
+            response = await icy.icy_open(url)
+            await response.close()
+            return url, response
+
+    url, response = asyncio.run(main())
+    assert response.url == url.replace("/redirect", "/stream")
+    assert response.metaint == 16
+
+
+def test_icy_open_too_many_redirects():
+    async def main():
+        server, url = await _stand_in(b"", redirect=True)
+        async with server:
+            await icy.icy_open(url, redirects=0)
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+def test_streamer_pump_dedup():
+    metaint = 16
+    audio = b"0123456789abcdef" * 4
+    stream = _icy_stream(metaint, audio, ["A", "A", None, "B"])
+
+    async def main():
+        hub = Hub()
+        server, url = await _stand_in(
+            b"ICY 200 OK\r\nicy-metaint: 16\r\n\r\n" + stream)
+        with Subscription(hub, topic=TOPICS.SCREEN) as queue:
+            async with server:
+                response = await icy.icy_open(url)
+                # 'cat' stands for streamer reading audio from stdin
+                proc = await asyncio.create_subprocess_exec(
+                    "cat", stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE)
+                await streamer_coro._streamer_pump(hub, response, proc)
+                played, _ = await proc.communicate()
+            titles = []
+            while not queue.empty():
+                titles.append(queue.get_nowait().title)
+        return played, titles
+
+    streamer_coro.now_playing_title = ""
+    played, titles = asyncio.run(main())
+    assert played == audio
+    assert titles == ["A", "B"]
+
+
+def test_streamer_pump_stalled(monkeypatch):
+    monkeypatch.setattr(APP_CONTEXT.ICY, "READ_TIMEOUT", 0.1)
+
+    async def main():
+        hub = Hub()
+        stalled = asyncio.Event()
+
+        async def _handle(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"ICY 200 OK\r\nicy-metaint: 16\r\n\r\n" + b"0" * 8)
+            await writer.drain()
+            # keep connection open, send nothing
+            await stalled.wait()
+            writer.close()
+
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            response = await icy.icy_open(f"http://127.0.0.1:{port}/stream")
+            proc = await asyncio.create_subprocess_exec(
+                "cat", stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE)
+            await asyncio.wait_for(
+                streamer_coro._streamer_pump(hub, response, proc), timeout=5)
+            played, _ = await proc.communicate()
+            stalled.set()
+        return played
+
+    streamer_coro.now_playing_title = ""
+    assert asyncio.run(main()) == b"0" * 8
+
+
+def test_streamer_run_no_metaint_remembered(monkeypatch):
+    started = []
+
+    class _Proc:
+        returncode = 0
+
+        async def wait(self):
+            return 0
+
+    async def _proc_start(url, stdin=None):
+        started.append(url)
+        return _Proc()
+
+    monkeypatch.setattr(streamer_coro, "_streamer_proc_start", _proc_start)
+
+    async def main():
+        connections = []
+
+        async def _handle(reader, writer):
+            connections.append(await reader.readuntil(b"\r\n\r\n"))
+            writer.write(b"HTTP/1.0 200 OK\r\n\r\nbody")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/stream"
+        async with server:
+            await streamer_coro._streamer_run(url, Hub())
+            await streamer_coro._streamer_run(url, Hub())
+        return url, connections
+
+    url, connections = asyncio.run(main())
+    assert len(connections) == 1
+    assert started == [url, url]
+    streamer_coro.no_metaint_urls.discard(url)
+
+
+def test_streamer_run_icy_open_timeout(monkeypatch):
+    started = []
+
+    class _Proc:
+        returncode = 0
+
+        async def wait(self):
+            return 0
+
+    async def _proc_start(url, stdin=None):
+        started.append(url)
+        return _Proc()
+
+    monkeypatch.setattr(streamer_coro, "_streamer_proc_start", _proc_start)
+    monkeypatch.setattr(APP_CONTEXT.ICY, "READ_TIMEOUT", 0.1)
+
+    async def main():
+        stalled = asyncio.Event()
+
+        async def _handle(reader, writer):
+            # never answers
+            await stalled.wait()
+            writer.close()
+
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/stream"
+        async with server:
+            await streamer_coro._streamer_run(url, Hub())
+            stalled.set()
+        return url
+
+    url = asyncio.run(main())
+    assert started == [url]
+    assert url in streamer_coro.no_metaint_urls
+    streamer_coro.no_metaint_urls.discard(url)
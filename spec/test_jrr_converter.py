@@ -0,0 +1,66 @@
+import json
+import os
+
+from PIL import Image
+
+from src import jrr_converter
+from src.constants import CLI
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Fixtures
+
+
+def _images(image_dir, count: int):
+    os.makedirs(image_dir, exist_ok=True)
+    for i in range(count):
+        Image.new("RGB", (64, 32), color=(i * 40, 0, 0)).save(
+            os.path.join(image_dir, f"icon-{i}.png"))
+
+# ------------------------------------------------------------------
+# Converter
+
+
+def test_converter_incremental(tmp_path, capsys):
+    image_dir, icon_dir = tmp_path / "images", tmp_path / "icons"
+    _images(image_dir, 4)
+    os.makedirs(icon_dir)
+
+    assert jrr_converter.converter_main(
+        image_dir, icon_dir, yes=False, width=20, height=10, bw=True,
+        jobs=2) == (4, 0, 0)
+    assert Image.open(icon_dir / "icon-0.png").size == (20, 10)
+    manifest = json.loads((icon_dir / CLI.ICON_MANIFEST).read_text())
+    assert sorted(manifest) == [f"icon-{i}.png" for i in range(4)]
+    assert "icons/s" in capsys.readouterr().out
+
+    # unchanged: nothing converted even with 'yes'
+    assert jrr_converter.converter_main(
+        image_dir, icon_dir, yes=True, width=20, height=10, bw=True,
+        jobs=2) == (0, 4, 0)
+
+    # changed source/size overriden only with 'yes'
+    Image.new("RGB", (8, 8)).save(image_dir / "icon-1.png")
+    assert jrr_converter.converter_main(
+        image_dir, icon_dir, yes=False, width=20, height=10, bw=True,
+        jobs=2) == (0, 4, 0)
+    assert jrr_converter.converter_main(
+        image_dir, icon_dir, yes=True, width=20, height=10, bw=True,
+        jobs=2) == (1, 3, 0)
+    assert jrr_converter.converter_main(
+        image_dir, icon_dir, yes=True, width=30, height=10, bw=True,
+        jobs=2) == (4, 0, 0)
+
+
+def test_converter_failure(tmp_path):
+    image_dir, icon_dir = tmp_path / "images", tmp_path / "icons"
+    _images(image_dir, 1)
+    (image_dir / "broken.png").write_bytes(b"not an image")
+    os.makedirs(icon_dir)
+    assert jrr_converter.converter_main(
+        image_dir, icon_dir, yes=False, width=20, height=10, bw=False,
+        jobs=2) == (1, 0, 1)
+    assert "broken.png" not in jrr_converter.read_manifest(str(icon_dir))
@@ -0,0 +1,115 @@
+import pytest
+from unittest.mock import patch
+
+import asyncio
+import os
+import time
+
+from src import kb_coro, kb_hotplug
+from src.constants import APP_CONTEXT, TOPICS
+from src.publish_subsrcibe import Hub
+
+
+def test_framework():
+    assert 1 == 1
+
+
+@pytest.fixture
+def input_dirs(tmp_path):
+    """Fake '/dev/input' and '/sys/class/input' with keyboard 'event1'"""
+    dev = tmp_path / "dev"
+    sysfs = tmp_path / "sys"
+    dev.mkdir()
+    for node, name in [("event0", "Power Button"), ("event1", "Mini Keyboard")]:
+        (dev / node).write_text("")
+        (sysfs / node / "device").mkdir(parents=True)
+        (sysfs / node / "device" / "name").write_text(name + "\n")
+    kb_hotplug._identities.clear()
+    with patch.object(APP_CONTEXT.KEYBOARD_HOTPLUG, "INPUT_DIR", str(dev)), \
+            patch.object(APP_CONTEXT.KEYBOARD_HOTPLUG, "SYSFS_INPUT", str(sysfs)):
+        yield dev, sysfs
+    kb_hotplug._identities.clear()
+
+
+def test_find_keyboard_path(input_dirs):
+    dev, _ = input_dirs
+    assert kb_hotplug.find_keyboard_path("Keyboard") == str(dev / "event1")
+    assert kb_hotplug.find_keyboard_path("Mouse") is None
+
+
+def test_device_identity_cached(input_dirs):
+    dev, sysfs = input_dirs
+    path = str(dev / "event1")
+    identity = kb_hotplug.device_identity(path)
+    assert identity.name == "Mini Keyboard"
+    with patch.object(kb_hotplug, "_read_sysfs") as read_sysfs:
+        assert kb_hotplug.device_identity(path) is identity
+        read_sysfs.assert_not_called()
+
+    # re-created node is identified again
+    os.remove(path)
+    assert kb_hotplug.device_identity(path) is None
+    (sysfs / "event1" / "device" / "name").write_text("Mouse\n")
+    (dev / "event1").write_text("")
+    assert kb_hotplug.device_identity(path).name == "Mouse"
+
+
+def test_inotify_events(tmp_path):
+    inotify = kb_hotplug.Inotify(str(tmp_path))
+    try:
+        (tmp_path / "event3").write_text("")
+        os.remove(tmp_path / "event3")
+        events = inotify.read()
+    finally:
+        inotify.close()
+    assert (kb_hotplug.IN_CREATE, "event3") in events
+    assert (kb_hotplug.IN_DELETE, "event3") in events
+
+
+def test_input_watcher_wakes_on_create(tmp_path):
+    async def _run():
+        with kb_hotplug.InputWatcher(directory=str(tmp_path)) as watcher:
+            assert watcher.event_driven
+            assert not await watcher.wait(timeout=0.01)
+            asyncio.get_running_loop().call_later(
+                0.05, (tmp_path / "event4").write_text, "")
+            start = time.monotonic()
+            assert await watcher.wait(timeout=5)
+            assert time.monotonic() - start < 1
+            assert str(tmp_path / "event4") in watcher.created
+
+    asyncio.run(_run())
+
+
+def test_input_watcher_polls_without_inotify(tmp_path):
+    async def _run():
+        with patch.object(kb_hotplug, "Inotify", side_effect=OSError("no inotify")):
+            with kb_hotplug.InputWatcher(directory=str(tmp_path),
+                                         poll_interval=0.01) as watcher:
+                assert not watcher.event_driven
+                assert not await watcher.wait()
+
+    asyncio.run(_run())
+
+
+def test_keyboard_task_relaunched_after_death():
+    runs = []
+
+    async def _reader(name, hub, topic_out):
+        runs.append(name)
+        if len(runs) == 1:
+            raise RuntimeError("reader died")
+        await asyncio.sleep(10)
+
+    async def _run():
+        kb_coro._keyboard_start(name="kb", hub=Hub(), topic_out=TOPICS.CONTROL)
+        await asyncio.sleep(0.1)
+        assert len(runs) == 2
+        await kb_coro._keyboard_stop(name="kb")
+        await asyncio.sleep(0.1)
+        assert len(runs) == 2
+
+    with patch.object(kb_coro, "_kb_reader_coro", _reader), \
+            patch.object(APP_CONTEXT.KEYBOARD_HOTPLUG, "RELAUNCH", 0.01):
+        asyncio.run(_run())
+    assert kb_coro.keyboard_task is None
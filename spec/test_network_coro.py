@@ -0,0 +1,122 @@
+import pytest
+from unittest.mock import patch
+
+import asyncio
+import socket
+
+from src import network_coro, utils
+from src.constants import TOPICS, APP_CONTEXT
+from src.messages import message_create, message_exit, is_message_type
+from src.publish_subsrcibe import Hub, Subscription
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# check_inet
+
+
+def test_check_inet_closes_connection_and_caches_dns():
+    closed = []
+
+    async def _run():
+        async def _client(reader, writer):
+            # EOF when probe closes its end
+            closed.append(await reader.read() == b"")
+            writer.close()
+
+        server = await asyncio.start_server(_client, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        utils._inet_addresses.clear()
+        resolved = []
+        loop = asyncio.get_running_loop()
+        getaddrinfo = loop.getaddrinfo
+
+        async def _getaddrinfo(*args, **kwargs):
+            resolved.append(args[0])
+            return await getaddrinfo(*args, **kwargs)
+
+        with patch.object(loop, "getaddrinfo", _getaddrinfo):
+            assert await utils.check_inet("localhost", port)
+            assert await utils.check_inet("localhost", port)
+        await asyncio.sleep(0.1)
+        server.close()
+        await server.wait_closed()
+        assert resolved == ["localhost"]
+
+        # connection refused drops cached address
+        assert not await utils.check_inet("localhost", port)
+        assert ("localhost", port) not in utils._inet_addresses
+
+    asyncio.run(_run())
+    assert closed == [True, True]
+
+# ------------------------------------------------------------------
+# network_coro
+
+
+def test_next_interval():
+    cnf = APP_CONTEXT.NETWORK_MONITOR
+    assert network_coro.next_interval(40, changed=True, status=True) == cnf.MIN_INTERVAL
+    assert network_coro.next_interval(cnf.MIN_INTERVAL, changed=False, status=True) == \
+        2 * cnf.MIN_INTERVAL
+    assert network_coro.next_interval(cnf.MAX_INTERVAL_UP, changed=False, status=True) == \
+        cnf.MAX_INTERVAL_UP
+    assert network_coro.next_interval(cnf.MAX_INTERVAL_UP, changed=False, status=False) == \
+        cnf.MAX_INTERVAL_DOWN
+    assert network_coro.next_interval(40, changed=False, status=True, events=False) == \
+        cnf.MIN_INTERVAL
+
+
+def test_network_coro_probes_on_change():
+    statuses = [True, False]
+
+    async def _probe():
+        return statuses.pop(0)
+
+    refreshed = []
+
+    async def _refresh():
+        refreshed.append(1)
+
+    async def _run():
+        hub = Hub()
+        network_coro.reset_network_status()
+        with Subscription(hub=hub, topic=TOPICS.CONTROL) as status_queue:
+            task = asyncio.create_task(network_coro.network_coro(
+                name="test", hub=hub, topic=TOPICS.NETWORK_MONITOR,
+                probe=_probe, refresh=_refresh))
+            await asyncio.sleep(0)
+            # change event probes right away (not after MIN_INTERVAL)
+            for expect in [True, False]:
+                hub.publish(TOPICS.NETWORK_MONITOR, message_create(
+                    message_type=TOPICS.NETWORK_MESSAGES.CHANGE))
+                msg = await asyncio.wait_for(status_queue.get(), timeout=2)
+                assert is_message_type(msg, TOPICS.NETWORK_MESSAGES.STATUS)
+                assert msg.status is expect
+            hub.publish(TOPICS.NETWORK_MONITOR,
+                        message_exit(source=TOPICS.HALT_SOURCE.MESSAGE))
+            await asyncio.wait_for(task, timeout=2)
+
+    with patch.object(APP_CONTEXT.NETWORK_MONITOR, "SETTLE", 0):
+        asyncio.run(_run())
+    assert statuses == []
+    # ssid refreshed once per change
+    assert len(refreshed) == 2
+
+
+def test_watch_socket_coalesces_events():
+    async def _run():
+        events = []
+        reader, writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        reader.setblocking(False)
+        network_coro.watch_socket(reader, lambda: events.append(1))
+        for _ in range(3):
+            writer.send(b"event")
+        await asyncio.sleep(0.05)
+        network_coro.unwatch_socket(reader)
+        writer.close()
+        return events
+
+    assert asyncio.run(_run()) == [1]
@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import patch
+
+import asyncio
+import threading
+import time
+
+from src import os_command, utils
+from src.constants import APP_CONTEXT
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# CommandExecutor
+
+
+def test_run_captures_output():
+    executor = os_command.CommandExecutor()
+    result = asyncio.run(executor.run(["sh", "-c", "echo out; echo err >&2; exit 3"]))
+    assert result.returncode == 3 and not result.ok
+    assert result.stdout == "out\n" and result.stderr == "err\n"
+
+
+def test_run_input_not_shell():
+    executor = os_command.CommandExecutor()
+    result = asyncio.run(executor.run(["cat"], input="a b; $(x)\n"))
+    assert result.ok and result.stdout == "a b; $(x)\n"
+
+
+def test_run_missing_command():
+    result = asyncio.run(os_command.CommandExecutor().run(["no-such-command-jrr"]))
+    assert result.returncode is None and not result.ok
+
+
+def test_run_timeout_kills():
+    executor = os_command.CommandExecutor()
+    start = time.monotonic()
+    result = asyncio.run(executor.run(["sleep", "10"], timeout=0.2))
+    assert result.timed_out and result.returncode is None
+    assert time.monotonic() - start < 5
+
+
+def test_run_cancel_kills():
+    async def _run():
+        executor = os_command.CommandExecutor()
+        task = asyncio.create_task(executor.run(["sleep", "10"]))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(_run())
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.parametrize("max_concurrency, min_secs, max_secs", [
+    (1, 0.55, 5),
+    (3, 0, 0.5),
+])
+def test_run_bounded_concurrency(max_concurrency, min_secs, max_secs):
+    async def _run():
+        executor = os_command.CommandExecutor(max_concurrency=max_concurrency)
+        return await asyncio.gather(
+            *[executor.run(["sleep", "0.2"]) for _ in range(3)])
+
+    start = time.monotonic()
+    results = asyncio.run(_run())
+    assert all(result.ok for result in results)
+    assert min_secs <= time.monotonic() - start < max_secs
+
+
+def test_submit_from_thread():
+    async def _run():
+        executor = os_command.CommandExecutor()
+        loop = asyncio.get_running_loop()
+        futures = []
+        thread = threading.Thread(target=lambda: futures.append(
+            executor.submit(["echo", "x"], loop=loop)))
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        return await asyncio.wrap_future(futures[0])
+
+    assert asyncio.run(_run()).stdout == "x\n"
+
+# ------------------------------------------------------------------
+# utils
+
+
+def test_send_dmesg_in_process(tmp_path):
+    kmsg = tmp_path / "kmsg"
+    kmsg.write_text("")
+    with patch.object(APP_CONTEXT.OS_COMMAND, "KMSG", str(kmsg)):
+        assert utils.send_dmesg("shutdown starting")
+    assert kmsg.read_text() == f"{APP_CONTEXT.OS_COMMAND.KMSG_PREFIX}: shutdown starting\n"
+
+
+def test_parse_iwgetid():
+    assert utils.parse_iwgetid('wlan0     ESSID:"Koti 5G"\n') == "Koti 5G"
+    assert utils.parse_iwgetid("") == ""
+
+
+def test_set_wifi_password_args():
+    calls = []
+
+    async def _run(args, **kwargs):
+        calls.append(args)
+        return os_command.CommandResult(args=args, returncode=0)
+
+    with patch.object(utils.command_executor, "run", _run):
+        assert asyncio.run(utils.set_wifi_password(ssid="Koti 5G", password="a b"))
+        assert asyncio.run(utils.set_wifi_password(ssid="Koti", password=""))
+    script = APP_CONTEXT.STREAMER_SCRIPT
+    wifi_setup = APP_CONTEXT.STREAMER_COMMANDS.WIFI_SETUP
+    assert calls == [[script, wifi_setup, "Koti 5G", "a b"],
+                     [script, wifi_setup, "Koti"]]
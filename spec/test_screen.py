@@ -477,3 +477,14 @@ def test_screen_altenatives():
                             f"../tmp/{test_case}-{test_nro}.png"))
     test_nro += 1
     print(f"{s.screen_entries=}")
+
+
+def test_screen_entry_index():
+    s = screen.Screen(size=(480, 320))
+    assert s.entry(COROS.Screen.ENTRY_B1) is None
+    s.add_or_update_entry(name=COROS.Screen.ENTRY_B1, entry_props={"text": "b1"})
+    entry = s.entry(COROS.Screen.ENTRY_B1)
+    assert entry is s.screen_entries[0]
+    assert s.named_screen_entry(COROS.Screen.ENTRY_B1) is entry
+    s.clear()
+    assert s.entry(COROS.Screen.ENTRY_B1) is None
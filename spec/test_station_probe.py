@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from src import station_probe
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Fixtures
+
+
+@pytest.fixture(autouse=True)
+def clear_probe_cache():
+    station_probe.probe_cache_clear()
+    yield
+    station_probe.probe_cache_clear()
+
+
+ICY_RESPONSE = (b"ICY 200 OK\r\n"
+                b"icy-name: Test radio\r\n"
+                b"icy-br: 128\r\n"
+                b"content-type: audio/mpeg\r\n"
+                b"\r\n")
+
+
+async def _stand_in(response: bytes, body: bytes = b"", delay: float = 0):
+    """Local http server answering 'response' + 'body' to any request."""
+    async def _handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        await asyncio.sleep(delay)
+        writer.write(response + body)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}/stream"
+
+# ------------------------------------------------------------------
+# Probing
+
+
+def test_probe_alive():
+    async def main():
+        server, url = await _stand_in(ICY_RESPONSE, body=b"\xff" * 100)
+        async with server:
+            return await station_probe.probe_station(url, read_bytes=50)
+
+    result = asyncio.run(main())
+    assert result.alive
+    assert result.bitrate == 128
+    assert result.icy_name == "Test radio"
+    assert result.ttfb is not None and result.ttfb >= result.connect_time
+    assert not station_probe.is_station_dead(result.url)
+
+
+def test_probe_http_error():
+    async def main():
+        server, url = await _stand_in(b"HTTP/1.0 404 Not Found\r\n\r\n")
+        async with server:
+            return await station_probe.probe_station(url)
+
+    result = asyncio.run(main())
+    assert not result.alive
+    assert result.status == 404
+    assert station_probe.is_station_dead(result.url)
+
+
+def test_probe_connection_refused():
+    result = asyncio.run(station_probe.probe_station("http://127.0.0.1:1/x"))
+    assert not result.alive
+    assert result.error is not None
+
+
+def test_probe_timeout():
+    async def main():
+        server, url = await _stand_in(ICY_RESPONSE, body=b"x", delay=1)
+        async with server:
+            return await station_probe.probe_station(url, timeout=0.1)
+
+    result = asyncio.run(main())
+    assert not result.alive
+    assert result.error == "Timeout"
+
+
+def test_probe_unknown_scheme():
+    result = asyncio.run(station_probe.probe_station("file:///tmp/x"))
+    assert not result.alive
+    assert "scheme" in result.error
+
+
+def test_probe_stations_cached_and_ranked():
+    async def main():
+        server_ok, url_ok = await _stand_in(ICY_RESPONSE, body=b"x" * 10)
+        server_nok, url_nok = await _stand_in(b"HTTP/1.0 500 Error\r\n\r\n")
+        async with server_ok, server_nok:
+            results = await station_probe.probe_stations(
+                [url_nok, url_ok], concurrency=1)
+        # servers closed, results from cache
+        cached = await station_probe.probe_stations([url_nok, url_ok])
+        return results, cached
+
+    results, cached = asyncio.run(main())
+    assert [r.url for r in results] == [r.url for r in cached]
+    assert [r.alive for r in cached] == [False, True]
+    ranked = station_probe.rank_stations(results)
+    assert ranked[0].alive and not ranked[1].alive
+
+
+def test_probe_cached_expired():
+    result = asyncio.run(station_probe.probe_station("http://127.0.0.1:1/x"))
+    assert station_probe.probe_cached(result.url) is not None
+    assert station_probe.probe_cached(result.url, ttl=-1) is None
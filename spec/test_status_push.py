@@ -0,0 +1,153 @@
+import pytest
+
+import asyncio
+
+from src import streamer_coro
+from src.constants import TOPICS
+from src.messages import (message_create, message_clock_update, message_keyboard_status,
+                          message_status_update, message_streamer_status_reply)
+from src.publish_subsrcibe import Hub, Subscription
+
+
+def test_framework():
+    assert 1 == 1
+
+
+def test_clock_update_time_only():
+    msg = message_clock_update(time="12:34:56")
+    assert msg.message_type == TOPICS.SCREEN_MESSAGES.CLOCK
+    assert msg.time == "12:34:56"
+    assert not hasattr(msg, "network_status")
+
+
+def test_status_messages_interned():
+    assert message_keyboard_status(status=True) is message_keyboard_status(status=True)
+    assert message_status_update(True, False, None, "v") is \
+        message_status_update(True, False, None, "v")
+
+
+# ------------------------------------------------------------------
+# Hub request/reply
+
+
+def test_hub_request_reply():
+    async def _responder(hub):
+        with Subscription(hub=hub, topic="server") as queue:
+            msg = await queue.get()
+            assert msg == TOPICS.STREAMER_MESSAGES.STATUS_QUERY
+            # unrelated message first
+            hub.publish(topic="client", message=TOPICS.COMMON_MESSAGES.PING)
+            hub.publish(topic="client", message=message_streamer_status_reply(
+                status_str="ok", running=True))
+
+    async def _run():
+        hub = Hub()
+        responder = asyncio.create_task(_responder(hub))
+        await asyncio.sleep(0)
+        reply = await hub.request(
+            topic="server", message=TOPICS.STREAMER_MESSAGES.STATUS_QUERY,
+            reply_topic="client",
+            reply_type=TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY,
+            timeout=1)
+        await responder
+        # request subscription removed
+        assert hub.topics["client"] == set()
+        return reply
+    reply = asyncio.run(_run())
+    assert reply.running
+
+
+def test_hub_request_timeout():
+    async def _run():
+        hub = Hub()
+        with pytest.raises(TimeoutError):
+            await hub.request(
+                topic="server", message=TOPICS.STREAMER_MESSAGES.STATUS_QUERY,
+                reply_topic="client",
+                reply_type=TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY,
+                timeout=0.01)
+        assert hub.topics["client"] == set()
+    asyncio.run(_run())
+
+
+# ------------------------------------------------------------------
+# Streamer status published on change
+
+
+def test_streamer_status_edges():
+    async def _run():
+        hub = Hub()
+        streamer_coro.streamer_status_published = None
+        with Subscription(hub=hub, topic=TOPICS.CONTROL) as queue:
+            # not started: published once
+            streamer_coro._publish_streamer_status(hub, name="s")
+            streamer_coro._publish_streamer_status(hub, name="s")
+            assert queue.qsize() == 1
+            assert not (await queue.get()).running
+
+            # running
+            streamer_coro.runner_task = asyncio.create_task(asyncio.sleep(10))
+            streamer_coro._publish_streamer_status(hub, name="s")
+            streamer_coro._publish_streamer_status(hub, name="s")
+            assert queue.qsize() == 1
+            assert (await queue.get()).running
+
+            # stopped
+            await streamer_coro._streamer_stop(name="s")
+            streamer_coro._publish_streamer_status(hub, name="s")
+            assert queue.qsize() == 1
+            assert not (await queue.get()).running
+        streamer_coro.streamer_status_published = None
+    asyncio.run(_run())
+
+
+def test_streamer_status_query_always_replied():
+    async def _run():
+        hub = Hub()
+        streamer_coro.runner_task = None
+        with Subscription(hub=hub, topic=TOPICS.CONTROL) as queue:
+            for _ in range(2):
+                await streamer_coro._streamer_msg_status_query(
+                    TOPICS.STREAMER_MESSAGES.STATUS_QUERY, hub=hub, name="s")
+            assert queue.qsize() == 2
+        streamer_coro.streamer_status_published = None
+    asyncio.run(_run())
+
+
+def test_streamer_replace_while_running(monkeypatch):
+    async def _stream_forever(url, hub):
+        await asyncio.Event().wait()
+
+    sleep = asyncio.sleep
+
+    async def _no_delay(delay, *args, **kwargs):
+        return await sleep(0)
+
+    monkeypatch.setattr(streamer_coro, "_streamer_run", _stream_forever)
+    monkeypatch.setattr(asyncio, "sleep", _no_delay)
+    start = message_create(message_type=TOPICS.STREAMER_MESSAGES.START, d={"url": "u"})
+
+    async def _run():
+        hub = Hub()
+        streamer_coro.streamer_status_published = None
+        streamer_coro.runner_task = None
+        with Subscription(hub=hub, topic=TOPICS.CONTROL) as queue:
+            await streamer_coro._streamer_msg_start(start, hub=hub, name="s")
+            # channel change: replaces running stream
+            await streamer_coro._streamer_msg_start(start, hub=hub, name="s")
+            await sleep(0)
+            statuses = []
+            while not queue.empty():
+                statuses.append(queue.get_nowait().running)
+            # stream dies by itself: reported
+            streamer_coro.runner_task.cancel()
+            await sleep(0)
+            await sleep(0)
+            died = [queue.get_nowait().running for _ in range(queue.qsize())]
+        streamer_coro.runner_task = None
+        streamer_coro.runner_done = None
+        streamer_coro.streamer_status_published = None
+        return statuses, died
+    statuses, died = asyncio.run(_run())
+    assert statuses == [True]
+    assert died == [False]
@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import patch
+
+import asyncio
+import os
+
+from src import wifi
+from src.constants import APP_CONTEXT
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Fixtures
+
+
+IWLIST_OUTPUT = os.path.join(os.path.dirname(__file__), "fixture", "iwlist-scanning.txt")
+
+
+@pytest.fixture
+def mock_iwlist():
+    """'iwlist' replaced with 'cat IWLIST_OUTPUT'"""
+    with patch.object(APP_CONTEXT.WIFI_SCAN, "COMMAND",
+                      ["sh", "-c", 'cat "$0"', IWLIST_OUTPUT]):
+        yield
+
+# ------------------------------------------------------------------
+# Parse
+
+
+def test_parse_iwlist():
+    with open(IWLIST_OUTPUT, "r", encoding="utf-8") as f:
+        networks = wifi.parse_iwlist(f.read())
+    assert networks == [
+        wifi.WifiNetwork(ssid="Koti", signal=-45, frequency=5.18, security="WPA2"),
+        wifi.WifiNetwork(ssid="Kahvila", signal=-60, frequency=2.412, security="open"),
+        wifi.WifiNetwork(ssid="Naapuri", signal=-80, frequency=2.462, security="WPA"),
+    ]
+
+
+def test_parse_iwlist_empty():
+    assert wifi.parse_iwlist("wlan0     No scan results\n") == []
+
+# ------------------------------------------------------------------
+# Scan
+
+
+def test_scan_wifis(mock_iwlist):
+    networks = asyncio.run(wifi.scan_wifis())
+    assert [n.ssid for n in networks] == ["Koti", "Kahvila", "Naapuri"]
+
+
+def test_scan_wifis_error():
+    with patch.object(APP_CONTEXT.WIFI_SCAN, "COMMAND", ["false"]):
+        with pytest.raises(RuntimeError):
+            asyncio.run(wifi.scan_wifis())
+
+
+def test_list_wifis(mock_iwlist):
+    assert wifi.list_wifis() == ["Koti", "Kahvila", "Naapuri"]
+
+
+def test_wifi_scanner_cached(mock_iwlist):
+    async def _run():
+        scanner = wifi.WifiScanner(ttl=60)
+        assert scanner.cached() is None
+        task = scanner.refresh_in_background()
+        # running scan is shared
+        assert scanner.refresh_in_background() is task
+        networks = await scanner.scan()
+        assert scanner.cached() == networks
+        # fresh: no new scan
+        assert scanner.refresh_in_background() is None
+        scanner.ttl = 0
+        scanner.scanned_at -= 1
+        assert scanner.refresh_in_background() is not None
+        # stale results still served while refreshing
+        assert scanner.cached() == networks
+        await scanner.task
+
+    asyncio.run(_run())
@@ -0,0 +1,93 @@
+import pytest
+import datetime
+import glob
+import os
+
+import yaml
+
+from src import yaml_cache
+
+
+def test_framework():
+    assert 1 == 1
+
+# ------------------------------------------------------------------
+# Fixtures
+
+
+# YAML files shipped in repo
+FIXTURE_YAMLS = sorted(
+    path
+    for directory in ["src", "resources", "spec"]
+    for path in glob.glob(
+        os.path.join(os.path.dirname(__file__), "..", directory, "**", "*.yaml"),
+        recursive=True))
+
+# ------------------------------------------------------------------
+# Snapshot agrees with YAML
+
+
+@pytest.mark.parametrize("yaml_path", FIXTURE_YAMLS,
+                         ids=[os.path.basename(p) for p in FIXTURE_YAMLS])
+def test_snapshot_agrees_with_yaml(tmp_path, yaml_path):
+    path = tmp_path / "x.yaml"
+    with open(yaml_path, "r", encoding="utf-8") as f:
+        path.write_text(f.read(), encoding="utf-8")
+    expect = yaml.safe_load(path.read_text(encoding="utf-8"))
+    # parse (+ write snapshot), then load from snapshot
+    assert yaml_cache.load_yaml_file(str(path)) == expect
+    assert yaml_cache.load_yaml_file(str(path)) == expect
+
+
+def test_snapshot_skips_parsing(tmp_path, monkeypatch):
+    path = tmp_path / "x.yaml"
+    path.write_text("- {name: a, url: 'http://a'}\n")
+    data = yaml_cache.load_yaml_file(str(path))
+    assert os.path.exists(yaml_cache.snapshot_path(str(path)))
+
+    def _no_parse(yaml_str):
+        raise AssertionError("YAML parsed")
+    monkeypatch.setattr(yaml_cache, "yaml_load", _no_parse)
+    assert yaml_cache.load_yaml_file(str(path)) == data
+
+
+def test_snapshot_invalidated_on_change(tmp_path):
+    path = tmp_path / "x.yaml"
+    path.write_text("a: 1\n")
+    assert yaml_cache.load_yaml_file(str(path)) == {"a": 1}
+    st = os.stat(path)
+    path.write_text("a: 2\n")
+    # same size and mtime: rewrite still detected
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert yaml_cache.load_yaml_file(str(path)) == {"a": 2}
+
+
+def test_snapshot_corrupted(tmp_path):
+    path = tmp_path / "x.yaml"
+    path.write_text("a: 1\n")
+    yaml_cache.load_yaml_file(str(path))
+    with open(yaml_cache.snapshot_path(str(path)), "wb") as f:
+        f.write(b"garbage")
+    assert yaml_cache.load_yaml_file(str(path)) == {"a": 1}
+
+
+def test_unmarshallable_not_snapshotted(tmp_path):
+    path = tmp_path / "x.yaml"
+    path.write_text("now: 2024-01-01 10:00:00\n")
+    data = yaml_cache.load_yaml_file(str(path))
+    assert data == {"now": datetime.datetime(2024, 1, 1, 10, 0, 0)}
+    assert not os.path.exists(yaml_cache.snapshot_path(str(path)))
+
+
+def test_dump_yaml_file(tmp_path):
+    path = tmp_path / "x.yaml"
+    data = {"current_stream": 2, "now": "2024-01-01T10:00:00"}
+    yaml_cache.dump_yaml_file(str(path), data)
+    assert yaml.safe_load(path.read_text()) == data
+    assert yaml_cache._read_snapshot(
+        str(path), yaml_cache._snapshot_key(str(path))) == (True, data)
+
+
+def test_load_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        yaml_cache.load_yaml_file(str(tmp_path / "missing.yaml"))
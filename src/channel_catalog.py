@@ -0,0 +1,353 @@
+"""Large channel catalogs for channel activation.
+
+A catalog is a JSON lines file 'APP_CONTEXT.CATALOG.FILE' next to
+'index.yaml' in channel activation url. Each line is one channel:
+
+  {"name": "YLE1", "url": "https://...", "icon": "icons/YLE-1.png",
+   "tags": "news,fi"}
+
+Catalog is parsed line by line (never loaded into memory as a whole)
+into an on-disk search index (sqlite3):
+
+- 'channels': name, lower case name, url, icon
+
+- 'grams': 1-2 character name prefixes and trigrams of lower case
+  name (WITHOUT ROWID, clustered on gram)
+
+- 'tags': lower case tags
+
+- 'gram_counts', 'tag_counts': rows per gram/tag, searches are
+  driven by the rarest gram/tag in query
+
+Index is rebuilt only when catalog size/mtime changes. Searches and
+pages return 'StreamConfig' -objects.
+
+Query syntax: words are matched as name substrings (prefix for one
+or two character words), words starting with '#' match tags.
+
+"""
+
+from typing import Collection, Dict, Iterator, List, Tuple
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import sqlite3
+
+import logging
+
+from .config import app_config
+from .constants import APP_CONTEXT
+from .channel_manager import StreamConfig, http_client
+from .utils import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Parsing
+
+
+def iter_catalog(catalog_path: str) -> Iterator[Tuple[StreamConfig, List[str]]]:
+    """Yield (channel, tags) for each valid line in 'catalog_path'.
+
+    Invalid lines are logged and skipped.
+    """
+    with open(catalog_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            try:
+                d = json.loads(line)
+                channel = StreamConfig(
+                    name=d["name"], icon=d.get("icon", ""), url=d["url"])
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("iter_catalog: %s:%s error='%s'",
+                               catalog_path, line_no, e)
+                continue
+            tags = d.get("tags", "")
+            if isinstance(tags, str):
+                tags = tags.split(",")
+            yield channel, [t.strip().lower() for t in tags if t.strip()]
+
+
+def _name_grams(name_lc: str) -> set:
+    """Index grams for lower case 'name_lc'."""
+    grams = {name_lc[:1], name_lc[:2]}
+    grams.update(name_lc[i:i + 3] for i in range(len(name_lc) - 2))
+    grams.discard("")
+    return grams
+
+# ------------------------------------------------------------------
+# Index
+
+
+@dataclass
+class CatalogPage:
+    """One page of search results."""
+    channels: List[StreamConfig]      # channels on page
+    offset: int                       # index of first channel in result set
+    total: int                        # channels matching query
+
+
+class ChannelCatalog:
+    """Search index for catalog 'catalog_path'."""
+
+    SCHEMA = """
+    CREATE TABLE meta(key TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE channels(id INTEGER PRIMARY KEY, name TEXT,
+                          name_lc TEXT, url TEXT, icon TEXT);
+    CREATE TABLE grams(gram TEXT, id INTEGER,
+                       PRIMARY KEY(gram, id)) WITHOUT ROWID;
+    CREATE TABLE tags(tag TEXT, id INTEGER,
+                      PRIMARY KEY(tag, id)) WITHOUT ROWID;
+    """
+
+    # after data loaded
+    POST_SCHEMA = """
+    CREATE INDEX channels_name_lc ON channels(name_lc);
+    CREATE TABLE gram_counts(gram TEXT PRIMARY KEY, n INTEGER) WITHOUT ROWID;
+    INSERT INTO gram_counts SELECT gram, count(*) FROM grams GROUP BY gram;
+    CREATE TABLE tag_counts(tag TEXT PRIMARY KEY, n INTEGER) WITHOUT ROWID;
+    INSERT INTO tag_counts SELECT tag, count(*) FROM tags GROUP BY tag;
+    """
+
+    BATCH = 1000                       # channels inserted at once
+
+    def __init__(self, catalog_path: str, index_path: str | None = None):
+        self.catalog_path = catalog_path
+        self.index_path = (index_path if index_path is not None
+                           else catalog_path + APP_CONTEXT.CATALOG.INDEX_SUFFIX)
+        if not self._index_valid():
+            self.build()
+        self._db = sqlite3.connect(
+            f"file:{self.index_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def close(self):
+        self._db.close()
+
+    def _signature(self) -> str:
+        st = os.stat(self.catalog_path)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    def _index_valid(self) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            db = sqlite3.connect(f"file:{self.index_path}?mode=ro", uri=True)
+            try:
+                row = db.execute(
+                    "SELECT value FROM meta WHERE key='signature'").fetchone()
+            finally:
+                db.close()
+        except sqlite3.Error:
+            return False
+        return row is not None and row[0] == self._signature()
+
+    def build(self):
+        """(Re)build index from catalog, replace index atomically."""
+        logger.info("ChannelCatalog.build: catalog='%s', index='%s'",
+                    self.catalog_path, self.index_path)
+        signature = self._signature()
+        tmp_path = self.index_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        db = sqlite3.connect(tmp_path)
+        count = 0
+        try:
+            db.execute("PRAGMA journal_mode=OFF")
+            db.execute("PRAGMA synchronous=OFF")
+            db.executescript(self.SCHEMA)
+            channels, grams, tags = [], [], []
+
+            def _flush():
+                db.executemany("INSERT INTO channels VALUES (?, ?, ?, ?, ?)", channels)
+                db.executemany("INSERT OR IGNORE INTO grams VALUES (?, ?)", grams)
+                db.executemany("INSERT OR IGNORE INTO tags VALUES (?, ?)", tags)
+                channels.clear()
+                grams.clear()
+                tags.clear()
+
+            for channel_id, (channel, channel_tags) in enumerate(
+                    iter_catalog(self.catalog_path)):
+                name_lc = channel.name.lower()
+                channels.append(
+                    (channel_id, channel.name, name_lc, channel.url, channel.icon))
+                grams += [(g, channel_id) for g in _name_grams(name_lc)]
+                tags += [(t, channel_id) for t in channel_tags]
+                count += 1
+                if len(channels) >= self.BATCH:
+                    _flush()
+            _flush()
+            db.executescript(self.POST_SCHEMA)
+            db.execute("INSERT INTO meta VALUES ('signature', ?)", (signature,))
+            db.commit()
+        finally:
+            db.close()
+        os.replace(tmp_path, self.index_path)
+        logger.info("ChannelCatalog.build: channels=%s", count)
+
+    def _count(self, table: str, column: str, value: str) -> int:
+        row = self._db.execute(
+            f"SELECT n FROM {table} WHERE {column} = ?", (value,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def _plan(self, query: str,
+              exclude: Collection[str] = ()) -> Tuple[str, List]:
+        """SQL 'FROM ... WHERE ...' and parameters for 'query'.
+
+        Rows are driven by the rarest gram or tag in query, other
+        words are verified on the channel row. Channels named in
+        'exclude' are left out.
+        """
+        drivers = []                   # (count, table, column, value)
+        checks = []
+        params: List = []
+        for word in query.lower().split():
+            if word.startswith("#"):
+                if len(word) > 1:
+                    tag = word[1:]
+                    drivers.append(
+                        (self._count("tag_counts", "tag", tag), "tags", "tag", tag))
+                    checks.append("c.id IN (SELECT id FROM tags WHERE tag = ?)")
+                    params.append(tag)
+            elif len(word) < 3:
+                drivers.append(
+                    (self._count("gram_counts", "gram", word), "grams", "gram", word))
+                checks.append("substr(c.name_lc, 1, ?) = ?")
+                params += [len(word), word]
+            else:
+                for gram in _name_grams(word) - {word[:1], word[:2]}:
+                    drivers.append(
+                        (self._count("gram_counts", "gram", gram), "grams", "gram", gram))
+                checks.append("instr(c.name_lc, ?) > 0")
+                params.append(word)
+
+        if exclude:
+            checks.append(f"c.name NOT IN ({', '.join('?' * len(exclude))})")
+            params += list(exclude)
+
+        if len(drivers) == 0:
+            if len(checks) == 0:
+                return "channels c", []
+            return f"channels c WHERE {' AND '.join(checks)}", params
+        _, table, column, value = min(drivers)
+        where = " AND ".join(checks)
+        return (f"{table} d JOIN channels c ON c.id = d.id "
+                f"WHERE d.{column} = ? AND {where}", [value] + params)
+
+    def search(self, query: str = "", offset: int = 0,
+               limit: int | None = None,
+               exclude: Collection[str] = ()) -> CatalogPage:
+        """Page of channels matching 'query' ordered by name.
+
+        :offset: index of first channel to return in result set
+
+        :limit: page size, default 'APP_CONTEXT.CATALOG.PAGE_SIZE'
+
+        :exclude: channel names left out of result set (and 'total')
+
+        """
+        if limit is None:
+            limit = APP_CONTEXT.CATALOG.PAGE_SIZE
+        source, params = self._plan(query, exclude)
+        total = self._db.execute(
+            f"SELECT count(*) FROM {source}", params).fetchone()[0]
+        rows = self._db.execute(
+            f"SELECT c.name, c.icon, c.url FROM {source} "
+            "ORDER BY c.name_lc, c.id LIMIT ? OFFSET ?",
+            params + [limit, offset]).fetchall()
+        channels = [StreamConfig(name=r[0], icon=r[1], url=r[2]) for r in rows]
+        logger.debug("ChannelCatalog.search: query='%s', offset=%s, total=%s",
+                     query, offset, total)
+        return CatalogPage(channels=channels, offset=offset, total=total)
+
+
+# ------------------------------------------------------------------
+# Locate catalog for activation url
+
+# Map catalog path -> open ChannelCatalog
+_catalogs: Dict[str, ChannelCatalog] = {}
+
+
+def _download_catalog(url: str) -> str | None:
+    """Download http(s) catalog 'url' (streamed to file,
+    revalidated with ETag/Last-Modified).
+
+    :return: local path, None if not found (local copy if server
+    can not be reached)
+
+    """
+    directory = os.path.join(
+        str(app_config.http_cache_directory), APP_CONTEXT.CATALOG.DIRECTORY)
+    os.makedirs(directory, exist_ok=True)
+    local_path = os.path.join(
+        directory, hashlib.sha256(url.encode()).hexdigest()[:16] + ".jsonl")
+    validators_path = local_path + ".json"
+
+    headers = {}
+    if os.path.exists(local_path) and os.path.exists(validators_path):
+        with open(validators_path, "r", encoding="utf-8") as f:
+            validators = json.load(f)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    try:
+        response = http_client().request(
+            "GET", url, headers=headers, preload_content=False)
+    except Exception as e:
+        logger.warning("_download_catalog: url='%s', error='%s'", url, e)
+        return local_path if os.path.exists(local_path) else None
+
+    try:
+        if response.status == 304:
+            return local_path
+        if response.status >= 400:
+            logger.info("_download_catalog: url='%s', status=%s",
+                        url, response.status)
+            return None
+        tmp_path = local_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for chunk in response.stream(64 * 1024):
+                f.write(chunk)
+        os.replace(tmp_path, local_path)
+        write_file_atomic(validators_path, json.dumps({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }))
+    finally:
+        response.release_conn()
+    return local_path
+
+
+def catalog_url(activation_url: str) -> str:
+    """Return catalog url in 'activation_url' -path."""
+    return f"{activation_url}/{APP_CONTEXT.CATALOG.FILE}"
+
+
+def open_catalog(activation_url: str) -> ChannelCatalog | None:
+    """Open (download and index if needed) catalog in
+    'activation_url'.
+
+    :return: catalog, None if 'activation_url' has no catalog
+
+    """
+    url = catalog_url(activation_url)
+    if url.startswith(("http://", "https://")):
+        catalog_path = _download_catalog(url)
+    else:
+        catalog_path = url[7:] if url.startswith("file://") else url
+        if not os.path.exists(catalog_path):
+            catalog_path = None
+    if catalog_path is None:
+        return None
+
+    catalog = _catalogs.get(catalog_path)
+    if catalog is None or not catalog._index_valid():
+        if catalog is not None:
+            catalog.close()
+        catalog = ChannelCatalog(catalog_path)
+        _catalogs[catalog_path] = catalog
+    return catalog
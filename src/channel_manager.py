@@ -36,22 +36,30 @@ channel configurations
 
 """
 
-from typing import Tuple, List
+from typing import Tuple, List, Callable, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
 
 import urllib3
 from urllib3.exceptions import HTTPError
 from urllib.parse import urlparse, urlunparse
 from dataclasses import dataclass, asdict
+from PIL import Image
 
 import os
-import yaml
+import hashlib
+import json
+import threading
+import time
 
 import logging
 
-from .utils import copy_files_with_wildcard
+from .utils import copy_files_with_wildcard, write_file_atomic
+from .yaml_cache import yaml_load, load_yaml_file, dump_yaml_file
 from .config import app_config
 from .constants import APP_CONTEXT, CLI
-from .jrr_converter import image_to_thumb
+from .jrr_converter import image_to_thumb, load_image
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +75,228 @@ class StreamConfig:
     url: str         # Stream url
 
 
+# ------------------------------------------------------------------
+# Shared http client
+
+# Created lazily in 'http_client'
+_http: urllib3.PoolManager | None = None
+_http_lock = threading.Lock()
+
+
+def http_client() -> urllib3.PoolManager:
+    """Module wide pooled http client (keep-alive, timeouts, retries).
+
+    Thread safe: used also from icon worker threads.
+    """
+    global _http
+    with _http_lock:
+        if _http is None:
+            _http = urllib3.PoolManager(
+                maxsize=APP_CONTEXT.HTTP.POOL_MAXSIZE,
+                block=True,
+                timeout=urllib3.Timeout(
+                    connect=APP_CONTEXT.HTTP.CONNECT_TIMEOUT,
+                    read=APP_CONTEXT.HTTP.READ_TIMEOUT),
+                retries=urllib3.Retry(
+                    total=APP_CONTEXT.HTTP.RETRIES, redirect=5),
+            )
+        return _http
+
+
+def _http_get(url: str) -> bytes:
+    """GET 'url' content using 'http_client'.
+
+    :raises: HTTPError on connection errors and on http status >= 400
+
+    """
+    response = http_client().request("GET", url)
+    if response.status >= 400:
+        raise HTTPError(f"HTTP status {response.status} for url '{url}'")
+    return response.data
+
+
+# ------------------------------------------------------------------
+# Conditional request cache
+
+
+class HttpCache:
+    """Cache http bodies, revalidate with conditional requests.
+
+    Bodies are stored content-addressed (sha256) in 'objects'
+    -sub-directory: urls with identical content share one file. Index
+    maps url to body digest, 'ETag', 'Last-Modified' and last use
+    time. Least recently used urls are evicted when bodies exceed
+    'max_bytes'.
+
+    Index is saved on 'put', use times updated by 'get' at most every
+    'flush_interval' secs (or on 'flush').
+
+    Thread safe.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int,
+                 flush_interval: float = APP_CONTEXT.HTTP.CACHE_INDEX_FLUSH):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.objects_dir = os.path.join(
+            self.directory, APP_CONTEXT.HTTP.CACHE_OBJECTS)
+        self.index_path = os.path.join(
+            self.directory, APP_CONTEXT.HTTP.CACHE_INDEX)
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = self._load_index()
+        self._dirty = False            # use times not saved
+        self._saved = time.monotonic()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        write_file_atomic(self.index_path, json.dumps(self._index))
+        self._dirty = False
+        self._saved = time.monotonic()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest)
+
+    def _read_object(self, entry: Dict | None) -> bytes | None:
+        if entry is None:
+            return None
+        try:
+            with open(self._object_path(entry["sha256"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store_object(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            write_file_atomic(object_path, body)
+        return digest
+
+    def _evict(self):
+        """Drop least recently used urls until bodies fit 'max_bytes'."""
+        def _sizes() -> Dict[str, int]:
+            return {e["sha256"]: e["size"] for e in self._index.values()}
+
+        lru = sorted(self._index.items(), key=lambda kv: kv[1]["used"])
+        while sum(_sizes().values()) > self.max_bytes and len(lru) > 1:
+            url, entry = lru.pop(0)
+            del self._index[url]
+            logger.debug("HttpCache._evict: url='%s'", url)
+            if entry["sha256"] not in _sizes():
+                try:
+                    os.remove(self._object_path(entry["sha256"]))
+                except OSError:
+                    pass
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers to revalidate cached 'url'."""
+        with self._lock:
+            entry = self._index.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url: str) -> bytes | None:
+        """Cached body for 'url' (None if not cached), marks use."""
+        with self._lock:
+            entry = self._index.get(url)
+            body = self._read_object(entry)
+            if body is not None:
+                entry["used"] = time.time()
+                self._dirty = True
+                if time.monotonic() - self._saved >= self.flush_interval:
+                    self._save_index()
+            return body
+
+    def flush(self) -> None:
+        """Save use times updated by 'get'."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def put(self, url: str, body: bytes, headers) -> None:
+        """Store 'body' for 'url' with validators from response 'headers'."""
+        with self._lock:
+            digest = self._store_object(body)
+            self._index[url] = {
+                "sha256": digest,
+                "size": len(body),
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "used": time.time(),
+            }
+            self._evict()
+            self._save_index()
+
+
+# Created lazily in 'http_cache'
+_cache: HttpCache | None = None
+
+
+def http_cache() -> HttpCache:
+    """Module wide http cache in 'app_config.http_cache_directory'."""
+    global _cache
+    with _http_lock:
+        directory = str(app_config.http_cache_directory)
+        if _cache is None or _cache.directory != directory:
+            _cache = HttpCache(directory, APP_CONTEXT.HTTP.CACHE_MAX_BYTES)
+        return _cache
+
+
+def http_cache_flush():
+    """Save use times of module wide http cache (if created)."""
+    with _http_lock:
+        cache = _cache
+    if cache is not None:
+        cache.flush()
+
+
+def _http_get_cached(url: str) -> bytes:
+    """GET 'url' revalidating cached copy with conditional request.
+
+    On '304 Not Modified' returns cached body. Serves cached body
+    also when server can not be reached.
+
+    :raises: HTTPError if no response and nothing cached, or on http
+    status >= 400
+
+    """
+    cache = http_cache()
+    try:
+        response = http_client().request(
+            "GET", url, headers=cache.conditional_headers(url))
+    except HTTPError as e:
+        body = cache.get(url)
+        if body is None:
+            raise
+        logger.warning("_http_get_cached: url='%s', error='%s' - using cached",
+                       url, e)
+        return body
+
+    if response.status == 304:
+        body = cache.get(url)
+        if body is not None:
+            logger.debug("_http_get_cached: url='%s' not modified", url)
+            return body
+        # cache lost body, fetch unconditionally
+        return _http_get(url)
+    if response.status >= 400:
+        raise HTTPError(f"HTTP status {response.status} for url '{url}'")
+    cache.put(url, response.data, response.headers)
+    return response.data
+
+
 # ------------------------------------------------------------------
 # read_file (from from or from file)
 
@@ -83,10 +313,8 @@ def read_file(url: str, encoding="utf-8") -> Tuple[str, bool]:
 
     # http access
     if url.startswith(("http://", "https://")):
-        http = urllib3.PoolManager()
         try:
-            response = http.request("GET", url)
-            return response.data.decode(encoding), True
+            return _http_get_cached(url).decode(encoding), True
         except HTTPError as e:
             return f"HTTP Error: {e}", False
         except Exception as e:
@@ -117,41 +345,76 @@ def icon_path(channel: StreamConfig) -> str:
     return image_path
 
 
-def add_channel_icons(channels: List[StreamConfig], yaml_url: str):
+def _load_icon_image(image_url: str) -> Image.Image:
+    """Load image from http(s) 'image_url' using shared client,
+    otherwise from file."""
+    if image_url.startswith(("http://", "https://")):
+        return Image.open(BytesIO(_http_get_cached(image_url)))
+    return load_image(image_url)
+
+
+def _add_channel_icon(channel: StreamConfig, yaml_url: str):
+    """Fetch, resize and save icon for one 'channel'."""
+    image_url = channel_icon_image(channel, yaml_url)
+
+    # save icon thumbs in local configuration
+    channel_icon = icon_path(channel)
+    logger.info("add_channel_icons: channel=%s, image_url=%s, channel_icon=%s",
+                channel.name, image_url, channel_icon)
+
+    # Resize image to save icon
+    image_to_thumb(img=_load_icon_image(image_url),
+                   thumb_path=channel_icon, bw=False)
+
+
+def add_channel_icons(
+        channels: List[StreamConfig],
+        yaml_url: str,
+        progress: Callable[[int, int, StreamConfig], None] | None = None,
+):
     """Save streaming icons for 'channels' from an image location
     relative to 'yaml_url'.
 
-    """
-    # parsed_yaml_url = urlparse(yaml_url)
-
-    for channel in channels:
-        # find url to icon image (relative to YAML config)
-        # parsed_icon_url = urlparse(channel.icon)
-        # if parsed_icon_url.scheme and parsed_icon_url.netloc:
-        #     image_url = channel.icon
-        # else:
-        #     image_path = os.path.join(
-        #         os.path.dirname(parsed_yaml_url.path),
-        #         channel.icon
-        #     )
-        #     image_url = urlunparse(parsed_yaml_url._replace(path=image_path))
+    Icons are fetched and resized in 'APP_CONTEXT.HTTP.ICON_WORKERS'
+    parallel threads.
 
-        image_url = channel_icon_image(channel, yaml_url)
+    :progress: called (in calling thread) after each icon with
+    number of icons done, total number of icons and channel done
 
-        # save icon thumbs in local configuration
-        channel_icon = icon_path(channel)
-        logger.info("add_channel_icons: channel=%s, image_url=%s, channel_icon=%s",
-                    channel.name, image_url, channel_icon)
+    :raises: first error met (after all icons processed)
 
-        # Resize image to save icon
-        image_to_thumb(image_path=image_url, thumb_path=channel_icon, bw=False)
+    """
+    total = len(channels)
+    done = 0
+    error = None
+    with ThreadPoolExecutor(
+            max_workers=APP_CONTEXT.HTTP.ICON_WORKERS,
+            thread_name_prefix="icons") as executor:
+        futures = {
+            executor.submit(_add_channel_icon, channel, yaml_url): channel
+            for channel in channels
+        }
+        for future in as_completed(futures):
+            channel = futures[future]
+            done += 1
+            try:
+                future.result()
+            except Exception as e:
+                logger.error("add_channel_icons: channel=%s, error='%s'",
+                             channel.name, e)
+                if error is None:
+                    error = e
+            if progress is not None:
+                progress(done, total, channel)
+    if error is not None:
+        raise error
 
 
 def parse_channels(channel_str) -> List[StreamConfig]:
     channels = []
     logger.debug("parse_channels: channel_str='%s'", channel_str)
     if channel_str is not None:
-        channels = [StreamConfig(**s) for s in yaml.safe_load(channel_str)]
+        channels = [StreamConfig(**s) for s in yaml_load(channel_str)]
     return channels
 
 
@@ -176,14 +439,7 @@ def update_channel_configurations(
     # First append
     streams += added_streams
 
-    if len(streams) == 0:
-        logger.info("delete_channel_configurations: file='%s'", yaml_file)
-        if os.path.exists(yaml_file):
-            os.remove(yaml_file)
-    else:
-        with open(yaml_file, 'w', encoding="UTF-8") as f:
-            channel_list = [asdict(s) for s in streams]
-            yaml.dump(channel_list, f)
+    channel_store.save(streams)
 
     # delete icons - if it exists
     for s in deleted_streams:
@@ -194,6 +450,85 @@ def update_channel_configurations(
     return streams
 
 
+# ------------------------------------------------------------------
+# Channel store
+
+
+class ChannelStore:
+    """Parsed stream configurations of 'app_config.streams_yaml' kept
+    in memory.
+
+    YAML is re-parsed only when file path, mtime or size changes.
+    Next/prev stream names for menus are computed once per load.
+    'version' changes whenever streams change.
+    """
+
+    def __init__(self):
+        self._path: str | None = None
+        self._signature: Tuple[int, int] | None = None
+        self._streams: List[StreamConfig] | None = None
+        self._neighbours: List[Tuple[str, str]] = []
+        self.version = 0
+
+    @staticmethod
+    def _stat(path: str) -> Tuple[int, int] | None:
+        """(mtime, size) of 'path', None if not found."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _set(self, path: str, streams: List[StreamConfig] | None):
+        self._path = path
+        self._signature = self._stat(path)
+        self._streams = streams
+        names = [s.name for s in streams] if streams is not None else []
+        self._neighbours = [
+            (names[(i + 1) % len(names)], names[i - 1])
+            for i in range(len(names))
+        ]
+        self.version += 1
+
+    def load(self) -> Tuple[List[StreamConfig] | None, bool]:
+        """Return streams, re-read if YAML file changed.
+
+        Factory reset (see 'init_streams') when file is missing.
+
+        :return: list of stream config/None if not found, bool if
+        factory reset done
+
+        """
+        path = str(app_config.streams_yaml)
+        if (self._streams is not None and path == self._path and
+                self._signature is not None and
+                self._stat(path) == self._signature):
+            return self._streams, False
+
+        logger.info("ChannelStore.load: path='%s'", path)
+        streams, factory_reset_done = init_streams()
+        self._set(path, streams)
+        return streams, factory_reset_done
+
+    def save(self, streams: List[StreamConfig]):
+        """Persist 'streams' atomically (delete YAML if no streams)."""
+        path = str(app_config.streams_yaml)
+        if len(streams) == 0:
+            logger.info("ChannelStore.save: delete file='%s'", path)
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            dump_yaml_file(path, [asdict(s) for s in streams])
+        self._set(path, streams)
+
+    def neighbours(self) -> List[Tuple[str, str]]:
+        """(next, prev) stream names for each stream in last load."""
+        return self._neighbours
+
+
+channel_store = ChannelStore()
+
+
 def _factory_reset_channels():
     """Copy initial (=factory setting) for channel streams.
     """
@@ -221,6 +556,22 @@ def init_streams(url: str | None = None) -> Tuple[List[StreamConfig] | None, boo
     factory_reset_done = False
     if url is None:
         url = f"file://{app_config.streams_yaml}"
+
+    # local YAML, parsed content from snapshot if unchanged
+    file_path = url[7:] if url.startswith("file://") else url
+    if not url.startswith(("http://", "https://")):
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            factory_reset_done = True
+            _factory_reset_channels()
+        try:
+            streams = load_yaml_file(file_path)
+        except FileNotFoundError:
+            logger.warning(
+                "init_streams: could not read channel configs from url='%s'", url)
+            return (None, factory_reset_done)
+        channels = [StreamConfig(**s) for s in streams] if streams else []
+        return (channels, factory_reset_done)
+
     yaml_str, status = read_file(url)
     if not status or len(yaml_str) == 0:
         # Factory reset
@@ -281,7 +632,7 @@ def channel_activate(
         streams: List[StreamConfig],
         new_stream: StreamConfig,
         activation_url,
-
+        progress: Callable[[int, int, StreamConfig], None] | None = None,
 ) -> List[StreamConfig]:
     """Activate 'new_stream' to the set of activate stream in
     'streams'
@@ -295,13 +646,16 @@ def channel_activate(
 
     :activation_url: url where new_stream is configured
 
+    :progress: icon progress callback, see 'add_channel_icons'
+
     """
 
     # yaml_file = app_config.streams_yaml
 
     activation_yaml_file = channel_activation_index(activation_url)
 
-    add_channel_icons(channels=[new_stream], yaml_url=activation_yaml_file)
+    add_channel_icons(channels=[new_stream], yaml_url=activation_yaml_file,
+                      progress=progress)
 
     # just icon name
     new_stream.icon = os.path.basename(new_stream.icon)
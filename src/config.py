@@ -89,6 +89,11 @@ class Config():
         # return Path.home() / '.icons/v2')
         return CLI.DEFAULT_ICON_DIR
 
+    @property
+    def http_cache_directory(self) -> str | Path:
+        """Return directory for cached http downloads"""
+        return CLI.DEFAULT_HTTP_CACHE_DIR
+
     @property
     def cnf_directory(self) -> str | Path:
         """Return directory for configurations"""
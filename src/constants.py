@@ -12,22 +12,32 @@ class CLI:
     # Commands
     CMD_RADIO = "radio"
     CMD_ICON_CONVERT = "convert"
+    CMD_FIRMWARE_MANIFEST = "fw-manifest"
+    CMD_REPLAY = "replay"
 
     # CLI options (for radio streamer)
     # OPT_SYSTEM_HALT = "--system-halt"
     OPT_CONSOLE_ALL_LINES = "--all-lines"
+    OPT_RECORD = "--record"
+
+    # CLI options (for hub traffic replay)
+    OPT_REPLAY_SPEED = "--speed"
+    OPT_REPLAY_TOPICS = "--topics"
 
     # CLI options (for icon converter)
     OPT_ICON_SOURCE = "--icons-from"
     OPT_ICON_TARGET = "--icons-to"
     OPT_STREAMING_ICON_WIDTH = "--width"
     OPT_STREAMING_ICON_HEIGHT = "--height"
+    OPT_ICON_JOBS = "--jobs"
 
     # DEFAULT_STREAMING_ICON_WIDTH = 96             # streamer icon width
     DEFAULT_STREAMING_ICON_WIDTH = 200             # streamer icon width
     DEFAULT_STREAMING_ICON_HEIGHT = DEFAULT_STREAMING_ICON_WIDTH
     # icon size (w,h) in sprite (divisible by 8)
     DEFAULT_SPRITE_ICON_SIZE = 24
+    # source hash, target size/mode of converted icons (in icon directory)
+    ICON_MANIFEST = ".jrr-icons.json"
 
     # Directories and files
     DEFAULT_ICON_SOURCE_DIR = Path.home() / ".icons"        # input for icon conversion
@@ -37,6 +47,7 @@ class CLI:
     #     os.path.dirname(__file__), "../cnf", "jrr_streams.yaml")
     DEFAULT_ICON_DIR = Path().home() / "cnf/icons"
     DEFAULT_STREAM_YAML = Path().home() / "cnf/jrr_streams.yaml"
+    DEFAULT_HTTP_CACHE_DIR = Path().home() / "cnf/http-cache"   # index.yaml, icon downloads
 
     FACTORY_ICON_DIR = os.path.join(
         os.path.dirname(__file__), "cnf", "icons")
@@ -89,11 +100,12 @@ class TOPICS:
         REBOOT = "REBOOT"                          # close app (and hope it gets restarted)
         HALT = "HALT"                              # halt machine
         HALT_ACK = "HALT-ACK"                      # halt acknowneded
-        # streame (runner) status reply
+        # streamer (runner) status: on change and reply to STATUS_QUERY
         STREAMER_STATUS_REPLY = "status_reply"
 
     class NETWORK_MESSAGES:
         STATUS = "nw-status"
+        CHANGE = "nw-change"                       # rtnetlink link/address/route event
 
     class STREAMER_MESSAGES:
         """Messages in STREAMER -topic"""
@@ -112,6 +124,7 @@ class TOPICS:
         UPDATE = "update"                          # full/fast/partial screen update
         TEST = "test"                              # test something
         CLOCK = "clock"                            # Update display time
+        STATUS = "status"                          # status icons and version (on change)
         SPRITE = "sprite"                          # Status icons on sprite
         BUTTON_TXT = "button"                      # button text
         MSG_INFO = "info"                          # info message to user
@@ -123,6 +136,7 @@ class TOPICS:
         FIRMAWRE = "firmware"                      # firmware w. release notes
         DSCREEN = "dscreen"                        # generic dscreen message
         NETWORK_INFO = "network"                   # ssid and IP address
+        NOW_PLAYING = "now-playing"                # stream title (ICY metadata)
 
     class QUESTION_MESSAGE:
         """Fields in Question message"""
@@ -176,6 +190,7 @@ class COROS:
         ENTRY_MSG_L1 = "msg1"
         ENTRY_VERSION = "version"
         ENTRY_MSG_L2 = "msg2"
+        ENTRY_NOW_PLAYING = "now-playing"
 
 
 class RPI:
@@ -253,6 +268,148 @@ class APP_CONTEXT:
 
         ICON_DIR = "icons"                 # icons relative to channel YAML url
 
+    class STATION_PROBE:
+        """Station health probe (station_probe.py)"""
+
+        CONCURRENCY = 8                    # max parallel probes
+        TIMEOUT = 5                        # secs for one probe (connect + read)
+        READ_BYTES = 8 * 1024              # stream bytes to read
+        MAX_REDIRECTS = 3                  # http redirects to follow
+        CACHE_TTL = 15 * 60                # secs probe result is valid
+
+    class HTTP:
+        """Shared http client (channel_manager.py)"""
+
+        POOL_MAXSIZE = 4                   # keep-alive connections per host
+        CONNECT_TIMEOUT = 5                # secs
+        READ_TIMEOUT = 15                  # secs
+        RETRIES = 2                        # retries on connection errors
+        ICON_WORKERS = 4                   # parallel icon fetch + thumbnail
+        CACHE_MAX_BYTES = 16 * 1024 * 1024  # http cache size limit (LRU evicted)
+        CACHE_INDEX = "index.json"         # url -> cache entry
+        CACHE_OBJECTS = "objects"          # bodies named by sha256
+        CACHE_INDEX_FLUSH = 60             # secs: use times (LRU) saved at most this often
+
+    class NETWORK_MONITOR:
+        """Connectivity monitor (network_coro.py)"""
+
+        PROBE_HOST = "www.google.com"      # TCP connect probe
+        PROBE_PORT = 80
+        PROBE_TIMEOUT = 5                  # secs
+        DNS_TTL = 300                      # secs probe address is cached
+        SETTLE = 0.5                       # secs to collect rtnetlink event burst
+        MIN_INTERVAL = 5                   # secs between probes after change
+        MAX_INTERVAL_UP = 300              # backoff limit, network up
+        MAX_INTERVAL_DOWN = 30             # backoff limit, network down
+
+    class OS_COMMAND:
+        """OS command executor (os_command.py)"""
+
+        MAX_CONCURRENCY = 2                # commands running at once
+        TIMEOUT = 60                       # secs before command is killed
+        KMSG = "/dev/kmsg"                 # kernel log (send_dmesg)
+        KMSG_PREFIX = "jrr"
+
+    class KEYBOARD_BURST:
+        """Keys arriving within window update screen once (secs, per
+        display driver 'KEY_BURST_WINDOW')"""
+
+        TFT = 0.03                         # fast refresh
+        EPAPER = 0.3                       # slow refresh
+
+    class KEYBOARD_HOTPLUG:
+        """Keyboard hotplug detection (kb_hotplug.py)"""
+
+        INPUT_DIR = "/dev/input"           # event* device nodes
+        SYSFS_INPUT = "/sys/class/input"   # eventN/device/name, phys
+        POLL_INTERVAL = 5                  # secs, when no inotify
+        ATTACH_RETRY = 0.1                 # secs, device node not yet accessible
+        RELAUNCH = 5                       # secs, restart keyboard reader after it died
+
+    class HUB_REQUEST:
+        """Request/reply over hub ('Hub.request')"""
+
+        TIMEOUT = 2.0                      # secs to wait for reply
+
+    class HUB_STATS:
+        """Hub instrumentation (hub_stats.py)"""
+
+        ENABLED = True
+        LATENCY_SAMPLE = 4                 # time every Nth handler call
+        LATENCY_BOUNDS = (0.1, 0.5, 1, 5, 10, 50, 100, 500)  # ms histogram buckets
+        DUMP_FILE = "/tmp/jrr-hub-stats.txt"  # written on SIGUSR1
+
+    class WIFI_SCAN:
+        """Wifi network scanning (wifi.py)"""
+
+        COMMAND = ["sudo", "iwlist"]       # + interface scanning
+        INTERFACE = "wlan0"
+        TTL = 60                           # secs scan results are fresh
+        TIMEOUT = 30                       # secs for one scan
+
+    class GITHUB:
+        """Github API tag lists (github.py)"""
+
+        TAGS_CACHE = "github-tags.json"    # in http cache directory
+        TAGS_TTL = 3600                    # secs before page is revalidated
+        PER_PAGE = 100                     # tags per API page
+        TIMEOUT = 10                       # secs
+
+    class FIRMWARE_DOWNLOAD:
+        """Firmware download (firmware.py)"""
+
+        CHUNK = 64 * 1024                  # bytes read/written at once
+        PART_SUFFIX = ".part"              # incomplete download, resumed
+        SHA256_SUFFIX = ".sha256"          # sha256sum file next to firmware zip
+        RETRIES = 3                        # resume attempts on connection errors
+        RETRY_DELAY = 2                    # secs before resuming
+        CONNECT_TIMEOUT = 10
+        READ_TIMEOUT = 30
+        PROGRESS_STEP = 5                  # percents between progress messages
+
+    class FIRMWARE_DELTA:
+        """Delta firmware updates (firmware.py)"""
+
+        MANIFEST_SUFFIX = ".manifest.json"  # file hashes, next to release zip
+
+    class FIRMWARE_PREFETCH:
+        """Background firmware prefetch while idle (firmware.py)"""
+
+        DIRECTORY = ".prefetch"            # in local root, hidden from local index
+        INTERVAL = 6 * 60 * 60             # secs between prefetch checks
+        RATE_LIMIT = 64 * 1024             # bytes/sec
+        NICE = 19                          # niceness of prefetch thread
+
+    class ICON_ATLAS:
+        """Channel icons packed to one file (icon_atlas.py)"""
+
+        FILE = ".icon-atlas.bin"           # in icon directory
+        MAGIC = b"JRRATLS1"
+        MODE = "RGB"                       # tile pixels in screen image mode
+
+    class YAML_SNAPSHOT:
+        """Binary snapshots of parsed YAML files (yaml_cache.py)"""
+
+        SUFFIX = ".snap"                   # '.<name>.snap' next to YAML file
+        VERSION = 1                        # bump when snapshot layout changes
+
+    class CATALOG:
+        """Large channel catalog (channel_catalog.py)"""
+
+        FILE = "index.jsonl"               # catalog next to index.yaml
+        INDEX_SUFFIX = ".idx"              # sqlite search index next to catalog
+        DIRECTORY = "catalogs"             # downloaded catalogs in http cache dir
+        PAGE_SIZE = 50                     # channels per menu page
+        KEY_PAGE_NEXT = "<PAGEDOWN>"       # keyboard keys for paging
+        KEY_PAGE_PREV = "<PAGEUP>"
+
+    class ICY:
+        """In-band stream metadata (icy.py, streamer_coro.py)"""
+
+        READ_CHUNK = 4 * 1024              # bytes read from stream at once
+        READ_TIMEOUT = 15                  # secs without stream data: stream stalled
+        PIPE_INPUT = "-"                   # streamer '--file' reading stdin
+
     class MENU:
 
         """Menu labels"""
@@ -275,6 +432,7 @@ class APP_CONTEXT:
         MAY_DELETE = "Poistaanko"
         MAY_ACTIVATE = "Aktivoidaanko"
         MAY_UPDATE = "Päivitetäänkö"
+        FIRMWARE_DOWNLOADING = "Ladataan"   # Firmware download progress
         MAY_REBOOT_TITLE = "Käynnistetäänkö"
         MAY_REBOOT_SUBTITLE = "uudelleen?"
         RESUME = "Takaisin"
@@ -283,6 +441,11 @@ class APP_CONTEXT:
         LOAD_CHANNELS = "Kanavat"           # Load more channels
         MENU_SUCCESS = "Onnistui"           # Operation success
         MENU_FAILURE = "Virhe"              # Operation Failure
+        STATION_DEAD = "Ei vastaa"          # Station probe failed
+        ICONS_LOADING = "Kuvat"             # Icon load progress
+        CATALOG_SEARCH = "Haku"             # Channel catalog search
+        CATALOG_NO_MATCH = "Ei hakutuloksia"  # Channel catalog search
+        CATALOG_LOADING = "Haetaan kanavia"   # Channel catalog open/index
 
         KB_NOK = "Näppäimistövirhe"
         KB_ACT = """
@@ -291,6 +454,7 @@ class APP_CONTEXT:
         """
 
         WIFI_SETUP = "Wifi valinta"
+        WIFI_SCANNING = "Haetaan verkkoja"  # Wifi scan in progress
 
         # Radio Streamer
         RADIO_NEXT_CHANNEL = NEXT           # Stream next channel
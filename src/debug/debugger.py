@@ -75,6 +75,7 @@ def action_help(command, hub):
     KEY = VALUE       : set KEY = VALUE in MESSAGE
     .                 : clear context
     @FILE             : read commands from a file
+    %                 : hub statistics (%- to reset counters)
 
     Examples:
 
@@ -225,6 +226,17 @@ def action_topic(command, topic, hub: Hub = None):
     return True
 
 
+def action_stats(command, hub: Hub = None):
+    """Print hub statistics, reset counters on '%-'."""
+    if hub is None:
+        _debugger_error("No hub: statistics not available")
+        return True
+    print(hub.stats.report())
+    if command == "%-":
+        hub.stats.reset()
+    return True
+
+
 # ------------------------------------------------------------------
 # Parser
 
@@ -240,6 +252,7 @@ class CMDS:
     CMD_CLEAR = "clear"
     CMD_COMMENT = "comment"
     CMD_COMMENT_OUTPUT = "comment!"
+    CMD_STATS = "stats"
 
 
 command_parser = {
@@ -253,6 +266,7 @@ command_parser = {
     CMDS.CMD_FILE:  r"^ *(?P<command>@)(?P<file_name>[\w_][\w_\./\d]+)(?P<rest>.*)",
     CMDS.CMD_COMMENT:  r"^ *(?P<command># )(?P<ignored>.*)(?P<rest>.*)",
     CMDS.CMD_COMMENT_OUTPUT:  r"^ *(?P<command>#!)(?P<line>.*)(?P<rest>.*)",
+    CMDS.CMD_STATS:  r"^ *(?P<command>%-?)(?P<rest>.*)",
 }
 
 
@@ -267,6 +281,7 @@ command_dispatcher = {
     CMDS.CMD_FILE:  action_file,
     CMDS.CMD_COMMENT:  action_comment_ignore,
     CMDS.CMD_COMMENT_OUTPUT:  action_comment_output,
+    CMDS.CMD_STATS:  action_stats,
 
 }
 
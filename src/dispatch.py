@@ -0,0 +1,83 @@
+"""Table driven message dispatch.
+
+'Dispatcher' maps message_type to handler in a dictionary, replacing
+'is_message_type' if/elif chains in coroutines. Handlers are
+registered with decorator 'on', e.g.
+
+    screen_dispatch = Dispatcher("screen")
+
+    @screen_dispatch.on(TOPICS.SCREEN_MESSAGES.INIT)
+    async def _screen_init(msg, hub):
+        ...
+
+    goon = await screen_dispatch.dispatch(msg, hub)
+
+Messages without handler go to 'default' handler.
+
+"""
+
+from typing import Any, Callable, Dict, List
+
+import logging
+
+from .messages import MsgRoot, message_type_of
+
+logger = logging.getLogger(__name__)
+
+
+class Dispatcher:
+    """Map message_type -> handler(msg, *args, **kwargs)."""
+
+    def __init__(self, name: str, default: Callable | None = None):
+        """:default: handler for messages without registered handler"""
+        self.name = name
+        self.default = default
+        self.handlers: Dict[str, Callable] = {}
+
+    @property
+    def message_types(self) -> List[str]:
+        return list(self.handlers.keys())
+
+    def __contains__(self, message_type: str) -> bool:
+        return message_type in self.handlers
+
+    def register(self, message_type: str, handler: Callable):
+        """Register 'handler' for 'message_type'.
+
+        :raises: ValueError if 'message_type' already has a handler
+        """
+        if message_type in self.handlers:
+            raise ValueError(
+                f"Dispatcher '{self.name}': {message_type=} already registered " +
+                f"to {self.handlers[message_type].__name__}")
+        self.handlers[message_type] = handler
+
+    def on(self, *message_types: str):
+        """Decorator registering function as handler for 'message_types'."""
+        def _decorator(handler: Callable) -> Callable:
+            for message_type in message_types:
+                self.register(message_type, handler)
+            return handler
+        return _decorator
+
+    def otherwise(self, handler: Callable) -> Callable:
+        """Decorator setting function as 'default' handler."""
+        self.default = handler
+        return handler
+
+    def handler(self, msg: str | MsgRoot) -> Callable | None:
+        """Handler for 'msg' ('default' if not registered)."""
+        return self.handlers.get(message_type_of(msg), self.default)
+
+    def dispatch(self, msg: str | MsgRoot, *args, **kwargs) -> Any:
+        """Call handler for 'msg' with 'msg, *args, **kwargs'.
+
+        :return: handler return value (awaitable for async handlers)
+
+        :raises: KeyError if no handler and no 'default'
+        """
+        handler = self.handler(msg)
+        if handler is None:
+            raise KeyError(
+                f"Dispatcher '{self.name}': no handler for {message_type_of(msg)=}")
+        return handler(msg, *args, **kwargs)
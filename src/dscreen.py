@@ -349,6 +349,9 @@ class DScreen:
     # processing state
     cursor: Cursor  # data entry
 
+    # last emitted message content: None = next message is full
+    emitted: Dict[str, Any] | None
+
     def __init__(self, fieldTypes: List[FieldType | Tuple[FieldType, str]]):
         """Construct list of empty 'FieldValue[FieldType]'
         -objects. Set 'cursor' pointing to the first 'inputAllowed'
@@ -372,6 +375,7 @@ class DScreen:
             self.fieldValues.append(fieldValue)
 
         self.cursor = Cursor(screen=self)
+        self.resetEmitted()
 
     # ------------------------------------------------------------------
     # propeties
@@ -444,13 +448,42 @@ class DScreen:
     # ------------------------------------------------------------------
     # facade
 
+    def resetEmitted(self):
+        """Next 'deltaMessage' carries all fields."""
+        self.emitted = None
+
+    def changedFields(self) -> List[FieldValue]:
+        """Fields changed since last emitted message."""
+        if self.emitted is None:
+            return list(self.fieldValues)
+        return [fieldValue for fieldValue in self.fieldValues
+                if self.emitted.get(fieldValue.name) != fieldValue.value]
+
     def message(self, screen_name: str):
         """Return message from 'fieldValue' on screen."""
-        gen = ((fieldValue.name, fieldValue.value)
-               for fieldValue in self.fieldValues)
+        self.emitted = {fieldValue.name: fieldValue.value
+                        for fieldValue in self.fieldValues}
+        gen = self.emitted.items()
         msg_dscreen = message_dscreen(screen_name=screen_name, key_values=gen)
         return msg_dscreen
 
+    def deltaMessage(self, screen_name: str) -> MsgDScreen | None:
+        """Return message with fields changed since last emitted
+        message (full message if none emitted), None if no change
+        (screen does not show cursor: cursor moves alone emit
+        nothing)."""
+        if self.emitted is None:
+            return self.message(screen_name)
+        changed = self.changedFields()
+        if not changed:
+            return None
+        for fieldValue in changed:
+            self.emitted[fieldValue.name] = fieldValue.value
+        return message_dscreen(
+            screen_name=screen_name,
+            key_values=((fieldValue.name, fieldValue.value) for fieldValue in changed),
+            full=False)
+
     def putInput(self, dataIn) -> Tuple[bool, str | None]:
         """Put 'input' on screen to a place pointed by 'cursor'.
 
@@ -549,6 +582,8 @@ class DApp:
                 raise KeyError(msg)
             fieldValue.value = init_value[1]
 
+        # screen shown from scratch
+        self.currentScreen.resetEmitted()
         return True
 
     def deActivateScreen(self):
@@ -570,6 +605,19 @@ class DApp:
 
         return self.currentScreen.message(screen_name=self.currentScreenName)
 
+    def deltaMessage(self) -> MsgDScreen | None:
+        """Return changes in 'currentScreen' since last message (see
+        'DScreen.deltaMessage').
+
+        :return: MsgDScreen -object, None if no changes or no screen
+        """
+        if self.currentScreen is None:
+            self.lastError = DSCREEN.MISC_ERRORS.NO_SCREEN_ACTIVE.format(
+                screens=list(self.screens.keys())
+            )
+            return None
+        return self.currentScreen.deltaMessage(screen_name=self.currentScreenName)
+
     def putInput(self, dataIn) -> bool:
         """Put 'dataIn' on 'currentScreen'.
 
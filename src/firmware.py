@@ -11,17 +11,24 @@ Uses semantic versioning policy:
 """
 
 from dataclasses import dataclass
-from typing import Tuple, List, Self
+from typing import Tuple, List, Self, Callable, Dict
+import hashlib
+import json
 import os
 import glob
 import shutil
 import re
-from urllib.parse import urlparse
+import stat
+import time
+import zipfile
+from urllib.parse import urlparse, urljoin, quote
+
+import requests
 
 
 from src.config import app_config
 from src.constants import APP_CONTEXT
-from src.utils import copy_file_or_directory
+from src.utils import write_file_atomic
 from src import github
 
 import logging
@@ -38,6 +45,7 @@ class FirmwareVersion:
     # using FIRMWARE_TAG_PATTERN
     repo_url: str | None = None      # firmware repository (with protocol)
     local_url: str | None = None     # local file path (simple pat)
+    sha256: str | None = None        # expected digest of 'repo_url' (if known)
 
     # Factories
     @classmethod
@@ -193,15 +201,45 @@ def firmware_current_link(realpath: bool = False) -> str | None:
     return target_path
 
 
+# ------------------------------------------------------------------
+# Directory listings memoised on directory mtime
+
+# (function name, directory) -> (directory signature, result)
+_dir_memo: Dict[Tuple[str, str], Tuple[Tuple, List]] = {}
+
+
+def _dir_memoised(name: str, directory: str, compute: Callable[[], List]) -> List:
+    """Return 'compute()' for 'directory', recomputed only when
+    'directory' changes (entries added/removed/renamed)."""
+    try:
+        st = os.stat(directory)
+        signature = (st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+    except OSError:
+        return compute()
+    key = (name, directory)
+    cached = _dir_memo.get(key)
+    if cached is not None and cached[0] == signature:
+        return list(cached[1])
+    result = compute()
+    _dir_memo[key] = (signature, result)
+    return list(result)
+
+
 # ------------------------------------------------------------------
 # Basic actions/firmware_repo_index
 
 def _local_zip_index(repo_url: str) -> List[FirmwareVersion]:
-    """Return list of zip files in 'repo_url'
+    """Return list of zip files in 'repo_url' (memoised on directory
+    mtime)
 
     :repo_url: file path to directory
 
     """
+    return _dir_memoised("_local_zip_index", _url_path(repo_url),
+                         lambda: _local_zip_index_glob(repo_url))
+
+
+def _local_zip_index_glob(repo_url: str) -> List[FirmwareVersion]:
 
     zip_files_pattern = f"{repo_url}/*.zip"
     file_glob = glob.glob(zip_files_pattern)
@@ -264,13 +302,18 @@ def firmware_repo_index() -> List[FirmwareVersion]:
 
 def firmware_local_index() -> List[FirmwareVersion]:
     """return list of 'FirmwareVersion' object under directory
-    'firmware_local_root'
+    'firmware_local_root' (memoised on directory mtime)
 
     Valid entries:
     - is sub-directory
     - sub-directory pattern/tag like 'jrr-0.1.2'
 
     """
+    return _dir_memoised("firmware_local_index", str(firmware_local_root()),
+                         _firmware_local_index_glob)
+
+
+def _firmware_local_index_glob() -> List[FirmwareVersion]:
 
     version_sub_directory_pattern = f"{firmware_local_root()}/*"
     local_repo_glob = glob.glob(version_sub_directory_pattern)
@@ -405,11 +448,227 @@ def firmware_cleanup():
     return True
 
 
-def firmware_choose(firmware_version: FirmwareVersion) -> str | None:
+# ------------------------------------------------------------------
+# Download
+
+
+class FirmwareChecksumError(ValueError):
+    """Downloaded firmware does not match expected SHA-256."""
+
+
+class FirmwareDownloadCancelled(Exception):
+    """Download cancelled by caller (partial file kept for resume)."""
+
+
+def _file_sha256(path: str):
+    """Return sha256 -object updated with content of 'path'."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(APP_CONTEXT.FIRMWARE_DOWNLOAD.CHUNK), b""):
+            sha.update(chunk)
+    return sha
+
+
+def _url_path(url: str) -> str:
+    """Local file path for 'url' (file:// or path)."""
+    return urlparse(url).path if url.startswith("file://") else url
+
+
+def _download_to_part(url: str, part_path: str,
+                      progress: Callable[[int, int | None], None] | None,
+                      rate_limit: int | None = None,
+                      cancel: Callable[[], bool] | None = None):
+    """Append 'url' content to 'part_path' starting at its current
+    size (http Range request), streamed in chunks.
+
+    :rate_limit: max average bytes/sec (sleep between chunks)
+
+    :cancel: checked between chunks, True raises
+    FirmwareDownloadCancelled
+
+    :return: sha256 -object for the whole 'part_path'
+    """
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    sha = _file_sha256(part_path) if offset > 0 else hashlib.sha256()
+    chunk_size = APP_CONTEXT.FIRMWARE_DOWNLOAD.CHUNK
+    if rate_limit is not None:
+        chunk_size = max(1024, min(chunk_size, rate_limit))
+
+    def _write(chunks, total: int | None, offset: int, sha):
+        start = time.monotonic()
+        with open(part_path, "ab" if offset > 0 else "wb") as f:
+            done = offset
+            for chunk in chunks:
+                if cancel is not None and cancel():
+                    raise FirmwareDownloadCancelled(
+                        f"Download cancelled {url} at {done} bytes")
+                f.write(chunk)
+                sha.update(chunk)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+                if rate_limit is not None:
+                    ahead = (done - offset) / rate_limit - (time.monotonic() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            f.flush()
+            os.fsync(f.fileno())
+        return sha
+
+    if not url.startswith(("http://", "https://")):
+        src_path = _url_path(url)
+        total = os.path.getsize(src_path)
+        if offset > total:
+            offset, sha = 0, hashlib.sha256()
+        with open(src_path, "rb") as src:
+            src.seek(offset)
+            return _write(iter(lambda: src.read(chunk_size), b""),
+                          total, offset, sha)
+
+    headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+    with requests.get(url, headers=headers, stream=True, timeout=(
+            APP_CONTEXT.FIRMWARE_DOWNLOAD.CONNECT_TIMEOUT,
+            APP_CONTEXT.FIRMWARE_DOWNLOAD.READ_TIMEOUT)) as response:
+        if response.status_code == 416:
+            # partial file not a prefix of 'url' - start over
+            logger.warning("_download_to_part: url='%s', offset=%s not satisfiable",
+                           url, offset)
+            os.remove(part_path)
+            return _download_to_part(url, part_path, progress,
+                                     rate_limit=rate_limit, cancel=cancel)
+        response.raise_for_status()
+        if offset > 0 and response.status_code != 206:
+            logger.info("_download_to_part: url='%s', range ignored, restart", url)
+            offset, sha = 0, hashlib.sha256()
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length is not None else None
+        logger.info("_download_to_part: url='%s', offset=%s, total=%s",
+                    url, offset, total)
+        return _write(response.iter_content(chunk_size), total, offset, sha)
+
+
+def firmware_download(url: str, dest_path: str,
+                      expected_sha256: str | None = None,
+                      progress: Callable[[int, int | None], None] | None = None,
+                      rate_limit: int | None = None,
+                      cancel: Callable[[], bool] | None = None,
+                      ) -> str:
+    """Download 'url' to 'dest_path' in chunks of
+    'APP_CONTEXT.FIRMWARE_DOWNLOAD.CHUNK' bytes.
+
+    Content is written to 'dest_path' + PART_SUFFIX, interrupted
+    downloads resume from its size (also on next call). 'dest_path'
+    appears only after content is complete and matches
+    'expected_sha256'.
+
+    :progress: called with (bytes done, total bytes or None)
+
+    :rate_limit: max average bytes/sec, None = unlimited
+
+    :cancel: polled between chunks, returning True stops download
+
+    :raises: FirmwareChecksumError on digest mismatch (partial file
+    removed), FirmwareDownloadCancelled when cancelled (partial file
+    kept)
+
+    :return: hex SHA-256 of downloaded content
+
+    """
+    part_path = dest_path + APP_CONTEXT.FIRMWARE_DOWNLOAD.PART_SUFFIX
+    retries = APP_CONTEXT.FIRMWARE_DOWNLOAD.RETRIES
+    for attempt in range(retries + 1):
+        try:
+            sha = _download_to_part(url, part_path, progress,
+                                    rate_limit=rate_limit, cancel=cancel)
+            break
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == retries:
+                raise
+            logger.warning("firmware_download: url='%s', attempt=%s, error='%s' - resume",
+                           url, attempt, e)
+            time.sleep(APP_CONTEXT.FIRMWARE_DOWNLOAD.RETRY_DELAY)
+
+    digest = sha.hexdigest()
+    if expected_sha256 is not None and digest != expected_sha256.lower():
+        os.remove(part_path)
+        raise FirmwareChecksumError(
+            f"SHA-256 mismatch for {url}: expected {expected_sha256}, got {digest}")
+    os.replace(part_path, dest_path)
+    logger.info("firmware_download: url='%s' -> '%s', sha256=%s",
+                url, dest_path, digest)
+    return digest
+
+
+def firmware_expected_sha256(firmware_version: FirmwareVersion) -> str | None:
+    """Return expected SHA-256 for 'firmware_version.repo_url'.
+
+    Uses 'firmware_version.sha256', or reads sha256sum -formatted
+    file 'repo_url' + SHA256_SUFFIX from repo.
+
+    :return: None if not known
+    """
+    if firmware_version.sha256 is not None:
+        return firmware_version.sha256
+    url = firmware_version.repo_url + APP_CONTEXT.FIRMWARE_DOWNLOAD.SHA256_SUFFIX
+    try:
+        if url.startswith(("http://", "https://")):
+            response = requests.get(
+                url, timeout=APP_CONTEXT.FIRMWARE_DOWNLOAD.CONNECT_TIMEOUT)
+            if response.status_code != 200:
+                return None
+            content = response.text
+        else:
+            with open(_url_path(url), "r", encoding="utf-8") as f:
+                content = f.read()
+    except (OSError, requests.RequestException) as e:
+        logger.info("firmware_expected_sha256: url='%s', error='%s'", url, e)
+        return None
+    fields = content.split()
+    return fields[0] if len(fields) > 0 else None
+
+
+def firmware_download_version(
+        firmware_version: FirmwareVersion,
+        progress: Callable[[int, int | None], None] | None = None,
+        local_root: str | None = None,
+        rate_limit: int | None = None,
+        cancel: Callable[[], bool] | None = None) -> str:
+    """Download (verified) 'firmware_version.repo_url' into
+    'local_root' (default 'firmware_local_root').
+
+    :raises: FileExistsError if already downloaded
+
+    :return: path of downloaded file
+
+    """
+    if local_root is None:
+        local_root = firmware_local_root()
+    dest_path = os.path.join(
+        local_root, os.path.basename(firmware_version.repo_url))
+    if os.path.exists(dest_path):
+        raise FileExistsError(f"File exists {dest_path}")
+
+    expected_sha256 = firmware_expected_sha256(firmware_version)
+    if expected_sha256 is None:
+        logger.warning("firmware_download_version: no SHA-256 for '%s' - not verified",
+                       firmware_version.repo_url)
+    firmware_download(firmware_version.repo_url, dest_path,
+                      expected_sha256=expected_sha256, progress=progress,
+                      rate_limit=rate_limit, cancel=cancel)
+    return dest_path
+
+
+def firmware_choose(
+        firmware_version: FirmwareVersion,
+        progress: Callable[[int, int | None], None] | None = None,
+) -> str | None:
     """Ensure 'firmware_version' is downloaded to local repo, and add
     pending symlink pointing to this entry.
 
-    Downloads 'firmware_version.repo_url' unless already downloaded.
+    Downloads 'firmware_version.repo_url' unless already downloaded
+    (see 'firmware_download_version', 'progress' called while
+    downloading).
 
     Creates symlink pointing to the local firmware version entry in
     local.
@@ -424,12 +683,414 @@ def firmware_choose(firmware_version: FirmwareVersion) -> str | None:
     if firmware_version.repo_url is None:
         raise ValueError(f"No repo url: {firmware_version}")
 
-    # Copy remote repo -> local repo
-    dest_path = copy_file_or_directory(src=firmware_version.repo_url,
-                                       dest=firmware_local_root())
+    # Copy remote repo -> local repo (verified)
+    dest_path = firmware_download_version(firmware_version, progress=progress)
 
     # Create symlink to dest_path (in local repo)
     symlink_path = firmware_pending_link()
     os.symlink(dest_path, symlink_path)
 
     return dest_path
+
+
+# ------------------------------------------------------------------
+# Unpack
+
+
+def _within(path: str, root: str) -> bool:
+    """True if 'path' (links resolved) is under 'root'."""
+    return os.path.realpath(path).startswith(os.path.realpath(root) + os.sep)
+
+
+def _extract_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, target: str,
+                    root: str):
+    """Write zip member 'info' to 'target' (CRC checked while
+    streaming, raises zipfile.BadZipFile on mismatch).
+
+    :raises: ValueError if symlink member points outside 'root'
+    """
+    mode = (info.external_attr >> 16) & 0xFFFF
+    if stat.S_ISLNK(mode):
+        link = zf.read(info).decode("utf-8")
+        if os.path.isabs(link) or not _within(
+                os.path.join(os.path.dirname(target), link), root):
+            raise ValueError(f"Invalid link '{info.filename}' -> '{link}'")
+        os.symlink(link, target)
+        return
+    with zf.open(info) as src, open(target, "wb") as dest:
+        shutil.copyfileobj(src, dest, APP_CONTEXT.FIRMWARE_DOWNLOAD.CHUNK)
+    if mode & 0o777:
+        os.chmod(target, mode & 0o777)
+
+
+def firmware_extract(zip_path: str, dest_dir: str) -> str:
+    """Extract 'jrr-<tag>/src/**' of release zip 'zip_path' into
+    'dest_dir' (created via 'dest_dir' + '.tmp', renamed when
+    complete). Other members are not written.
+
+    :raises: FileExistsError if 'dest_dir' exists, zipfile.BadZipFile
+    on corrupted zip, ValueError if zip has no 'src' -directory or
+    unsafe paths
+
+    :return: 'dest_dir'
+
+    """
+    if os.path.exists(dest_dir):
+        raise FileExistsError(f"File exists {dest_dir}")
+    tmp_dir = dest_dir + ".tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    start = time.monotonic()
+    extracted = extracted_bytes = 0
+    try:
+        os.makedirs(tmp_dir)
+        with zipfile.ZipFile(zip_path) as zf:
+            for info in zf.infolist():
+                parts = info.filename.split("/")
+                if len(parts) < 3 or parts[1] != "src":
+                    continue
+                rel = "/".join(parts[2:])
+                if rel == "":
+                    continue
+                target = os.path.join(tmp_dir, *rel.split("/"))
+                # realpath: earlier symlink members must not lead outside
+                if os.path.isabs(rel) or not _within(target, tmp_dir):
+                    raise ValueError(f"Invalid path '{info.filename}' in {zip_path}")
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _extract_member(zf, info, target, tmp_dir)
+                extracted += 1
+                extracted_bytes += info.file_size
+        if extracted == 0:
+            raise ValueError(f"No src -directory in {zip_path}")
+        os.rename(tmp_dir, dest_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    logger.info("firmware_extract: zip_path='%s' -> '%s', files=%s (%s bytes) in %.2fs",
+                zip_path, dest_dir, extracted, extracted_bytes,
+                time.monotonic() - start)
+    return dest_dir
+
+
+def firmware_unpack_pending(firmware_version: FirmwareVersion,
+                            zip_path: str | None = None) -> str:
+    """Extract downloaded release zip of 'firmware_version' into its
+    version directory, make it pending and remove the zip (replaces
+    'jrr_streamer.sh fw-unpack/fw-pending').
+
+    :zip_path: default: zip in 'firmware_local_root'
+
+    :return: version directory
+    """
+    if zip_path is None:
+        zip_path = os.path.join(firmware_local_root(),
+                                os.path.basename(firmware_version.repo_url))
+    dest_dir = firmware_extract(
+        zip_path, firmware_version_directory(
+            firmware_version, local_root=os.path.dirname(zip_path)))
+    _set_pending_link(dest_dir)
+    os.remove(zip_path)
+    return dest_dir
+
+
+# ------------------------------------------------------------------
+# Delta updates
+
+def firmware_version_directory(firmware_version: FirmwareVersion,
+                               local_root: str | None = None) -> str:
+    """Local version directory for 'firmware_version' (same naming
+    as 'jrr_streamer.sh pending')."""
+    if local_root is None:
+        local_root = firmware_local_root()
+    stem = os.path.basename(firmware_version.repo_url)
+    if stem.endswith(".zip"):
+        stem = stem[:-len(".zip")]
+    return os.path.join(local_root, f"jrr-{stem}")
+
+
+def firmware_manifest(directory: str, version: str | None = None) -> Dict:
+    """Return manifest (file path relative to 'directory' -> sha256,
+    size, mode) for files under 'directory'."""
+    files = {}
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if os.path.islink(path) or not os.path.isfile(path):
+                continue
+            st = os.stat(path)
+            files[os.path.relpath(path, directory)] = {
+                "sha256": _file_sha256(path).hexdigest(),
+                "size": st.st_size,
+                "mode": st.st_mode & 0o777,
+            }
+    return {"version": version, "files": files}
+
+
+def firmware_write_manifest(directory: str, manifest_path: str,
+                            version: str | None = None):
+    """Write 'firmware_manifest' of release 'directory' (=content of
+    'src') to 'manifest_path' (published next to release zip)."""
+    manifest = firmware_manifest(directory, version=version)
+    write_file_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True))
+    return manifest
+
+
+def _read_json_url(url: str) -> Dict | None:
+    """Read JSON from http(s)/file url, None if not found."""
+    try:
+        if url.startswith(("http://", "https://")):
+            response = requests.get(
+                url, timeout=APP_CONTEXT.FIRMWARE_DOWNLOAD.CONNECT_TIMEOUT)
+            if response.status_code != 200:
+                return None
+            return response.json()
+        with open(_url_path(url), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError, requests.RequestException) as e:
+        logger.info("_read_json_url: url='%s', error='%s'", url, e)
+        return None
+
+
+def _manifest_base_url(firmware_version: FirmwareVersion, manifest_url: str,
+                       manifest: Dict) -> str:
+    """Url, where release files listed in 'manifest' are found."""
+    if manifest.get("base_url"):
+        return urljoin(manifest_url, manifest["base_url"].rstrip("/") + "/")
+    parsed = urlparse(firmware_version.repo_url)
+    if parsed.scheme == "https" and parsed.netloc.startswith("github"):
+        owner, repo = parsed.path.split("/")[1:3]
+        return (f"https://raw.githubusercontent.com/{owner}/{repo}/refs/tags/"
+                f"{firmware_version.version}/src/")
+    stem = os.path.basename(firmware_version.repo_url)[:-len(".zip")]
+    return urljoin(manifest_url, f"{stem}/src/")
+
+
+def _set_pending_link(dest_path: str):
+    """Point 'firmware_pending_link' to 'dest_path' atomically."""
+    symlink_path = firmware_pending_link()
+    tmp_link = symlink_path + ".tmp"
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(dest_path, tmp_link)
+    os.replace(tmp_link, symlink_path)
+
+
+def firmware_delta_update(
+        firmware_version: FirmwareVersion,
+        progress: Callable[[int, int | None], None] | None = None,
+        local_root: str | None = None,
+        make_pending: bool = True,
+        rate_limit: int | None = None,
+        cancel: Callable[[], bool] | None = None,
+) -> str | None:
+    """Install 'firmware_version' into its version directory using
+    release manifest 'repo_url' + MANIFEST_SUFFIX: files unchanged
+    from current firmware are hard linked, only changed files are
+    downloaded (verified against manifest SHA-256). Result is made
+    pending if 'make_pending'.
+
+    Files are collected in version directory + '.tmp', which is kept
+    when cancelled: next call reuses files matching manifest SHA-256
+    and resumes partial download.
+
+    :progress: called with (bytes done, total bytes) of release files
+
+    :local_root: where version directory is created, default
+    'firmware_local_root'
+
+    :rate_limit, cancel: see 'firmware_download'
+
+    :raises: FileExistsError if version directory exists
+
+    :return: version directory, None if no manifest or no current
+    firmware (=use full download)
+
+    """
+    manifest_url = firmware_version.repo_url + APP_CONTEXT.FIRMWARE_DELTA.MANIFEST_SUFFIX
+    manifest = _read_json_url(manifest_url)
+    current_dir = firmware_current_link(realpath=True)
+    if manifest is None or current_dir is None:
+        logger.info("firmware_delta_update: manifest=%s, current_dir='%s' - no delta",
+                    manifest is not None, current_dir)
+        return None
+
+    dest_dir = firmware_version_directory(firmware_version, local_root=local_root)
+    if os.path.exists(dest_dir):
+        raise FileExistsError(f"File exists {dest_dir}")
+    base_url = _manifest_base_url(firmware_version, manifest_url, manifest)
+
+    # current files by content
+    current_by_hash = {
+        entry["sha256"]: rel
+        for rel, entry in firmware_manifest(current_dir)["files"].items()}
+
+    # kept from cancelled update
+    tmp_dir = dest_dir + ".tmp"
+    start = time.monotonic()
+    files = manifest["files"]
+    total = sum(entry["size"] for entry in files.values())
+    done = linked = downloaded = downloaded_bytes = reused = 0
+    try:
+        for rel, entry in sorted(files.items()):
+            target = os.path.join(tmp_dir, rel)
+            if os.path.isabs(rel) or not os.path.abspath(target).startswith(
+                    os.path.abspath(tmp_dir) + os.sep):
+                raise ValueError(f"Invalid path '{rel}' in {manifest_url}")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.lexists(target) and (
+                    os.path.islink(target) or not os.path.isfile(target) or
+                    _file_sha256(target).hexdigest() != entry["sha256"]):
+                os.remove(target)
+            source_rel = current_by_hash.get(entry["sha256"])
+            if os.path.exists(target):
+                # from cancelled update
+                reused += 1
+            elif source_rel is not None:
+                source = os.path.join(current_dir, source_rel)
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+                linked += 1
+            else:
+                firmware_download(urljoin(base_url, quote(rel)), target,
+                                  expected_sha256=entry["sha256"],
+                                  rate_limit=rate_limit, cancel=cancel)
+                os.chmod(target, entry.get("mode", 0o644))
+                downloaded += 1
+                downloaded_bytes += entry["size"]
+            done += entry["size"]
+            if progress is not None:
+                progress(done, total)
+        os.rename(tmp_dir, dest_dir)
+    except FirmwareDownloadCancelled:
+        # resumed on next call
+        raise
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if make_pending:
+        _set_pending_link(dest_dir)
+    logger.info("firmware_delta_update: dest_dir='%s', linked=%s, downloaded=%s "
+                "(%s of %s bytes), reused=%s in %.2fs", dest_dir, linked, downloaded,
+                downloaded_bytes, total, reused, time.monotonic() - start)
+    return dest_dir
+
+
+# ------------------------------------------------------------------
+# Prefetch
+#
+# Versions are staged under 'firmware_prefetch_root' (hidden
+# directory in local root, not seen by 'firmware_local_index' - so
+# they stay in 'firmware_available_versions') and moved into local
+# root when activated.
+
+def firmware_prefetch_root() -> str:
+    """Staging directory for prefetched firmware."""
+    return os.path.join(firmware_local_root(),
+                        APP_CONTEXT.FIRMWARE_PREFETCH.DIRECTORY)
+
+
+def firmware_prefetched(firmware_version: FirmwareVersion) -> str | None:
+    """Return prefetched version directory of 'firmware_version', None
+    if not prefetched."""
+    version_dir = firmware_version_directory(
+        firmware_version, local_root=firmware_prefetch_root())
+    if os.path.isdir(version_dir):
+        return version_dir
+    return None
+
+
+def _prefetch_cleanup(firmware_version: FirmwareVersion):
+    """Remove staged entries of other versions than
+    'firmware_version' (its partial download or delta is kept for
+    resume)."""
+    root = firmware_prefetch_root()
+    zip_name = os.path.basename(firmware_version.repo_url)
+    version_name = os.path.basename(
+        firmware_version_directory(firmware_version, local_root=root))
+    keep = {zip_name, zip_name + APP_CONTEXT.FIRMWARE_DOWNLOAD.PART_SUFFIX,
+            version_name, version_name + ".tmp"}
+    for name in os.listdir(root):
+        if name in keep:
+            continue
+        path = os.path.join(root, name)
+        logger.info("_prefetch_cleanup: remove '%s'", path)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def firmware_prefetch(firmware_version: FirmwareVersion,
+                      rate_limit: int | None = None,
+                      cancel: Callable[[], bool] | None = None) -> str:
+    """Stage 'firmware_version' into 'firmware_prefetch_root': delta
+    update if release has manifest, else verified zip extracted (and
+    removed). Nothing is made pending.
+
+    :rate_limit, cancel: see 'firmware_download'
+
+    :return: prefetched path (see 'firmware_prefetched')
+
+    """
+    prefetched = firmware_prefetched(firmware_version)
+    if prefetched is not None:
+        return prefetched
+    root = firmware_prefetch_root()
+    os.makedirs(root, exist_ok=True)
+    _prefetch_cleanup(firmware_version)
+
+    dest = firmware_delta_update(firmware_version, local_root=root,
+                                 make_pending=False,
+                                 rate_limit=rate_limit, cancel=cancel)
+    if dest is None:
+        zip_path = firmware_download_version(firmware_version, local_root=root,
+                                             rate_limit=rate_limit, cancel=cancel)
+        try:
+            dest = firmware_extract(
+                zip_path, firmware_version_directory(firmware_version, local_root=root))
+        finally:
+            os.remove(zip_path)
+    logger.info("firmware_prefetch: firmware_version='%s' -> '%s'",
+                firmware_version, dest)
+    return dest
+
+
+def firmware_prefetch_newest(rate_limit: int | None = None,
+                             cancel: Callable[[], bool] | None = None) -> str | None:
+    """Prefetch newest of 'firmware_available_versions'.
+
+    :return: prefetched path, None if no newer version available
+    """
+    available = firmware_available_versions()
+    if len(available) == 0:
+        return None
+    return firmware_prefetch(available[-1], rate_limit=rate_limit, cancel=cancel)
+
+
+def firmware_activate_prefetched(firmware_version: FirmwareVersion) -> str | None:
+    """Move prefetched 'firmware_version' into local root and make
+    it pending (no download, no unpack).
+
+    :raises: FileExistsError if target exists in local root
+
+    :return: version directory in local root, None if
+    'firmware_version' was not prefetched
+
+    """
+    prefetched = firmware_prefetched(firmware_version)
+    if prefetched is None:
+        return None
+    dest = os.path.join(firmware_local_root(), os.path.basename(prefetched))
+    if os.path.exists(dest):
+        raise FileExistsError(f"File exists {dest}")
+    os.rename(prefetched, dest)
+    _set_pending_link(dest)
+    logger.info("firmware_activate_prefetched: '%s' -> '%s'", prefetched, dest)
+    return dest
@@ -0,0 +1,108 @@
+"""Background firmware prefetch.
+
+While radio is idle (display asleep, network up) newest available
+firmware is staged with 'firmware.firmware_prefetch' in a dedicated
+low priority thread (niceness 'APP_CONTEXT.FIRMWARE_PREFETCH.NICE'),
+downloads capped to 'APP_CONTEXT.FIRMWARE_PREFETCH.RATE_LIMIT'
+bytes/sec. User activity cancels prefetch between download chunks,
+partial download is resumed on next idle period.
+
+Activating prefetched firmware from menu is then just a rename and
+pending symlink (see 'firmware.firmware_activate_prefetched').
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+import threading
+import time
+
+import logging
+
+from .constants import APP_CONTEXT
+from .firmware import firmware_prefetch_newest, FirmwareDownloadCancelled
+from .helpers import background_task
+
+logger = logging.getLogger(__name__)
+
+
+def _lower_thread_priority(nice: int):
+    """Set niceness of calling thread (Linux: per thread)."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+    except (AttributeError, OSError) as e:
+        logger.info("_lower_thread_priority: nice=%s, error='%s'", nice, e)
+
+
+class FirmwarePrefetcher:
+    """Run 'firmware_prefetch_newest' at most once per 'interval'
+    secs when idle."""
+
+    def __init__(self,
+                 interval: float = APP_CONTEXT.FIRMWARE_PREFETCH.INTERVAL,
+                 rate_limit: int | None = APP_CONTEXT.FIRMWARE_PREFETCH.RATE_LIMIT,
+                 nice: int = APP_CONTEXT.FIRMWARE_PREFETCH.NICE):
+        self.interval = interval
+        self.rate_limit = rate_limit
+        self.nice = nice
+        self.last_attempt: float | None = None
+        self.task: asyncio.Task | None = None
+        self._cancel = threading.Event()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def maybe_start(self, idle: bool) -> asyncio.Task | None:
+        """Start prefetch if 'idle', not running and 'interval' passed
+        since last attempt.
+
+        :return: task started, None if not started
+        """
+        if not idle or self.running:
+            return None
+        now = time.monotonic()
+        if self.last_attempt is not None and now - self.last_attempt < self.interval:
+            return None
+        self.last_attempt = now
+        self._cancel.clear()
+        self.task = background_task(self._run(), name="firmware-prefetch")
+        return self.task
+
+    def cancel(self):
+        """Stop running prefetch (user became active), next idle
+        period resumes."""
+        if self.running:
+            logger.info("FirmwarePrefetcher.cancel: cancelling prefetch")
+            self._cancel.set()
+            self.last_attempt = None
+
+    async def stop(self):
+        """Cancel and wait until worker has stopped."""
+        task = self.task
+        self.cancel()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _worker(self) -> str | None:
+        _lower_thread_priority(self.nice)
+        return firmware_prefetch_newest(rate_limit=self.rate_limit,
+                                        cancel=self._cancel.is_set)
+
+    async def _run(self) -> str | None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="fw-prefetch")
+        loop = asyncio.get_running_loop()
+        try:
+            prefetched = await loop.run_in_executor(self._executor, self._worker)
+        except FirmwareDownloadCancelled as e:
+            logger.info("FirmwarePrefetcher: %s", e)
+            return None
+        logger.info("FirmwarePrefetcher: prefetched='%s'", prefetched)
+        return prefetched
+
+
+firmware_prefetcher = FirmwarePrefetcher()
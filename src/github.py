@@ -1,35 +1,137 @@
 """Github API module
+
+Tag lists are cached per API page in 'APP_CONTEXT.GITHUB.TAGS_CACHE'
+(under 'app_config.http_cache_directory') with their ETag:
+
+- pages fetched within 'APP_CONTEXT.GITHUB.TAGS_TTL' are served
+  without a request
+
+- older pages are revalidated with 'If-None-Match' (304 responses do
+  not count against API rate limit)
+
+- when API cannot be reached or is rate limited, stale pages are
+  served
+
+Pages are followed lazily from 'Link: <...>; rel="next"' -headers.
+
 """
 import requests
 
-from typing import List
+from typing import Dict, Iterator, List
+import json
+import os
+import threading
+import time
 
 import logging
 logger = logging.getLogger(__name__)
-from .utils import copy_file_or_directory
+from .config import app_config
+from .constants import APP_CONTEXT
+from .utils import copy_file_or_directory, write_file_atomic
 
-def github_tags(tags_url) -> List[str]:
-    # url = f"https://api.github.com/repos/{owner}/{repo}/tags"
-    logger.info("github_tags: tags_url=%s", tags_url)
+# ------------------------------------------------------------------
+# Tag cache
 
-    # Make the GET request
-    response = requests.get(tags_url)
-    logger.debug(": response='%s'", response)
-    if response.status_code != 200:
-        logger.error("github_tags: response='%s' from tags_url=%s",
-                     response, tags_url)
+_cache_lock = threading.Lock()
 
-        response.raise_for_status()
 
-    # Check if the request was successful
-    # esponse.status_code == 200:
-    tags = response.json()
-    logger.debug("github_tags: tags='%s'", tags)
-    ret = [tag['name'] for tag in tags]
-    # for tag in tags:
-    #     print(f"Tag: {tag['name']}")
+def _cache_path() -> str:
+    return os.path.join(str(app_config.http_cache_directory),
+                        APP_CONTEXT.GITHUB.TAGS_CACHE)
+
+
+def _cache_read() -> Dict[str, Dict]:
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _cache_write(cache: Dict[str, Dict]):
+    try:
+        write_file_atomic(_cache_path(), json.dumps(cache))
+    except OSError as e:
+        logger.warning("_cache_write: path='%s', error='%s'", _cache_path(), e)
+
+
+def _next_link(link_header: str | None) -> str | None:
+    """Return url with rel="next" in 'link_header'."""
+    if link_header is None:
+        return None
+    for part in link_header.split(","):
+        section = part.split(";")
+        if len(section) > 1 and any(
+                s.strip() == 'rel="next"' for s in section[1:]):
+            return section[0].strip().strip("<>")
+    return None
 
-    return ret
+
+def _github_tags_page(page_url: str) -> Dict:
+    """Return cache entry {etag, fetched, tags, next} for
+    'page_url', (re)validated as needed.
+
+    :raises: requests.RequestException/HTTPError if page can not be
+    fetched and is not in cache
+
+    """
+    with _cache_lock:
+        entry = _cache_read().get(page_url)
+    if entry is not None and time.time() - entry["fetched"] < APP_CONTEXT.GITHUB.TAGS_TTL:
+        return entry
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if entry is not None and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    try:
+        response = requests.get(page_url, headers=headers,
+                                timeout=APP_CONTEXT.GITHUB.TIMEOUT)
+        logger.debug("_github_tags_page: page_url='%s', response='%s'",
+                     page_url, response)
+        if response.status_code == 304:
+            entry["fetched"] = time.time()
+        elif response.status_code == 200:
+            entry = {
+                "etag": response.headers.get("ETag"),
+                "fetched": time.time(),
+                "tags": [tag["name"] for tag in response.json()],
+                "next": _next_link(response.headers.get("Link")),
+            }
+        else:
+            logger.error("github_tags: response='%s' from tags_url=%s",
+                         response, page_url)
+            response.raise_for_status()
+    except requests.RequestException as e:
+        if entry is None:
+            raise
+        logger.warning("_github_tags_page: page_url='%s', error='%s' - serve stale",
+                       page_url, e)
+        return entry
+
+    with _cache_lock:
+        cache = _cache_read()
+        cache[page_url] = entry
+        _cache_write(cache)
+    return entry
+
+
+def iter_github_tags(tags_url) -> Iterator[str]:
+    """Yield tag names from 'tags_url', next page fetched only when
+    previous page is consumed."""
+    separator = "&" if "?" in tags_url else "?"
+    page_url = f"{tags_url}{separator}per_page={APP_CONTEXT.GITHUB.PER_PAGE}"
+    while page_url is not None:
+        entry = _github_tags_page(page_url)
+        yield from entry["tags"]
+        page_url = entry["next"]
+
+
+def github_tags(tags_url) -> List[str]:
+    # url = f"https://api.github.com/repos/{owner}/{repo}/tags"
+    logger.info("github_tags: tags_url=%s", tags_url)
+    tags = list(iter_github_tags(tags_url))
+    logger.debug("github_tags: tags='%s'", tags)
+    return tags
 
 
 if __name__ == "__main__":
@@ -43,12 +145,10 @@ if __name__ == "__main__":
     tags = github_tags(url)
     print(f"{tags=}")
     tag = tags[1]
-    
+
 
     # https://github.com/jarjuk/jrr/archive/refs/tags/jrr-0.0.latest.zip
     zipfile = f"https://github.com/{owner}/{repo}/archive/refs/tags/{tag}.zip"
     print(f"{zipfile=}")
 
     copy_file_or_directory(src=zipfile, dest="tmp")
-
-
@@ -83,7 +83,7 @@ def _shutdown_input_handler(button, hub: Hub, topic, loop):
 
     logger.warning("_button_shutdown: button='%s', button_state: %s",
                    button, button_state)
-    send_dmesg(f"{__file__}: Shudown starting")
+    send_dmesg(f"{__file__}: Shudown starting", loop=loop)
     hub.publish(
         topic=topic,
         message=message_halt(source=TOPICS.HALT_SOURCE.GPIO)
@@ -5,6 +5,26 @@ import asyncio
 import logging
 logger = logging.getLogger(__name__)
 
+# Tasks created with 'background_task' (keep reference until done)
+_background_tasks = set()
+
+
+def background_task(coro, name=None) -> asyncio.Task:
+    """Schedule 'coro' in running loop, log its exception (if any).
+
+    Keeps reference to task until it is done.
+    """
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    _background_tasks.add(task)
+
+    def _done(task):
+        _background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("background_task: name='%s', exception='%s'",
+                         task.get_name(), task.exception())
+    task.add_done_callback(_done)
+    return task
+
 # cancel task and wait for it to complete
 
 
@@ -24,3 +44,44 @@ async def cancel_and_wait(task, msg=None):
             f"cancel_and_wait: CancelledError='%s', msg='%s'", e, msg)
     except OSError as e:
         logger.warning(f"cancel_and_wait: OSError: '%s', msg='%s", e, msg)
+
+
+class Coalescer:
+    """Run callback once per burst of 'schedule' calls.
+
+    First 'schedule' arms a timer of 'window' secs (0: next event loop
+    iteration); later calls within the window only replace the
+    callback. 'flush' runs pending callback right away.
+    """
+
+    def __init__(self, window: float = 0.0):
+        self.window = window
+        self._callback = None
+        self._handle: asyncio.TimerHandle | asyncio.Handle | None = None
+
+    @property
+    def pending(self) -> bool:
+        return self._handle is not None
+
+    def schedule(self, callback):
+        self._callback = callback
+        if self._handle is None:
+            loop = asyncio.get_running_loop()
+            if self.window > 0:
+                self._handle = loop.call_later(self.window, self.flush)
+            else:
+                self._handle = loop.call_soon(self.flush)
+
+    def flush(self):
+        if self._handle is None:
+            return
+        self._handle.cancel()
+        self._handle = None
+        callback, self._callback = self._callback, None
+        callback()
+
+    def cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._callback = None
@@ -0,0 +1,280 @@
+"""Hub traffic recorder and replayer
+
+'HubRecorder' taps 'Hub.publish' and appends each message with its
+topic and monotonic timestamp (secs from session start) to a log
+file. Records are pickled one by one, a session starts with a header
+record. Logs are appended to, several sessions are replayed one after
+another.
+
+'replay' publishes logged messages to a hub in real time (scaled by
+'speed') or as fast as possible ('speed=0'). 'replay_bench' replays
+into a fresh hub with application screen and controller status
+handlers (display, streamer and hardware stubbed, no side effects)
+and reports throughput and hub stats (see 'hub_stats').
+
+Logs are pickles: replay only logs you recorded yourself.
+
+Usage:
+
+    jrr radio --record FILE
+    jrr replay FILE [--speed 1.0] [--topics TOPIC ...]
+"""
+
+from typing import Any, Dict, Iterator, List, Tuple
+import asyncio
+import logging
+import pickle
+import time
+
+from .constants import APP_CONTEXT, COROS, TOPICS
+from .messages import message_exit, message_type_of
+from .publish_subsrcibe import Hub
+from .reader_coro import reader_coro
+
+logger = logging.getLogger(__name__)
+
+# First record in session: (RECORD_HEADER, wall clock time)
+RECORD_HEADER = "jrr-hub-record/1"
+
+
+# ------------------------------------------------------------------
+# Recorder
+
+
+class HubRecorder:
+    """Append messages published on 'hub' to 'file_path'."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.hub: Hub | None = None
+        self.recorded = 0
+        self.skipped = 0
+        self._file = None
+        self._started = 0.0
+
+    def attach(self, hub: Hub) -> "HubRecorder":
+        """Start session: write header and tap 'hub'."""
+        self._file = open(self.file_path, "ab")
+        self._started = time.monotonic()
+        self._write((RECORD_HEADER, time.time()))
+        self.hub = hub
+        hub.taps.append(self)
+        logger.info("HubRecorder: recording to file_path='%s'", self.file_path)
+        return self
+
+    def detach(self):
+        """Remove tap and close log."""
+        if self.hub is not None:
+            self.hub.taps.remove(self)
+            self.hub = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info("HubRecorder: file_path='%s' recorded=%s, skipped=%s",
+                        self.file_path, self.recorded, self.skipped)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tyyppi, value, traceback):
+        self.detach()
+
+    def _write(self, record: Tuple):
+        self._file.write(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def __call__(self, topic: str, message: Any):
+        """Hub tap."""
+        try:
+            self._write((time.monotonic() - self._started, topic, message))
+            self.recorded += 1
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            # never break publish
+            if self.skipped == 0:
+                logger.warning("HubRecorder: cannot record topic='%s' message='%s': %s",
+                               topic, message, err)
+            self.skipped += 1
+
+
+# ------------------------------------------------------------------
+# Replayer
+
+
+def read_records(file_path: str) -> Iterator[Tuple[float, str, Any]]:
+    """Yield '(secs, topic, message)' from log 'file_path'.
+
+    'secs' run on across sessions. Reading stops on truncated last
+    record (recorder killed while writing).
+    """
+    offset = 0.0
+    secs = 0.0
+    with open(file_path, "rb") as file:
+        while True:
+            try:
+                # records pickled separately: no shared memo
+                record = pickle.load(file)
+            except EOFError:
+                return
+            except pickle.UnpicklingError as err:
+                logger.warning("read_records: file_path='%s' truncated: %s", file_path, err)
+                return
+            if record[0] == RECORD_HEADER:
+                # new session continues from last message
+                offset = secs
+                continue
+            secs = offset + record[0]
+            yield secs, record[1], record[2]
+
+
+async def replay(hub: Hub,
+                 file_path: str,
+                 speed: float = 0.0,
+                 topics: List[str] | None = None) -> int:
+    """Publish messages in 'file_path' to 'hub'.
+
+    :speed: 1.0 = recorded pace, 2.0 twice as fast, 0 as fast as
+    possible (yield to consumers between messages)
+
+    :topics: replay only these topics (None: all)
+
+    :return: number of messages published
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    published = 0
+    for secs, topic, message in read_records(file_path):
+        if topics is not None and topic not in topics:
+            continue
+        delay = start + secs / speed - loop.time() if speed > 0 else 0
+        await asyncio.sleep(max(delay, 0))
+        hub.publish(topic=topic, message=message)
+        published += 1
+    return published
+
+
+# ------------------------------------------------------------------
+# Replay benchmark
+
+# Controller messages handled in replay: they only update controller
+# state and screen status. Others (clock tick, user input, halt) may
+# download firmware, change wifi, save state or halt host.
+CONTROL_REPLAYED = (TOPICS.NETWORK_MESSAGES.STATUS,
+                    TOPICS.KEYBOARD_MESSAGES.STATUS,
+                    TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY)
+
+
+class NullDisplay:
+    """Display driver stand-in (see 'tft_ili9486.TFT_DRIVER'): screen
+    is rendered in memory, display output discarded."""
+
+    async def init(self):
+        pass
+
+    async def Clear(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def sleep(self):
+        pass
+
+    async def wake_up(self):
+        pass
+
+    async def display(self, image, x0: int = 0, y0: int = 0):
+        pass
+
+
+def _consume(msg, hub) -> bool:
+    """Streamer/hardware stand-in: accept everything."""
+    return True
+
+
+async def replay_bench(file_path: str,
+                       speed: float = 0.0,
+                       topics: List[str] | None = None) -> Tuple[Dict[str, float], Hub]:
+    """Replay 'file_path' to fresh hub with application consumers.
+
+    SCREEN is handled by 'screen_coro.screen_dispatch' rendering to
+    'NullDisplay', CONTROL messages in 'CONTROL_REPLAYED' by controller
+    handlers (see 'jrr_radio.control_dispatcher') on fresh
+    'ControllerState'. Other topics and messages are consumed by
+    '_consume'.
+
+    Messages published by handlers are discarded (log already has
+    them): hub stats count replayed messages only.
+
+    :return: throughput figures, hub (for 'hub.stats')
+    """
+    # application modules need hardware libraries: load on demand
+    from . import jrr_radio, screen_coro
+    from .screen import Screen
+
+    replay_topics = {topic for _, topic, _ in read_records(file_path)
+                     if topics is None or topic in topics}
+    hub = Hub()
+    # handler output
+    sink = Hub()
+
+    screen_coro.screen_driver = screen_coro.ScreenDriver(
+        screen=Screen(size=(APP_CONTEXT.SCREEN.WIDTH, APP_CONTEXT.SCREEN.HEIGHT)),
+        driver=NullDisplay())
+    control = jrr_radio.control_dispatcher(name=COROS.MASTER, tasks=[])
+
+    # EXIT ends consumer: not passed to handlers (screen would close
+    # display and ack halt, controller expects no EXIT)
+    async def _screen_action(msg, hub) -> bool:
+        if message_type_of(msg) == TOPICS.COMMON_MESSAGES.EXIT:
+            return False
+        return await screen_coro.screen_dispatch.dispatch(msg, sink)
+
+    def _control_action(msg, hub) -> bool:
+        message_type = message_type_of(msg)
+        if message_type == TOPICS.COMMON_MESSAGES.EXIT:
+            return False
+        if message_type not in CONTROL_REPLAYED:
+            return True
+        return control.dispatch(msg, sink)
+
+    actions = {
+        TOPICS.SCREEN: (COROS.SCREEN, _screen_action),
+        TOPICS.CONTROL: (COROS.MASTER, _control_action),
+    }
+    consumer_topics = sorted(replay_topics)
+    app_state = jrr_radio.controller_state
+    jrr_radio.controller_state = jrr_radio.ControllerState()
+    try:
+        consumers = []
+        for topic in consumer_topics:
+            name, action = actions.get(topic, (f"replay-{topic}", _consume))
+            consumers.append(asyncio.create_task(
+                reader_coro(name=name, hub=hub, topic=topic, action=action)))
+        # let consumers subscribe
+        await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        published = await replay(hub=hub, file_path=file_path, speed=speed, topics=topics)
+        # end consumers (not counted in stats)
+        exit_msg = message_exit(source=TOPICS.HALT_SOURCE.MESSAGE)
+        for topic in consumer_topics:
+            for queue in hub.topics.get(topic, ()):
+                queue.put_nowait(exit_msg)
+        await asyncio.gather(*consumers)
+        elapsed = time.perf_counter() - start
+    finally:
+        jrr_radio.controller_state = app_state
+
+    return {
+        "messages": published,
+        "secs": elapsed,
+        "msg/s": published / elapsed if elapsed > 0 else 0.0,
+    }, hub
+
+
+def replay_main(parsed):
+    """Command 'replay': replay log and print throughput and hub stats."""
+    result, hub = asyncio.run(replay_bench(
+        file_path=parsed.log, speed=parsed.speed, topics=parsed.topics))
+    for key, value in result.items():
+        print(f"{key:10s} {value:12.3f}")
+    print(hub.stats.report())
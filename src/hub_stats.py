@@ -0,0 +1,193 @@
+"""Hub instrumentation
+
+Counters maintained by 'publish_subsrcibe.Hub' and subscription
+loops:
+
+- messages published per topic and message_type
+- current and high-water queue depth per subscription
+- handler latency histogram per subscriber and message_type (sampled
+  every 'APP_CONTEXT.HUB_STATS.LATENCY_SAMPLE' message)
+
+All counters have fixed size (message types and subscribers are
+finite), cheap enough to keep on in production. Inspect with '%'
+-command in debugger or dump to 'APP_CONTEXT.HUB_STATS.DUMP_FILE' on
+SIGUSR1.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import asyncio
+import logging
+import time
+
+from .constants import APP_CONTEXT
+from .messages import message_type_of
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------
+# Counters
+
+
+@dataclass(slots=True)
+class QueueStats:
+    """Depth of one subscription queue."""
+    topic: str
+    name: str
+    queue: asyncio.Queue
+    high_water: int = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Fixed buckets: count[i] handlers finished within 'bounds[i]' ms,
+    last bucket for slower ones."""
+    bounds: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)
+    n: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def add(self, secs: float):
+        ms = secs * 1000
+        i = 0
+        for bound in self.bounds:
+            if ms <= bound:
+                break
+            i += 1
+        self.counts[i] += 1
+        self.n += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+
+class HubStats:
+    """Publish counts, queue depths and handler latencies for 'Hub'."""
+
+    def __init__(self,
+                 enabled: bool = APP_CONTEXT.HUB_STATS.ENABLED,
+                 latency_sample: int = APP_CONTEXT.HUB_STATS.LATENCY_SAMPLE,
+                 bounds: Tuple[float, ...] = APP_CONTEXT.HUB_STATS.LATENCY_BOUNDS):
+        self.enabled = enabled
+        self.latency_sample = latency_sample
+        self.bounds = bounds
+        self.queues: Dict[asyncio.Queue, QueueStats] = {}
+        self.reset()
+
+    def reset(self):
+        """Restart counters (subscriptions kept)."""
+        self.started = time.monotonic()
+        # topic -> message_type -> count
+        self.published: Dict[str, Dict[str, int]] = {}
+        for queue_stats in self.queues.values():
+            queue_stats.high_water = queue_stats.depth
+        # (subscriber name, message_type) -> histogram
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._sample_counter = 0
+
+    # ------------------------------------------------------------------
+    # Hooks
+
+    def subscribed(self, topic: str, queue: asyncio.Queue, name: str | None):
+        self.queues[queue] = QueueStats(
+            topic=topic, name=name or f"{topic}-{len(self.queues)}", queue=queue)
+
+    def unsubscribed(self, queue: asyncio.Queue):
+        self.queues.pop(queue, None)
+
+    def publishing(self, topic: str, message, subscriptions):
+        """Count 'message' on 'topic' and record depth of 'subscriptions'
+        queues (called after put)."""
+        if not self.enabled:
+            return
+        counts = self.published.get(topic)
+        if counts is None:
+            counts = self.published[topic] = {}
+        message_type = message_type_of(message)
+        counts[message_type] = counts.get(message_type, 0) + 1
+        queues = self.queues
+        for queue in subscriptions:
+            queue_stats = queues.get(queue)
+            if queue_stats is not None:
+                depth = queue.qsize()
+                if depth > queue_stats.high_water:
+                    queue_stats.high_water = depth
+
+    def handling(self) -> float | None:
+        """Start handler timing: perf_counter for sampled messages,
+        None otherwise."""
+        if not self.enabled:
+            return None
+        self._sample_counter += 1
+        if self._sample_counter < self.latency_sample:
+            return None
+        self._sample_counter = 0
+        return time.perf_counter()
+
+    def handled(self, name: str, message, start: float | None):
+        """Record latency of handler started at 'start' (see
+        'handling')."""
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        key = (name, message_type_of(message))
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = LatencyHistogram(bounds=self.bounds)
+        histogram.add(elapsed)
+
+    # ------------------------------------------------------------------
+    # Presentation
+
+    def report(self) -> str:
+        """Human readable counters."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        lines = [f"hub stats: enabled={self.enabled}, elapsed={elapsed:.1f}s, " +
+                 f"latency sample=1/{self.latency_sample}"]
+
+        lines.append("")
+        lines.append(f"{'topic':20s} {'message_type':24s} {'count':>8s} {'msg/s':>8s}")
+        for topic, counts in sorted(self.published.items()):
+            for message_type, count in sorted(counts.items()):
+                lines.append(f"{topic:20s} {message_type:24s} {count:8d} {count / elapsed:8.2f}")
+
+        lines.append("")
+        lines.append(f"{'subscription':20s} {'topic':24s} {'depth':>8s} {'high':>8s}")
+        for queue_stats in sorted(self.queues.values(), key=lambda q: q.name):
+            lines.append(f"{queue_stats.name:20s} {queue_stats.topic:24s} " +
+                         f"{queue_stats.depth:8d} {queue_stats.high_water:8d}")
+
+        lines.append("")
+        buckets = " ".join(f"<={bound:g}" for bound in self.bounds) + " >"
+        lines.append(f"{'handler':20s} {'message_type':24s} {'n':>6s} {'mean':>8s} " +
+                     f"{'max':>8s} ms  [{buckets}]")
+        for (name, message_type), histogram in sorted(self.latency.items()):
+            lines.append(f"{name:20s} {message_type:24s} {histogram.n:6d} " +
+                         f"{histogram.mean:8.3f} {histogram.max:8.3f}     " +
+                         f"{histogram.counts}")
+        return "\n".join(lines)
+
+    def dump(self, file_path: str = APP_CONTEXT.HUB_STATS.DUMP_FILE) -> str:
+        """Write 'report' to 'file_path'.
+
+        :return: file_path
+        """
+        with open(file_path, "w") as file:
+            file.write(self.report())
+            file.write("\n")
+        logger.info("hub stats dumped to file_path='%s'", file_path)
+        return file_path
@@ -0,0 +1,253 @@
+"""Channel icon atlas.
+
+Packs icons of active channels (PNGs in 'app_config.icon_directory')
+into one file 'APP_CONTEXT.ICON_ATLAS.FILE' in the same directory.
+Like 'spriter.py' for status icons, but tiles are stored resized to
+'app_config.streaming_icon_size' and as raw pixels in display image
+mode, so that showing an icon needs no PNG decoding or resampling.
+
+Atlas file layout:
+
+- 8 bytes magic 'APP_CONTEXT.ICON_ATLAS.MAGIC'
+- 4 bytes header length (little endian)
+- JSON header: mode, tile size and tiles: icon name -> offset of raw
+  tile data (relative to end of header) and source signature
+  (mtime_ns, size) of the PNG the tile was made of
+- raw tile data
+
+'IconAtlas' memory maps atlas file and creates tile images by
+offset. Tile is not used if its source PNG has changed after atlas
+was built (caller falls back to the PNG).
+
+"""
+
+from typing import Dict, Iterable, List, Tuple
+import asyncio
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from PIL import Image
+
+import logging
+
+from .config import app_config
+from .constants import APP_CONTEXT
+from .helpers import background_task
+from .jrr_converter import image_resize
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<8sI")
+
+# ------------------------------------------------------------------
+# Build
+
+
+def atlas_path(icon_dir: str) -> str:
+    """Return path of icon atlas in 'icon_dir'."""
+    return os.path.join(str(icon_dir), APP_CONTEXT.ICON_ATLAS.FILE)
+
+
+def _source_signature(path: str) -> List[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _atlas_sources(icon_dir: str, icons: Iterable[str]) -> Dict[str, List[int]]:
+    """Return icon name -> source signature for existing 'icons'."""
+    sources = {}
+    for icon in icons:
+        name = os.path.basename(icon)
+        signature = _source_signature(os.path.join(str(icon_dir), name))
+        if signature is not None:
+            sources[name] = signature
+    return sources
+
+
+def build_atlas(icon_dir: str, icons: Iterable[str],
+                size: Tuple[int, int] | None = None,
+                mode: str = APP_CONTEXT.ICON_ATLAS.MODE) -> int:
+    """Build atlas of 'icons' in 'icon_dir' (replaced atomically).
+
+    Icons, which cannot be read, are logged and left out.
+
+    :size: tile size, default 'app_config.streaming_icon_size'
+
+    :return: number of tiles in atlas
+
+    """
+    if size is None:
+        size = app_config.streaming_icon_size
+    width, height = size
+    sources = _atlas_sources(icon_dir, icons)
+
+    # resize tiles, offsets known before writing
+    tiles = {}
+    data = []
+    offset = 0
+    for name, signature in sorted(sources.items()):
+        try:
+            with Image.open(os.path.join(str(icon_dir), name)) as img:
+                tile = image_resize(img, width=width, height=height).convert(mode)
+        except (OSError, ValueError) as e:
+            logger.warning("build_atlas: icon='%s', error='%s'", name, e)
+            continue
+        raw = tile.tobytes()
+        tiles[name] = {"offset": offset, "source": signature}
+        data.append(raw)
+        offset += len(raw)
+
+    header = json.dumps({
+        "mode": mode, "size": [width, height], "tiles": tiles}).encode("utf-8")
+
+    path = atlas_path(icon_dir)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(icon_dir), prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(APP_CONTEXT.ICON_ATLAS.MAGIC, len(header)))
+            f.write(header)
+            for raw in data:
+                f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.info("build_atlas: path='%s', tiles=%s", path, len(tiles))
+    return len(tiles)
+
+# ------------------------------------------------------------------
+# Memory mapped atlas
+
+
+class IconAtlas:
+    """Memory mapped atlas file 'path'."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, header_len = _HEADER.unpack_from(self._mm, 0)
+            if magic != APP_CONTEXT.ICON_ATLAS.MAGIC:
+                raise ValueError(f"Not an icon atlas '{path}'")
+            header = json.loads(
+                self._mm[_HEADER.size:_HEADER.size + header_len])
+        except (struct.error, ValueError):
+            self._mm.close()
+            raise
+        self.mode: str = header["mode"]
+        self.size: Tuple[int, int] = tuple(header["size"])
+        self.tiles: Dict[str, Dict] = header["tiles"]
+        self._data_start = _HEADER.size + header_len
+        self._tile_bytes = len(Image.new(self.mode, (1, 1)).tobytes()) * \
+            self.size[0] * self.size[1]
+
+    def close(self):
+        self._mm.close()
+
+    def tile(self, name: str) -> Image.Image | None:
+        """Return tile image for icon 'name', None if not in atlas."""
+        entry = self.tiles.get(os.path.basename(name))
+        if entry is None:
+            return None
+        start = self._data_start + entry["offset"]
+        return Image.frombytes(
+            self.mode, self.size, self._mm[start:start + self._tile_bytes])
+
+    def is_current(self, icon_dir: str, icons: Iterable[str],
+                   size: Tuple[int, int]) -> bool:
+        """True if atlas has exactly 'icons' built from their current
+        files with tile 'size'."""
+        return (self.size == tuple(size) and
+                {n: e["source"] for n, e in self.tiles.items()} ==
+                _atlas_sources(icon_dir, icons))
+
+
+# Map atlas path -> (file signature, IconAtlas)
+_atlases: Dict[str, Tuple[Tuple, IconAtlas]] = {}
+_atlas_lock = threading.Lock()
+
+
+def icon_atlas(icon_dir: str) -> IconAtlas | None:
+    """Return mapped atlas in 'icon_dir' (re-mapped when atlas file
+    changes), None if no (valid) atlas."""
+    path = atlas_path(icon_dir)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _atlas_lock:
+        cached = _atlases.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+            del _atlases[path]
+        try:
+            atlas = IconAtlas(path)
+        except (OSError, ValueError) as e:
+            logger.warning("icon_atlas: path='%s', error='%s'", path, e)
+            return None
+        _atlases[path] = (signature, atlas)
+        return atlas
+
+
+def atlas_tile(icon_dir: str, name: str) -> Image.Image | None:
+    """Return atlas tile for icon 'name' in 'icon_dir', None if not
+    in atlas or icon file changed after atlas was built."""
+    atlas = icon_atlas(icon_dir)
+    if atlas is None:
+        return None
+    entry = atlas.tiles.get(os.path.basename(name))
+    if entry is None or entry["source"] != _source_signature(
+            os.path.join(str(icon_dir), os.path.basename(name))):
+        return None
+    return atlas.tile(name)
+
+# ------------------------------------------------------------------
+# Keep atlas up to date
+
+
+_build_lock = threading.Lock()
+
+
+def update_atlas(icon_dir: str, icons: Iterable[str]) -> bool:
+    """Rebuild atlas in 'icon_dir' unless it is current for 'icons'.
+
+    :return: True if atlas was rebuilt
+    """
+    icons = list(icons)
+    size = app_config.streaming_icon_size
+    with _build_lock:
+        atlas = icon_atlas(icon_dir)
+        if atlas is not None and atlas.is_current(icon_dir, icons, size):
+            return False
+        build_atlas(icon_dir, icons, size=size)
+        return True
+
+
+def update_atlas_in_background(icon_dir: str, icons: Iterable[str]) -> asyncio.Task | None:
+    """Schedule 'update_atlas' in a worker thread of running event loop.
+
+    :return: task created, None if no running loop
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        logger.info("update_atlas_in_background: no running loop")
+        return None
+    return background_task(
+        asyncio.to_thread(update_atlas, str(icon_dir), list(icons)),
+        name="icon-atlas")
@@ -0,0 +1,226 @@
+"""ICY (shoutcast/icecast) stream protocol helpers.
+
+- 'icy_open' opens http(s) stream connection requesting in-band
+  metadata ('Icy-MetaData: 1') and parses response headers
+
+- 'IcyMetadataParser' splits stream bytes into audio and metadata
+  blocks (every 'icy-metaint' audio bytes one length byte followed
+  by 16*length bytes of metadata)
+
+- 'parse_metadata' parses metadata block
+  "StreamTitle='Artist - Song';StreamUrl='';" into a dict
+
+"""
+
+from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlparse
+import asyncio
+import re
+import ssl
+import time
+
+import logging
+
+from .constants import APP_CONTEXT
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Connection
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+@dataclass
+class IcyResponse:
+    """Open stream connection after response headers read."""
+    url: str                          # url responding (after redirects)
+    status: int | None                # http status code
+    headers: Dict[str, str]           # response headers, lower case keys
+    reader: asyncio.StreamReader      # positioned at response body
+    writer: asyncio.StreamWriter
+    connect_time: float               # secs to open TCP(/TLS) connection
+
+    @property
+    def metaint(self) -> int | None:
+        """Audio bytes between metadata blocks, None if no metadata."""
+        try:
+            return int(self.headers["icy-metaint"])
+        except (KeyError, ValueError):
+            return None
+
+    async def close(self):
+        """Close connection (never raises)."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+def parse_headers(header_block: bytes) -> Tuple[int | None, Dict[str, str]]:
+    """Parse status line and headers from 'header_block'.
+
+    Accepts 'HTTP/1.x' and 'ICY' (shoutcast v1) status lines.
+
+    :return: status code (None if not parsed), headers with lower
+    case keys
+
+    """
+    lines = header_block.decode("latin-1").split("\r\n")
+    status = None
+    parts = lines[0].split(" ", 2)
+    if len(parts) >= 2 and parts[1].isdigit():
+        status = int(parts[1])
+
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    return status, headers
+
+
+def bitrate(headers: Dict[str, str]) -> int | None:
+    """Advertised bitrate from 'icy-br' header (may be '128,128')."""
+    icy_br = headers.get("icy-br")
+    if icy_br is None:
+        return None
+    try:
+        return int(icy_br.split(",")[0])
+    except ValueError:
+        return None
+
+
+async def icy_open(url: str, redirects: int | None = None) -> IcyResponse:
+    """Open 'url' requesting in-band metadata, follow redirects.
+
+    Raises 'ValueError' for unsupported url or too many redirects,
+    'OSError' for connection errors.
+
+    :redirects: max redirects to follow, default
+    'APP_CONTEXT.STATION_PROBE.MAX_REDIRECTS'
+
+    :return: response (caller must 'close')
+
+    """
+    if redirects is None:
+        redirects = APP_CONTEXT.STATION_PROBE.MAX_REDIRECTS
+
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported scheme '{parsed.scheme}'")
+
+    use_ssl = parsed.scheme == "https"
+    port = parsed.port or (443 if use_ssl else 80)
+    path = parsed.path or "/"
+    if parsed.query:
+        path = f"{path}?{parsed.query}"
+
+    start = time.monotonic()
+    reader, writer = await asyncio.open_connection(
+        parsed.hostname, port,
+        ssl=ssl.create_default_context() if use_ssl else None)
+    response = IcyResponse(url=url, status=None, headers={},
+                           reader=reader, writer=writer,
+                           connect_time=time.monotonic() - start)
+    try:
+        request = (f"GET {path} HTTP/1.0\r\n"
+                   f"Host: {parsed.netloc}\r\n"
+                   "User-Agent: jrr\r\n"
+                   "Icy-MetaData: 1\r\n"
+                   "Connection: close\r\n"
+                   "\r\n")
+        writer.write(request.encode("latin-1"))
+        await writer.drain()
+        header_block = await reader.readuntil(b"\r\n\r\n")
+    except BaseException:
+        await response.close()
+        raise
+    response.status, response.headers = parse_headers(header_block)
+
+    if response.status in REDIRECT_STATUSES and "location" in response.headers:
+        await response.close()
+        if redirects <= 0:
+            raise ValueError(f"Too many redirects for url '{url}'")
+        # may be relative to 'url'
+        location = urljoin(url, response.headers["location"])
+        logger.debug("icy_open: url='%s' -> location='%s'", url, location)
+        return await icy_open(location, redirects=redirects - 1)
+
+    logger.debug("icy_open: url='%s', status=%s, headers=%s",
+                 url, response.status, response.headers)
+    return response
+
+# ------------------------------------------------------------------
+# Metadata
+
+
+# StreamTitle='Guns N' Roses - Patience';StreamUrl='';
+_METADATA_PATTERN = re.compile(r"(\w+)='(.*?)';(?=\w+=|$)", re.DOTALL)
+
+
+def parse_metadata(block: bytes) -> Dict[str, str]:
+    """Parse 'key='value';' pairs from metadata 'block'.
+
+    Metadata is padded with NUL bytes, text mostly utf-8, fallback
+    to latin-1.
+
+    """
+    block = block.rstrip(b"\0")
+    try:
+        text = block.decode("utf-8")
+    except UnicodeDecodeError:
+        text = block.decode("latin-1")
+    return {m.group(1): m.group(2) for m in _METADATA_PATTERN.finditer(text.strip())}
+
+
+class IcyMetadataParser:
+    """Incrementally split ICY stream into audio and metadata.
+
+    Feed arbitrary sized chunks, state carries over chunk boundaries.
+    """
+
+    def __init__(self, metaint: int):
+        """:metaint: audio bytes between metadata blocks"""
+        self.metaint = metaint
+        self._audio_left = metaint     # audio bytes before next length byte
+        self._meta_left = 0            # metadata bytes still to collect
+        self._meta_buf = bytearray()
+
+    def feed(self, chunk: bytes) -> Tuple[bytes, List[Dict[str, str]]]:
+        """Consume 'chunk'.
+
+        :return: audio bytes in 'chunk', parsed non-empty metadata
+        blocks completed in 'chunk'
+
+        """
+        audio = bytearray()
+        metadata = []
+        view = memoryview(chunk)
+        pos = 0
+        while pos < len(view):
+            if self._audio_left > 0:
+                n = min(self._audio_left, len(view) - pos)
+                audio += view[pos:pos + n]
+                self._audio_left -= n
+                pos += n
+            elif self._meta_left == 0 and len(self._meta_buf) == 0:
+                # length byte
+                self._meta_left = view[pos] * 16
+                pos += 1
+                if self._meta_left == 0:
+                    self._audio_left = self.metaint
+            else:
+                n = min(self._meta_left, len(view) - pos)
+                self._meta_buf += view[pos:pos + n]
+                self._meta_left -= n
+                pos += n
+                if self._meta_left == 0:
+                    meta = parse_metadata(bytes(self._meta_buf))
+                    if meta:
+                        metadata.append(meta)
+                    self._meta_buf.clear()
+                    self._audio_left = self.metaint
+        return bytes(audio), metadata
@@ -10,6 +10,8 @@ import logging
 from .constants import (CLI)
 from .jrr_radio import radio_main
 from .jrr_converter import converter_main
+from .firmware import firmware_write_manifest
+from .hub_record import replay_main
 from .config import app_config
 
 logger = logging.getLogger(__name__)
@@ -75,6 +77,27 @@ def commandLineParser() -> argparse.ArgumentParser:
         CLI.OPT_CONSOLE_ALL_LINES, action="store_true", default=False,
         help="Output all journalctl lines to console (default no)",
     )
+    radio_parser.add_argument(
+        CLI.OPT_RECORD, type=str, default=None,
+        help="Append messages published on hub to file (for replay)",
+    )
+
+    # --------------------
+    # Hub traffic replay
+
+    replay_parser = subparsers.add_parser(
+        CLI.CMD_REPLAY, help="Replay recorded hub traffic, report throughput and latency")
+    replay_parser.add_argument(
+        "log", type=str,
+        help=f"File recorded with '{CLI.CMD_RADIO} {CLI.OPT_RECORD}'")
+    replay_parser.add_argument(
+        CLI.OPT_REPLAY_SPEED, type=float, default=0.0,
+        help="1.0 = recorded pace, 0 = as fast as possible (default)",
+    )
+    replay_parser.add_argument(
+        CLI.OPT_REPLAY_TOPICS, type=str, nargs="+", default=None,
+        help="Replay only these topics (default all)",
+    )
 
     # --------------------
     # Icon converter
@@ -90,11 +113,11 @@ def commandLineParser() -> argparse.ArgumentParser:
         help=f"Icon images to '{CLI.DEFAULT_ICON_DIR}')",
     )
     icon_cnv_parser.add_argument(
-        CLI.OPT_STREAMING_ICON_WIDTH, type=str, default=CLI.DEFAULT_STREAMING_ICON_WIDTH,
+        CLI.OPT_STREAMING_ICON_WIDTH, type=int, default=CLI.DEFAULT_STREAMING_ICON_WIDTH,
         help=f"Display width '{CLI.DEFAULT_STREAMING_ICON_WIDTH}')",
     )
     icon_cnv_parser.add_argument(
-        CLI.OPT_STREAMING_ICON_HEIGHT, type=str, default=CLI.DEFAULT_STREAMING_ICON_HEIGHT,
+        CLI.OPT_STREAMING_ICON_HEIGHT, type=int, default=CLI.DEFAULT_STREAMING_ICON_HEIGHT,
         help=f"Display height '{CLI.DEFAULT_STREAMING_ICON_HEIGHT}')",
     )
     icon_cnv_parser.add_argument(
@@ -105,6 +128,26 @@ def commandLineParser() -> argparse.ArgumentParser:
         "--bw", action="store_true", default=False,
         help=f"Black and white '(default = False = color')",
     )
+    icon_cnv_parser.add_argument(
+        CLI.OPT_ICON_JOBS, "-j", type=int, default=None,
+        help="Conversion processes (default = number of cores)",
+    )
+
+    # --------------------
+    # Firmware release manifest
+
+    manifest_parser = subparsers.add_parser(
+        CLI.CMD_FIRMWARE_MANIFEST,
+        help="Write file hash manifest for firmware release (delta updates)")
+    manifest_parser.add_argument(
+        "directory", type=str,
+        help="Release 'src' -directory")
+    manifest_parser.add_argument(
+        "manifest", type=str,
+        help="Manifest file to write (next to release zip '<zip>.manifest.json')")
+    manifest_parser.add_argument(
+        "--version-tag", type=str, default=None,
+        help="Release version tag (e.g. jrr-0.1.2)")
 
     return parser
 
@@ -139,6 +182,8 @@ def main(args):
 
     if parsed.command == CLI.CMD_RADIO:
         radio_main(parsed)
+    elif parsed.command == CLI.CMD_REPLAY:
+        replay_main(parsed)
     elif parsed.command == CLI.CMD_ICON_CONVERT:
         # converter_main(parsed)
         converter_main(
@@ -147,8 +192,15 @@ def main(args):
             yes=parsed.yes,
             width=parsed.width,
             height=parsed.height,
-            bw=parsed.bw
+            bw=parsed.bw,
+            jobs=parsed.jobs,
         )
+    elif parsed.command == CLI.CMD_FIRMWARE_MANIFEST:
+        manifest = firmware_write_manifest(
+            directory=parsed.directory,
+            manifest_path=parsed.manifest,
+            version=parsed.version_tag)
+        print(f"{parsed.manifest}: {len(manifest['files'])} files")
 
 
 # if __name__ == "__main__":
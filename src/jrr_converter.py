@@ -2,7 +2,12 @@
 """
 
 
+from typing import Dict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import json
 import os
+import time
 from PIL import Image
 from urllib.parse import urlparse
 from pathlib import Path
@@ -10,6 +15,8 @@ import requests
 from io import BytesIO
 
 from .config import app_config
+from .constants import CLI
+from .utils import write_file_atomic
 
 import logging
 logger = logging.getLogger(__name__)
@@ -86,17 +93,54 @@ def image_to_thumb(image_path: str | None = None,
     final_thumb.save(thumb_path)
 
 
+# ------------------------------------------------------------------
+# Conversion manifest
+
+def _file_sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def read_manifest(icon_dir: str) -> Dict[str, Dict]:
+    """Return conversion manifest (icon name -> source hash and
+    target size/mode) in 'icon_dir', empty if not found/invalid."""
+    path = os.path.join(icon_dir, CLI.ICON_MANIFEST)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.info("read_manifest: path='%s', error='%s'", path, e)
+        return {}
+
+
+def _convert_icon(image_path: str, thumb_path: str,
+                  width: int, height: int, bw: bool) -> str | None:
+    """Worker process: convert one icon.
+
+    :return: None on success, error string on failure
+    """
+    try:
+        image_to_thumb(image_path=image_path, thumb_path=thumb_path,
+                       width=width, height=height, bw=bw)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
 # ------------------------------------------------------------------
 # Converter main
 
+
 def converter_main(
         image_dir,
         icon_dir,
         yes,
         width,
         height,
-        bw
-
+        bw,
+        jobs: int | None = None,
 ):
     """
     Convert images to icons suitable for e-paper display.
@@ -104,6 +148,11 @@ def converter_main(
     Details
     ----
 
+    Conversions run in a process pool of 'jobs' processes (default
+    core count). Manifest 'CLI.ICON_MANIFEST' in 'icon_dir' records
+    source hash and target size/mode for each icon: icons, which are
+    up to date, are skipped. Changed icons are overridden only if
+    'yes'.
 
     Parameters
     ----
@@ -113,6 +162,8 @@ def converter_main(
     Return
     -----
 
+    :return: (converted, skipped, failed) -counts
+
     """
 
     # image_dir = parsed.icons_from
@@ -125,22 +176,58 @@ def converter_main(
     if not os.path.exists(icon_dir):
         raise FileExistsError(f"Target path '{icon_dir}' does not exist")
 
-    logger.info("image_dir: %s", image_dir)
-    for f in os.listdir(image_dir):
+    width, height = int(width), int(height)
+    manifest = read_manifest(icon_dir)
+    start = time.monotonic()
+
+    # Choose images to convert
+    todo = {}
+    skipped = 0
+    for f in sorted(os.listdir(image_dir)):
         image_path = os.path.join(image_dir, f)
-        if os.path.isfile(image_path):
-            logger.info("image_path: %s", image_path)
-            thumb_path = os.path.join(icon_dir, f)
-            # if not os.path.exists(thumb_path) or parsed.yes:
-            if not os.path.exists(thumb_path) or yes:
-                image_to_thumb(image_path=image_path, thumb_path=thumb_path,
-                               # width=parsed.width,
-                               # height=parsed.height,
-                               # bw=parsed.bw
-                               width=width,
-                               height=height,
-                               bw=bw
-                               )
-                print(f"{thumb_path} - created")
-            else:
+        if not os.path.isfile(image_path) or f == CLI.ICON_MANIFEST:
+            continue
+        logger.info("image_path: %s", image_path)
+        thumb_path = os.path.join(icon_dir, f)
+        entry = {"sha256": _file_sha256(image_path),
+                 "width": width, "height": height, "bw": bw}
+        if os.path.exists(thumb_path):
+            if manifest.get(f) == entry:
+                print(f"{thumb_path} up to date")
+                skipped += 1
+                continue
+            if not yes:
                 print(f"{thumb_path} exists - not overriden")
+                skipped += 1
+                continue
+        todo[f] = (image_path, thumb_path, entry)
+
+    # Convert in process pool
+    failed = 0
+    if len(todo) > 0:
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            futures = {
+                executor.submit(_convert_icon, image_path, thumb_path,
+                                width, height, bw): f
+                for f, (image_path, thumb_path, _) in todo.items()
+            }
+            for future in as_completed(futures):
+                f = futures[future]
+                _, thumb_path, entry = todo[f]
+                error = future.result()
+                if error is None:
+                    manifest[f] = entry
+                    print(f"{thumb_path} - created")
+                else:
+                    failed += 1
+                    manifest.pop(f, None)
+                    logger.error("converter_main: image='%s', error='%s'", f, error)
+                    print(f"{thumb_path} - failed: {error}")
+        write_file_atomic(os.path.join(icon_dir, CLI.ICON_MANIFEST),
+                          json.dumps(manifest, indent=1, sort_keys=True))
+
+    converted = len(todo) - failed
+    elapsed = time.monotonic() - start
+    print(f"converted {converted}, skipped {skipped}, failed {failed} "
+          f"in {elapsed:.2f}s ({converted / max(elapsed, 1e-6):.1f} icons/s)")
+    return converted, skipped, failed
@@ -6,9 +6,9 @@ from functools import partial
 import asyncio
 import logging
 import datetime
+import time
 from dataclasses import dataclass, fields
 import os
-import yaml
 
 
 from .console import console_output, console_close
@@ -17,28 +17,39 @@ from .publish_subsrcibe import Hub
 from .stdin_coro import stdin_coro
 from .debug.debugger import stdin_debugger
 from .reader_coro import reader_coro
+from .hub_record import HubRecorder
 from .network_coro import network_coro, reset_network_status
 from .clock_coro import clock_coro
 from .channel_manager import (read_file, StreamConfig,
-                              init_streams,
+                              channel_store,
                               parse_channels, icon_path,
                               update_channel_configurations,
                               channel_activation_list, channel_activate, channel_activation_index,
-                              channel_icon_image)
-from .constants import (DSCREEN, TOPICS, COROS, RPI, APP_CONTEXT,)
+                              channel_icon_image, http_cache_flush)
+from .constants import (DSCREEN, TOPICS, COROS, RPI, APP_CONTEXT, KEYBOARD)
 from .utils import (set_wifi_password, current_IP,
-                    current_ssid, download_extract_pending, read_url)
+                    current_ssid, read_url)
 from .gpio_coro import (
     gpio_init,
     init_GPIO_buttons, init_GPIO_shutdown, GPIO_button_coro, gpio_close)
-from .screen_coro import (screen_coro, screen_close)
+from .screen_coro import (screen_coro, screen_close, key_burst_window)
 from .kb import (edit_buffer, split_buffer)
-from .kb_coro import (kb_coro, is_keyboard_connected)
+from .kb_coro import kb_coro
 from .streamer_coro import streamer_coro
-from .wifi import list_wifis
+from .wifi import wifi_scanner
+from .station_probe import is_station_dead, probe_in_background
+from .channel_catalog import ChannelCatalog, open_catalog
+from .yaml_cache import load_yaml_file, dump_yaml_file
+from .icon_atlas import update_atlas_in_background
+from .helpers import background_task, Coalescer
+from .dispatch import Dispatcher
 from .dscreen import DApp
 from .jrr_dapp import screen_ovrlays
-from .firmware import FirmwareVersion, firmware_available_versions, firmware_repo_release_notes_url
+from .firmware import (FirmwareVersion, firmware_available_versions,
+                       firmware_repo_release_notes_url, firmware_download_version,
+                       firmware_delta_update, firmware_activate_prefetched,
+                       firmware_unpack_pending)
+from .firmware_prefetch import firmware_prefetcher
 from .messages import (MsgRoot,
                        is_message_type,
                        message_halt, message_create,
@@ -46,10 +57,9 @@ from .messages import (MsgRoot,
                        message_screen_update, message_screen_sleep,
                        message_screen_stream_icon,
                        message_screen_refresh,
-                       message_status_icons,
                        message_info,
                        message_panik,
-                       message_clock_update,
+                       message_clock_update, message_status_update,
                        message_button_labels,
                        message_config_title,
                        message_error, message_question, message_firmware,
@@ -92,6 +102,7 @@ class ControllerState:
     # sprite state
     network_status: bool                         # network ok/nok
     streamer_status: bool                        # streamer process running
+    streamer_died: bool                          # streamer reported not running, restart on tick
 
     # keyboard entry
     keyboard_status: bool                        # keyboard connected/not
@@ -111,17 +122,29 @@ class ControllerState:
         self.keyboard_status = None
         self.streamer_status = None
         self.streamer_on = None
+        self.streamer_died = False
         self.network_status = None
+        # (network, streamer, keyboard) last sent to screen
+        self.status_published: Tuple | None = None
         self.keyboard_entry = ""
         self.current_stream = 0     # NB: f_radio in lock step with current stream
         self.streams = None
         self.config_screens = screen_ovrlays
+        # radio menu labels built for 'channel_store.version'
+        self._stream_menu: List[List[str]] = []
+        self._stream_menu_version: int | None = None
 
     # ------------------------------------------------------------------
     # Network status
 
-    def set_network_status(self, status: bool):
+    def set_network_status(self, status: bool) -> bool:
+        """Set network status.
+
+        :return: True if status changed
+        """
+        old_state = self.network_status
         self.network_status = status
+        return old_state != self.network_status
 
     # ------------------------------------------------------------------
     # Stepping state machine
@@ -170,15 +193,16 @@ class ControllerState:
         }
         state_dict["now"] = datetime.datetime.now().isoformat()
         logger.info("save_state: state_dict='%s'", state_dict)
-        with open(app_config.state_config, 'w', encoding="UTF-8") as f:
-            yaml.dump(state_dict, f)
+        dump_yaml_file(str(app_config.state_config), state_dict)
 
     def restore_state(self):
         """Restrore some fields from file from 'state_config' and version info."""
-        yaml_str, stat = read_file(app_config.state_config)
-        logger.debug("restore_state: yaml_str='%s', stat=%s", yaml_str, stat)
-        if stat:
-            state_dict = yaml.safe_load(yaml_str)
+        try:
+            state_dict = load_yaml_file(str(app_config.state_config))
+        except FileNotFoundError:
+            state_dict = None
+        logger.debug("restore_state: state_dict='%s'", state_dict)
+        if state_dict:
             logger.info("restore_state: state_dict='%s', apply with field:%s",
                         state_dict, dir(self))
             for k, v in state_dict.items():
@@ -214,6 +238,8 @@ class ControllerState:
             self.streamer_status = running
         if not streamer_on is None:
             self.streamer_on = streamer_on
+            # new TOBE -state overrides pending restart
+            self.streamer_died = False
 
         return old_state != self.streamer_status
 
@@ -229,7 +255,7 @@ class ControllerState:
             return False
 
         # Parse StreamConfig from configuration YAML
-        self.streams, factory_reset_done = init_streams()
+        self.streams, factory_reset_done = channel_store.load()
 
         # with open(app_config.streams_yaml) as f:
         #     self.streams = [StreamConfig(**s) for s in yaml.safe_load(f)]
@@ -242,8 +268,9 @@ class ControllerState:
     def stream_to_button_menu_labels(self) -> Tuple[List[List[str]], bool]:
         """Create list of button menus for radio streams.
 
-        Uses 'init_stream' to read stream configurations from
-        yaml-configurations.
+        Uses 'channel_store' to read stream configurations from
+        yaml-configurations (re-read only if file changed), menu is
+        rebuilt only when streams change.
 
         Button labels:
         - 0: btn1-short: next -channel
@@ -254,29 +281,29 @@ class ControllerState:
         :return: List of lists for button menu factory reset done
 
         """
-        # Force rearead
-        self.streams = None
-        factory_reset_done = self.init_streams()
+        # Re-read if changed
+        self.streams, factory_reset_done = channel_store.load()
         logger.debug(
             "stream_to_button_menu_labels: self.streams='%s'", self.streams)
 
-        menu: List = []
-        if self.streams is not None:
-            stream_names = [s.name for s in self.streams]
-            for idx in range(len(stream_names)):
-                next_stream = idx + 1 if idx < len(stream_names) - 1 else 0
-                prev_stream = idx - 1 if idx > 0 else len(stream_names)-1
-
-                btn_labels = [
-                    stream_names[next_stream],
+        if self._stream_menu_version != channel_store.version:
+            self._stream_menu = [
+                [
+                    next_name,
                     APP_CONTEXT.MENU.CONFIG_ENTER,
-                    stream_names[prev_stream],
+                    prev_name,
                     APP_CONTEXT.MENU.UN_USED,
                 ]
-                menu.append(btn_labels)
+                for next_name, prev_name in channel_store.neighbours()
+            ]
+            self._stream_menu_version = channel_store.version
+            update_atlas_in_background(
+                app_config.icon_directory,
+                [s.icon for s in self.streams or []])
+            logger.debug("stream_to_button_menu_labels: menu='%s'",
+                         self._stream_menu)
 
-        logger.debug("stream_to_button_menu_labels: menu='%s'", menu)
-        return (menu, factory_reset_done)
+        return (self._stream_menu, factory_reset_done)
 
     def set_and_get_stream(self, stream_adv: int = 0) -> StreamConfig | None:
         """Return 'StreamConfig' object for current stream.
@@ -482,7 +509,8 @@ def ctrl_act_sleep_display(hub: Hub):
 
 
 def ctrl_act_update_status(hub: Hub, network_status: bool | None = None):
-    """Message with network, streaming, and keyboard- statuses.
+    """Message with network, streaming, and keyboard- statuses, if
+    changed since last sent.
 
     Optionally sets network_status.
     """
@@ -490,9 +518,15 @@ def ctrl_act_update_status(hub: Hub, network_status: bool | None = None):
         reset_network_status()
         controller_state.set_network_status(network_status)
 
+    status = (controller_state.network_status,
+              controller_state.streamer_status,
+              controller_state.keyboard_status)
+    if status == controller_state.status_published:
+        return
+    controller_state.status_published = status
     hub.publish(
         topic=TOPICS.SCREEN,
-        message=message_clock_update(
+        message=message_status_update(
             network_status=controller_state.network_status,
             streaming_status=controller_state.streamer_status,
             keyboard_status=controller_state.keyboard_status,
@@ -501,6 +535,33 @@ def ctrl_act_update_status(hub: Hub, network_status: bool | None = None):
     )
 
 
+def ctrl_act_update_clock(hub: Hub):
+    """Current time to screen."""
+    hub.publish(
+        topic=TOPICS.SCREEN,
+        message=message_clock_update(time=time.strftime("%H:%M:%S")))
+
+
+async def ctrl_act_query_streamer_status(hub: Hub):
+    """Request streamer status until streamer replies (streamer
+    publishes later changes itself). Reply is handled in 'master_coro'
+    as any status message."""
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            await hub.request(
+                topic=TOPICS.STREAMER,
+                message=message_create(
+                    message_type=TOPICS.STREAMER_MESSAGES.STATUS_QUERY),
+                reply_topic=TOPICS.CONTROL,
+                reply_type=TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY)
+            return
+        except TimeoutError:
+            logger.warning("ctrl_act_query_streamer_status: no reply from streamer, "
+                           "attempts=%s", attempts)
+
+
 def ctrl_act_screen_config_prompt(
         hub: Hub,
         prompt: str,
@@ -682,8 +743,8 @@ def ctrl_act_keyboard_start(hub: Hub):
     Actions:
     - publish 'START' on KEYBOARD.TOPIC
 
-    - set sprite icon - keyboard not connected (update in status
-      query)
+    - set sprite icon - keyboard not connected (kb_coro publishes
+      status on attach)
 
     """
     # --> STREAMER: stop streaming
@@ -696,15 +757,6 @@ def ctrl_act_keyboard_start(hub: Hub):
     # controller_state.set_keyboard_status(keyboard_status=False)
 
 
-def ctrl_act_poll_keyboard_status(hub: Hub):
-    """Check keyboard status
-
-
-    """
-
-    controller_state.set_keyboard_status(is_keyboard_connected())
-
-
 def ctrl_act_keyboard_stop(hub: Hub):
     """Stop reading keyboard.
 
@@ -801,9 +853,23 @@ def ctrl_act_next_prev(hub: Hub, advance: int, menu: Dict) -> int:
     return menu_step
 
 
+# Keys within burst window update screen once
+key_burst = Coalescer(window=key_burst_window())
+
+
+def _publish_dscreen(hub: Hub):
+    """Read dscreen changes - and publish them to display"""
+    msg = controller_state.config_screens.deltaMessage()
+    if msg is not None:
+        hub.publish(topic=TOPICS.SCREEN, message=msg)
+
+
 def ctrl_act_key_to_dscreen(hub: Hub, key: str) -> int | None:
     """Pass keyboard 'key' to dscreen (in controller).
 
+    Key is applied to dscreen right away, screen is updated once per
+    'key_burst' window.
+
     :return: None no menu change
     """
 
@@ -817,9 +883,7 @@ def ctrl_act_key_to_dscreen(hub: Hub, key: str) -> int | None:
                     )
         return None
 
-    # Read dscreen message - and publish it display
-    msg = controller_state.config_screens.message()
-    hub.publish(topic=TOPICS.SCREEN, message=msg)
+    key_burst.schedule(partial(_publish_dscreen, hub))
 
     return None
 
@@ -889,7 +953,8 @@ def ctrl_menu_wifi_ssid_setup(
             password = overlay_msg.fieldStrValue(DSCREEN.WIFI_OVERLAY.PASSWORD)
             if ssid is not None and password is not None:
                 # call script to set ssid password
-                set_wifi_password(ssid=ssid, password=password)
+                background_task(set_wifi_password(ssid=ssid, password=password),
+                                name="wifi-setup")
             else:
                 logging.log(
                     logging.ERROR,
@@ -957,6 +1022,9 @@ def ctrl_menu_setup_with_keyboard(hub: Hub, step_resume: int | None = None):
 
     def _my_entry_action(hub: Hub, menu_name: str, ):
         """Publish title/sub_title, possibly icon"""
+        if menu_name == APP_CONTEXT.MENU.MENU_CONFIG_WIFI:
+            # warm up wifi menu
+            wifi_scanner.refresh_in_background()
         menu_name_2_title = {
             APP_CONTEXT.MENU.MENU_CONFIG_WIFI: "Wifi verkon",
             APP_CONTEXT.MENU.MENU_CHANNELS_ORIGIN: "Radiokanava-",
@@ -1101,6 +1169,37 @@ def ctrl_menu_firmware_setup(
     f_config_enter(hub, menu=menu, step_resume=step_resume)
 
 
+def _enter_after_wifi_scan(hub: Hub, scan: asyncio.Task,
+                           step_resume: int | None,
+                           ctrl_menu_resume: Callable):
+    """Show scanning info, enter 'ctrl_menu_wifi_setup' when 'scan'
+    is done (on failure resume back to 'ctrl_menu_resume'). Nothing
+    is entered if user has navigated away meanwhile (scan results
+    remain cached in 'wifi_scanner')."""
+    ctrl_act_screen_info_txt(hub, message=APP_CONTEXT.MENU.WIFI_SCANNING)
+    caller_menu_step = controller_state.menu_step
+
+    async def _wait_scan():
+        try:
+            networks = await asyncio.shield(scan)
+        except Exception as e:
+            logger.error("_enter_after_wifi_scan: error='%s'", e)
+            if controller_state.menu_step != caller_menu_step:
+                return
+            ctrl_act_screen_info_txt(hub, message=APP_CONTEXT.MENU.MENU_FAILURE)
+            ctrl_menu_resume(hub, step_resume=caller_menu_step)
+            return
+        if controller_state.menu_step != caller_menu_step:
+            logger.info("_enter_after_wifi_scan: menu_step %s -> %s, not entering",
+                        caller_menu_step, controller_state.menu_step)
+            return
+        ctrl_menu_wifi_setup(hub, step_resume=step_resume,
+                             wifi_names=[network.ssid for network in networks],
+                             ctrl_menu_resume=ctrl_menu_resume)
+
+    background_task(_wait_scan(), name="wifi-menu")
+
+
 def ctrl_menu_wifi_setup(
         hub: Hub,
         step_resume: int | None = None,
@@ -1117,7 +1216,9 @@ def ctrl_menu_wifi_setup(
 
     :wifi_names: pre-populated wifi-names, read wifi names if None.
 
-    - Reads available wifi connections.
+    - Reads available wifi connections: cached scan results
+      (strongest first) shown right away, refreshed in background. On
+      first scan menu is entered after scan completes.
 
     - Creates 'menu' using 'wifi_names'
     - NEXT/PREV wifi SSID -list
@@ -1130,7 +1231,13 @@ def ctrl_menu_wifi_setup(
 
     # List of availabe WIFI networks
     if wifi_names is None:
-        wifi_names = list_wifis()
+        refresh = wifi_scanner.refresh_in_background()
+        networks = wifi_scanner.cached()
+        if networks is None:
+            _enter_after_wifi_scan(hub, refresh, step_resume=step_resume,
+                                   ctrl_menu_resume=ctrl_menu_resume)
+            return
+        wifi_names = [network.ssid for network in networks]
     logger.info("ctrl_menu_wifi_setup: wifi_names='%s'", wifi_names)
 
     # remeber caller menu - later resume there
@@ -1185,6 +1292,14 @@ def ctrl_menu_wifi_setup(
     f_config_enter(hub, menu=menu, step_resume=step_resume)
 
 
+def _stream_sub_title(stream: StreamConfig) -> str:
+    """Stream name for menu sub title, marked if (cached) probe
+    found station dead."""
+    if is_station_dead(stream.url):
+        return f"{stream.name} ({APP_CONTEXT.MENU.STATION_DEAD})"
+    return stream.name
+
+
 def ctrl_menu_browse_channels(
         hub: Hub,
         step_resume: int | None = None, ):
@@ -1223,7 +1338,7 @@ def ctrl_menu_browse_channels(
             topic=TOPICS.SCREEN,
             message=message_config_title(
                 title=APP_CONTEXT.MENU.MENU_CHANNELS_DELETE,
-                sub_title=stream.name,
+                sub_title=_stream_sub_title(stream),
                 imagepath=os.path.join(
                     APP_CONTEXT.CHANNEL_ICONS, stream.icon)
             ))
@@ -1254,6 +1369,9 @@ def ctrl_menu_browse_channels(
         for i in range(len(controller_state.streams))
     }
 
+    # refresh probe cache for next visit
+    probe_in_background(stream.url for stream in controller_state.streams)
+
     # delete make result to empty menu = No channels --> _my_resume
     if len(menu.keys()) == 0:
         _my_resume(hub)
@@ -1302,6 +1420,9 @@ def ctrl_menu_setup_main(hub: Hub, step_resume: int | None = None):
 
     def _my_entry_action(hub: Hub, menu_name: str, ):
         """Publish title/sub_title, possibly icon"""
+        if menu_name == APP_CONTEXT.MENU.MENU_CONFIG_WIFI:
+            # warm up wifi menu
+            wifi_scanner.refresh_in_background()
         # hub.publish(
         #     topic=TOPICS.SCREEN,
         #     message=message_config_title(
@@ -1452,15 +1573,49 @@ def ctrl_menu_setup_main(hub: Hub, step_resume: int | None = None):
     f_config_enter(hub, menu, step_resume=step_resume)
 
 
-def ctrl_menu_activate_channels(hub: Hub, step_resume: int | None = None):
+def _channel_source(activation_url: str) -> ChannelCatalog | List[StreamConfig]:
+    """Open catalog (download and index if needed) or, when
+    'activation_url' has no catalog, read its channel list.
+
+    Blocking, run in 'asyncio.to_thread'.
+
+    :raises: FileNotFoundError
+
+    """
+    catalog = open_catalog(activation_url)
+    if catalog is not None:
+        return catalog
+    return channel_activation_list(activation_url=activation_url)
+
+
+def ctrl_menu_activate_channels(
+        hub: Hub,
+        step_resume: int | None = None,
+        query: str = "",
+        page_offset: int = 0,
+        caller_step: int | None = None,
+        channel_source: ChannelCatalog | List[StreamConfig] | None = None,
+):
     """Browse list of channels, which may be activated.
+
+    Large catalogs (see 'channel_catalog') are browsed one page at a
+    time, keyboard edits search 'query', page keys move
+    'page_offset'.
+
+    :caller_step: menu step in setup main to resume to, default
+    current 'menu_step'
+
+    :channel_source: catalog or channel list opened on first entry
+    (in background), passed on to re-entries
+
     """
 
     if step_resume is None:
         step_resume = 0
 
     # remeber caller menu - later resume there
-    caller_menu_step = controller_state.menu_step
+    caller_menu_step = (caller_step if caller_step is not None
+                        else controller_state.menu_step)
 
     def _my_resume(hub):
         # ctrl_menu_setup_main(hub, step_resume=caller_menu_step)
@@ -1468,18 +1623,90 @@ def ctrl_menu_activate_channels(hub: Hub, step_resume: int | None = None):
         return None
 
     activation_url = app_config.channel_activation_url
-    logger.info("ctrl_menu_activate_channels: yaml_url='%s'", activation_url)
-    try:
-        active_streams = [
-            stream_config.name for stream_config in controller_state.streams]
+    logger.info("ctrl_menu_activate_channels: yaml_url='%s', query='%s', page_offset=%s",
+                activation_url, query, page_offset)
+
+    if channel_source is None:
+        # download/index may take long: keep event loop running
+        ctrl_act_screen_info_txt(hub, message=APP_CONTEXT.MENU.CATALOG_LOADING)
+        opening_menu_step = controller_state.menu_step
+
+        async def _open():
+            try:
+                source = await asyncio.to_thread(_channel_source, activation_url)
+            except FileNotFoundError as ex:
+                logger.exception("Error %s in channel_activation_list, activation_url='%s'",
+                                 ex, activation_url)
+                if controller_state.menu_step != opening_menu_step:
+                    return
+                ctrl_act_screen_info_txt(hub, message=APP_CONTEXT.MENU.MENU_FAILURE)
+                _my_resume(hub)
+                return
+            if controller_state.menu_step != opening_menu_step:
+                # user navigated away while loading
+                logger.info("ctrl_menu_activate_channels: menu_step %s -> %s, not entering",
+                            opening_menu_step, controller_state.menu_step)
+                return
+            ctrl_menu_activate_channels(
+                hub, step_resume=step_resume, query=query, page_offset=page_offset,
+                caller_step=caller_menu_step, channel_source=source)
+
+        background_task(_open(), name="activate-channels-menu")
+        return
+
+    active_streams = [
+        stream_config.name for stream_config in controller_state.streams]
+
+    catalog = channel_source if isinstance(channel_source, ChannelCatalog) else None
+    if catalog is not None:
+        page = catalog.search(query=query, offset=page_offset, exclude=active_streams)
+        channels_for_activation = page.channels
+        ctrl_act_screen_info_txt(
+            hub,
+            message=f"{APP_CONTEXT.MENU.CATALOG_SEARCH}: {query} "
+            f"{page.offset + 1}-{page.offset + len(page.channels)}/{page.total}")
+    else:
         channels_for_activation = [
-            stream_config
-            for stream_config in
-            channel_activation_list(activation_url=activation_url) if
-            stream_config.name not in active_streams]
-    except FileNotFoundError as ex:
-        logger.exception("Error %s in channel_activation_list, activation_url",
-                         ex, app_config.channel_activation_url)
+            stream_config for stream_config in channel_source
+            if stream_config.name not in active_streams]
+
+    def _search_key(hub: Hub, key: str):
+        """Edit search 'query' or page catalog, re-enter menu."""
+        new_query, new_offset = query, page_offset
+        if key == KEYBOARD.BACKSPACE:
+            new_query, new_offset = query[:-1], 0
+        elif key == APP_CONTEXT.CATALOG.KEY_PAGE_NEXT:
+            if page.offset + len(page.channels) < page.total:
+                new_offset = page_offset + APP_CONTEXT.CATALOG.PAGE_SIZE
+        elif key == APP_CONTEXT.CATALOG.KEY_PAGE_PREV:
+            new_offset = max(0, page_offset - APP_CONTEXT.CATALOG.PAGE_SIZE)
+        elif len(key) == 1 and key.isprintable():
+            new_query, new_offset = query + key, 0
+        else:
+            return None
+        ctrl_menu_activate_channels(
+            hub, step_resume=0, query=new_query, page_offset=new_offset,
+            caller_step=caller_menu_step, channel_source=channel_source)
+        return None
+
+    if catalog is not None and len(channels_for_activation) == 0:
+        # keep searching
+        menu = {
+            APP_CONTEXT.MENU.CATALOG_NO_MATCH: {
+                APP_CONTEXT.MENU.ACTS.BTN_LABELS: [
+                    APP_CONTEXT.MENU.UN_USED,         # bt1-short
+                    APP_CONTEXT.MENU.UN_USED,         # bt1-long
+                    APP_CONTEXT.MENU.UN_USED,         # bt2-short
+                    APP_CONTEXT.MENU.CONFIG_RETURN,   # bt2-long
+                ],
+                APP_CONTEXT.MENU.ACTS.BTN1_SHORT: ctr_act_none,
+                APP_CONTEXT.MENU.ACTS.BTN1_LONG: ctr_act_none,
+                APP_CONTEXT.MENU.ACTS.BTN2_SHORT: ctr_act_none,
+                APP_CONTEXT.MENU.ACTS.BTN2_LONG: _my_resume,
+                APP_CONTEXT.MENU.ACTS.KEYBOARD: _search_key,
+            }
+        }
+        f_config_enter(hub, menu, step_resume=0)
         return
 
     if len(channels_for_activation) == 0:
@@ -1510,7 +1737,7 @@ def ctrl_menu_activate_channels(hub: Hub, step_resume: int | None = None):
             topic=TOPICS.SCREEN,
             message=message_config_title(
                 title=APP_CONTEXT.MENU.MAY_ACTIVATE,
-                sub_title=stream.name,
+                sub_title=_stream_sub_title(stream),
                 imagepath=imagepath,
             ))
 
@@ -1530,16 +1757,24 @@ def ctrl_menu_activate_channels(hub: Hub, step_resume: int | None = None):
             APP_CONTEXT.MENU.ACTS.BTN1_LONG: partial(
                 ctrl_menu_activate_with_confirm,
                 activation_url=activation_url,
-                ctrl_menu_resume=ctrl_menu_activate_channels,
+                ctrl_menu_resume=partial(
+                    ctrl_menu_activate_channels,
+                    query=query, page_offset=page_offset,
+                    caller_step=caller_menu_step,
+                    channel_source=channel_source),
                 step_resume=i,
                 channel=channels_for_activation[i],
             ),
             APP_CONTEXT.MENU.ACTS.BTN2_LONG: _my_resume,
-            APP_CONTEXT.MENU.ACTS.KEYBOARD: ctrl_act_null,
+            APP_CONTEXT.MENU.ACTS.KEYBOARD: (
+                _search_key if catalog is not None else ctrl_act_null),
         }
         for i in range(len(channels_for_activation))
     }
 
+    # refresh probe cache for next visit
+    probe_in_background(channel.url for channel in channels_for_activation)
+
     f_config_enter(hub, menu, step_resume=step_resume)
 
 
@@ -1583,16 +1818,36 @@ def ctrl_menu_activate_with_confirm(
         ctrl_menu_resume(hub, step_resume=step_resume)
 
     def _do_activate_stream(hub: Hub, new_stream: StreamConfig):
-        """Active 'new_stream'. Resume back to 'step_resume' in upper
-        menu.
+        """Active 'new_stream' in worker thread (icon download may
+        take time), report progress on screen. Resume back to
+        'step_resume' in upper menu.
 
         """
-        controller_state.streams = channel_activate(
-            controller_state.streams,
-            new_stream=new_stream,
-            activation_url=activation_url,
-        )
-        _do_resume(hub)
+        loop = asyncio.get_running_loop()
+
+        def _progress(done: int, total: int, channel: StreamConfig):
+            # called in 'asyncio.to_thread' thread
+            loop.call_soon_threadsafe(
+                hub.publish, TOPICS.SCREEN,
+                message_info(f"{APP_CONTEXT.MENU.ICONS_LOADING} {done}/{total}"))
+
+        async def _activate():
+            try:
+                controller_state.streams = await asyncio.to_thread(
+                    channel_activate,
+                    controller_state.streams,
+                    new_stream=new_stream,
+                    activation_url=activation_url,
+                    progress=_progress,
+                )
+            except Exception as e:
+                logger.exception("_do_activate_stream: channel=%s, error='%s'",
+                                 new_stream.name, e)
+                hub.publish(topic=TOPICS.SCREEN,
+                            message=message_info(APP_CONTEXT.MENU.MENU_FAILURE))
+            _do_resume(hub)
+
+        background_task(_activate(), name="activate-channel")
 
     # See f_config_enter for documentation
 
@@ -1683,24 +1938,67 @@ def ctrl_menu_firmware_activate(
         return 0
 
     def _do_activate_firmware(hub: Hub, new_firmware: FirmwareVersion):
-        """Active 'firmaware'. Resume back to 'step_resume' in upper
-        menu.
+        """Active 'firmaware': use prefetched version (see
+        'firmware_prefetch') or download (verified, progress on
+        firmware screen) in worker thread, unpack and make it
+        pending. Resume back to 'step_resume' in upper menu.
 
         """
-        if new_firmware.repo_url is not None:
-            download_extract_pending(url=new_firmware.repo_url)
-        else:
+        if new_firmware.repo_url is None:
             logger.error("_do_activate_firmware: new_firmware='%s' - repo_url None",
                          new_firmware)
+            _do_resume(hub)
+            return
 
-        # Reboot on activation
-        ctrl_menu_reboot_confirm(
-            hub=hub,
-            message="Uudelleenkäynnistys",
-            instructions="OK hyväksy käynnistys",
-            ctrl_menu_resume=ctrl_menu_resume,
-            step_resume=step_resume,
-        )
+        loop = asyncio.get_running_loop()
+        last_percent = {"value": -1}
+
+        def _progress(done: int, total: int | None):
+            # called in 'asyncio.to_thread' thread
+            percent = 0 if not total else done * 100 // total
+            if (percent != 100 and percent - last_percent["value"] <
+                    APP_CONTEXT.FIRMWARE_DOWNLOAD.PROGRESS_STEP):
+                return
+            last_percent["value"] = percent
+            loop.call_soon_threadsafe(
+                hub.publish, TOPICS.SCREEN,
+                message_firmware(
+                    title=APP_CONTEXT.MENU.FIRMWARE_DOWNLOADING,
+                    version_tag=new_firmware.version,
+                    notes=f"{done // 1024} kB" + (
+                        f" / {total // 1024} kB ({percent}%)" if total else "")))
+
+        async def _activate():
+            try:
+                # prefetched while idle: just made pending
+                await firmware_prefetcher.stop()
+                dest_dir = firmware_activate_prefetched(new_firmware)
+                if dest_dir is None:
+                    # only changed files if release has manifest, else full zip
+                    dest_dir = await asyncio.to_thread(
+                        firmware_delta_update, new_firmware, progress=_progress)
+                if dest_dir is None:
+                    await asyncio.to_thread(
+                        firmware_download_version, new_firmware, progress=_progress)
+                    await asyncio.to_thread(firmware_unpack_pending, new_firmware)
+            except Exception as e:
+                logger.exception("_do_activate_firmware: firmware=%s, error='%s'",
+                                 new_firmware, e)
+                hub.publish(topic=TOPICS.SCREEN,
+                            message=message_info(APP_CONTEXT.MENU.MENU_FAILURE))
+                _do_resume(hub)
+                return
+
+            # Reboot on activation
+            ctrl_menu_reboot_confirm(
+                hub=hub,
+                message="Uudelleenkäynnistys",
+                instructions="OK hyväksy käynnistys",
+                ctrl_menu_resume=ctrl_menu_resume,
+                step_resume=step_resume,
+            )
+
+        background_task(_activate(), name="activate-firmware")
 
     # See f_config_enter for documentation
 
@@ -2220,6 +2518,10 @@ def f_config_enter(hub: Hub,
         logger.debug("f_config: msg: %s", msg)
         goon = True
 
+        # show keys pending in burst before acting on other messages
+        if not is_message_type(msg, TOPICS.KEYBOARD_MESSAGES.KEY):
+            key_burst.flush()
+
         # menu_name = menu_names[controller_state.menu_step] if controller_state.menu_step < len(
         #     menu_names) else ""
         if controller_state.menu_step > len(menu_names) or controller_state.menu_step < 0:
@@ -2414,6 +2716,163 @@ def f_init_enter(hub: Hub):
 # ------------------------------------------------------------------
 # Controller core (calling main controller state functions)
 
+def _exit_message_to_coro_topics(hub: Hub, source: TOPICS.HALT_SOURCE):
+    """Exit messsage to all other coros, expect for control
+    coro."""
+    # exit_msg = message_create(message_type=TOPICS.COMMON_MESSAGES.EXIT)
+    exit_msg = message_exit(source=source)
+    topics = [TOPICS.SCREEN, TOPICS.STREAMER,
+              TOPICS.NETWORK_MONITOR, TOPICS.KEYBOARD]
+    for topic in topics:
+        logger.info("exit_message_to_topics: topic='%s'", topic)
+        hub.publish(topic=topic, message=exit_msg)
+
+
+def _cancel_tasks(name: str, tasks: List[asyncio.Task]):
+    for task in tasks:
+        logger.warning(
+            "name: '%s' -->  cancel task '%s': %s",
+            name, task.get_name(), task)
+        task.cancel()
+
+
+def control_dispatcher(name: str, tasks: List[asyncio.Task]) -> Dispatcher:
+    """Handlers for messages in CONTROL topic (see 'master_coro'),
+    handlers return goon.
+
+    :name: name of controller coro
+
+    :tasks: co-routine tasks cancelled on reboot/halt
+
+    """
+    control = Dispatcher("control")
+
+    @control.on(TOPICS.CONTROL_MESSAGES.REBOOT)
+    def _reboot(msg: str | MsgRoot, hub: Hub) -> bool:
+        # On shutdown send 'exit' -message to all  relevant topics
+        _exit_message_to_coro_topics(hub, source=TOPICS.HALT_SOURCE.MESSAGE)
+        # # Allow gracefull exit
+        # await asyncio.sleep(1)
+        _cancel_tasks(name, tasks)
+
+        # finally cancel myself - return goon = False
+        logger.warning(
+            "name: %s - cancelling myself by returning false", name)
+        return False
+
+    @control.on(TOPICS.CONTROL_MESSAGES.HALT)
+    def _halt(msg: str | MsgRoot, hub: Hub) -> bool:
+        # origin?: see gpio and SIGTERM
+        msg_halt = cast(MsgHalt_HaltAck, msg)
+        _exit_message_to_coro_topics(hub, source=msg_halt.source)
+        return True
+
+    @control.on(TOPICS.CONTROL_MESSAGES.HALT_ACK)
+    def _halt_ack(msg: str | MsgRoot, hub: Hub) -> bool:
+        msg_ack = cast(MsgHalt_HaltAck, msg)
+        # graceful exit --> save radion state for next reboot
+        controller_state.save_state()
+        # origins from screen_coro:
+        logger.warning(
+            "master_coro: halt_ack received: msg='%s'", msg)
+        _cancel_tasks(name, tasks)
+        # system_halt on volume button knob GPIO singnal
+        # --> sudo halt
+        # --> journalctl > LCD output
+        system_shutdown(system_halt=msg_ack.source ==
+                        TOPICS.HALT_SOURCE.GPIO)
+        return True
+
+    @control.on(TOPICS.COMMON_MESSAGES.EXIT)
+    def _exit(msg: str | MsgRoot, hub: Hub) -> bool:
+        # Pass exit message to relevavant topics
+        raise NotImplementedError(f"Control coro should no receive {msg}")
+
+    @control.on(TOPICS.NETWORK_MESSAGES.STATUS)
+    def _network_status(msg: str | MsgRoot, hub: Hub) -> bool:
+        # Set network status in controller state
+        msg_network = cast(MsgNetwork, msg)
+        if controller_state.set_network_status(msg_network.status):
+            ctrl_act_update_status(hub)
+        return True
+
+    @control.on(TOPICS.KEYBOARD_MESSAGES.STATUS)
+    def _keyboard_status(msg: str | MsgRoot, hub: Hub) -> bool:
+        # Set keyboard status
+        msg_keyboard = cast(MsgKeyboardStatus, msg)
+        changed = controller_state.set_keyboard_status(
+            keyboard_status=msg_keyboard.status)
+        if changed:
+            logger.info("status: keyboard status changed='%s'",
+                        msg_keyboard.status)
+            ctrl_act_update_status(hub)
+        return True
+
+    @control.on(TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY)
+    def _streamer_status_reply(msg: str | MsgRoot, hub: Hub) -> bool:
+        # Set network status in controller state
+        msg_streamer_status = cast(MsgStreamerStatusReply, msg)
+        streamer_status_changed = controller_state.set_streamer_status(
+            running=msg_streamer_status.running)
+        if streamer_status_changed:
+            logger.info(
+                "status: streamer-process ASIS='%s'" +
+                ", streamer-process TOBE:'%s'",
+                msg_streamer_status.running,
+                controller_state.streamer_on)
+            ctrl_act_update_status(hub)
+        if controller_state.streamer_on and not msg_streamer_status.running:
+            # restart on next CLOCK_TICK (at most one restart per tick)
+            controller_state.streamer_died = True
+        elif msg_streamer_status.running:
+            # running again: no restart pending
+            controller_state.streamer_died = False
+        return True
+
+    @control.on(TOPICS.COMMON_MESSAGES.CLOCK_TICK)
+    def _clock_tick(msg: str | MsgRoot, hub: Hub) -> bool:
+        # maybe put screen on sleep due to user inactivity
+        if (controller_state.user_inactive_too_long() and
+                not controller_state.screen_in_sleep):
+
+            # inactive too long --> put display in sleep
+            logger.info(
+                "user_inactive_too_long: user_lasttime_active: %s -> going to sleep",
+                controller_state.user_inactivity)
+
+            controller_state.display_close_if_awake(hub=hub)
+
+        # idle with network --> maybe prefetch newer firmware
+        firmware_prefetcher.maybe_start(
+            idle=controller_state.screen_in_sleep and bool(
+                controller_state.network_status))
+
+        # streamer reported not running --> try to restart streamer
+        if controller_state.streamer_died:
+            controller_state.streamer_died = False
+            controller_state.menu_step = ctrl_act_set_stream(hub)
+
+        # send time to screen (statuses sent on change), screen
+        # refreshes display if not asleep
+        ctrl_act_update_clock(hub)
+        return True
+
+    @control.otherwise
+    def _state_machine(msg: str | MsgRoot, hub: Hub) -> bool:
+        # Maybe wake display up for user activity
+        if controller_state.maybe_user_active(msg=msg):
+            # User was active: leave bandwidth/cpu to user
+            firmware_prefetcher.cancel()
+            if controller_state.display_maybe_awake(hub=hub):
+                # user active && display awoke --> discard user action
+                return True
+
+        # non blocking state machine execution (maybe exit)
+        return controller_state.state_machine(msg, hub)
+
+    return control
+
+
 async def master_coro(
         name: str,
         hub: Hub,
@@ -2442,24 +2901,6 @@ async def master_coro(
     # Last time user has been active
     user_lasttime_active: datetime.datetime = datetime.datetime.now()
 
-    def exit_message_to_coro_topics(source: TOPICS.HALT_SOURCE):
-        """Exit messsage to all other coros, expect for control
-        coro."""
-        # exit_msg = message_create(message_type=TOPICS.COMMON_MESSAGES.EXIT)
-        exit_msg = message_exit(source=source)
-        topics = [TOPICS.SCREEN, TOPICS.STREAMER,
-                  TOPICS.NETWORK_MONITOR, TOPICS.KEYBOARD]
-        for topic in topics:
-            logger.info("exit_message_to_topics: topic='%s'", topic)
-            hub.publish(topic=topic, message=exit_msg)
-
-    def cancel_tasks(tasks: List[asyncio.Task]):
-        for task in tasks:
-            logger.warning(
-                "name: '%s' -->  cancel task '%s': %s",
-                name, task.get_name(), task)
-            task.cancel()
-
     def control_action(msg: str | MsgRoot, hub: Hub):
         """Common actions for all state machines listening CONTROL -
         topic.
@@ -2478,134 +2919,28 @@ async def master_coro(
         - EXIT: send EXIT message to selected topics & & exit myself
 
         - CLOCK_TICK: MAYBE clear screen on user inactivity, send
-        clock signal to screen.
+        time to screen.
 
-        - NETWORK_STATUS: network staus up/down set to controller status
+        - NETWORK_STATUS, KEYBOARD STATUS, STREAMER_STATUS_REPLY:
+          status set to controller status, status to screen if
+          changed (published by components on change)
 
         Messages to state machine
 
         - all other messages sent to state specific contorollers
 
         """
-        goon = True
-
         logger.info("master_coro: name='%s', got msg='%s'", name, msg)
-        if is_message_type(msg, TOPICS.CONTROL_MESSAGES.REBOOT):
+        return control.dispatch(msg, hub)
 
-            # On shutdown send 'exit' -message to all  relevant topics
-            exit_message_to_coro_topics(source=TOPICS.HALT_SOURCE.MESSAGE)
-            # # Allow gracefull exit
-            # await asyncio.sleep(1)
-            cancel_tasks(tasks)
-
-            # finally cancel myself - return goon = False
-            logger.warning(
-                "name: %s - cancelling myself by returning false", name)
-            return False
-
-        elif is_message_type(msg, TOPICS.CONTROL_MESSAGES.HALT):
-            # origin?: see gpio and SIGTERM
-            msg_halt = cast(MsgHalt_HaltAck, msg)
-            exit_message_to_coro_topics(source=msg_halt.source)
-
-        elif is_message_type(msg, TOPICS.CONTROL_MESSAGES.HALT_ACK):
-            msg_ack = cast(MsgHalt_HaltAck, msg)
-            # graceful exit --> save radion state for next reboot
-            controller_state.save_state()
-            # origins from screen_coro:
-            logger.warning(
-                "master_coro: halt_ack received: msg='%s'", msg)
-            cancel_tasks(tasks)
-            # system_halt on volume button knob GPIO singnal
-            # --> sudo halt
-            # --> journalctl > LCD output
-            system_shutdown(system_halt=msg_ack.source ==
-                            TOPICS.HALT_SOURCE.GPIO)
-        elif is_message_type(msg, TOPICS.COMMON_MESSAGES.EXIT):
-            # Pass exit message to relevavant topics
-            raise NotImplementedError(f"Control coro should no receive {msg}")
-
-        elif is_message_type(msg, TOPICS.NETWORK_MESSAGES.STATUS):
-            # Set network status in controller state
-            msg_network = cast(MsgNetwork, msg)
-            controller_state.set_network_status(msg_network.status)
-
-        elif is_message_type(msg, TOPICS.KEYBOARD_MESSAGES.STATUS):
-            # Set keyboard status
-            msg_keyboard = cast(MsgKeyboardStatus, msg)
-            changed = controller_state.set_keyboard_status(
-                keyboard_status=msg_keyboard.status)
-            if changed:
-                logger.info("status: keyboard status changed='%s'",
-                            msg_keyboard.status)
-
-        elif is_message_type(msg, TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY):
-            # Set network status in controller state
-            msg_streamer_status = cast(MsgStreamerStatusReply, msg)
-            streamer_status_changed = controller_state.set_streamer_status(
-                running=msg_streamer_status.running)
-            if streamer_status_changed:
-                logger.info(
-                    "status: streamer-process ASIS='%s'" +
-                    ", streamer-process TOBE:'%s'",
-                    msg_streamer_status.running,
-                    controller_state.streamer_on)
-            if controller_state.streamer_on and not msg_streamer_status.running:
-                # TODO: test if works in all cases, try to restart
-                # streamer
-                controller_state.menu_step = ctrl_act_set_stream(hub)
-
-        elif is_message_type(msg, TOPICS.COMMON_MESSAGES.CLOCK_TICK):
-
-            # maybe put screen on sleep due to user inactivity
-            if (controller_state.user_inactive_too_long() and
-                    not controller_state.screen_in_sleep):
-
-                # inactive too long --> put display in sleep
-                logger.info(
-                    "user_inactive_too_long: user_lasttime_active: %s -> going to sleep",
-                    controller_state.user_inactivity)
-
-                controller_state.display_close_if_awake(hub=hub)
-
-            # sets controller_state.keyboard_status
-            ctrl_act_poll_keyboard_status(hub=hub)
-
-            # send clock message to screen, refersh display if screen
-            # not asleep inactivity check above sets
-            # controller_state.screen_in_sleep
-            ctrl_act_update_status(hub)
-            # hub.publish(
-            #     topic=TOPICS.SCREEN,
-            #     message=message_clock_update(
-            #         network_status=controller_state.network_status,
-            #         streaming_status=controller_state.streamer_status,
-            #         keyboard_status=controller_state.keyboard_status,
-            #     )
-            # )
-
-            # Send status query to stream (exect STREAMER_STATUS_REPLY)
-            hub.publish(
-                topic=TOPICS.STREAMER,
-                message=message_create(
-                    message_type=TOPICS.STREAMER_MESSAGES.STATUS_QUERY)
-            )
-
-        else:
-            # Maybe wake display up for user activity
-            if controller_state.maybe_user_active(msg=msg):
-                # User was active
-                if controller_state.display_maybe_awake(hub=hub):
-                    # user active && display awoke --> discard user action
-                    return goon
-
-            # non blocking state machine execution (maybe exit)
-            goon = controller_state.state_machine(msg, hub)
-            # Continue
-        return goon
+    # Handlers for 'control_action': return goon
+    control = control_dispatcher(name=name, tasks=tasks)
 
     # Master coro waits on topic and dispatches responses in 'control_action
     f_init_enter(hub=hub)
+    # initial streamer status, later pushed on change
+    status_query = background_task(ctrl_act_query_streamer_status(hub),
+                                   name="streamer-status")
     # Main control loop waiting on 'topic' (CONTROL topic in this case)
     try:
         await reader_coro(name=name, hub=hub, topic=topic, action=control_action)
@@ -2613,11 +2948,14 @@ async def master_coro(
         logger.error(f"{ex}")
         logger.exception(f"master_coro got exception {ex}")
         # notifi all other coros on exit
-        exit_message_to_coro_topics(source=TOPICS.HALT_SOURCE.MESSAGE)
+        _exit_message_to_coro_topics(hub, source=TOPICS.HALT_SOURCE.MESSAGE)
         # # Allow gracefull exit
         # await asyncio.sleep(1)
-        cancel_tasks(tasks)
+        _cancel_tasks(name, tasks)
         raise
+    finally:
+        # streamer may have exited before replying
+        status_query.cancel()
 
     # Gracefull exit -> save controller_state
     controller_state.save_state()
@@ -2808,6 +3146,21 @@ def enable_SIGTERM(hub: Hub):
     signal.signal(sigterm_signal, shutdown_handler_1st)
 
 
+def enable_SIGUSR1(hub: Hub):
+    """Dump hub statistics to 'APP_CONTEXT.HUB_STATS.DUMP_FILE' on
+    'SIGUSR1'."""
+
+    def stats_handler(signum, frame):
+        try:
+            hub.stats.dump()
+        except OSError as err:
+            logger.error("stats_handler: dump failed err='%s'", err)
+
+    logger.info("enable_SIGUSR1: dump hub stats to '%s'",
+                APP_CONTEXT.HUB_STATS.DUMP_FILE)
+    signal.signal(signal.SIGUSR1, stats_handler)
+
+
 # ------------------------------------------------------------------
 # Command mains
 
@@ -2830,6 +3183,12 @@ def radio_main(parsed):
                        topic=TOPICS.CONTROL, loop=loop)
 
     enable_SIGTERM(hub=hub)
+    enable_SIGUSR1(hub=hub)
+
+    # Optionally record hub traffic for replay
+    recorder = HubRecorder(parsed.record) if getattr(parsed, "record", None) else None
+    if recorder is not None:
+        recorder.attach(hub)
 
     # Run application - for ever
     try:
@@ -2848,5 +3207,8 @@ def radio_main(parsed):
         #     raise
     finally:
         # Cleanup
+        if recorder is not None:
+            recorder.detach()
         gpio_close()
         screen_close()
+        http_cache_flush()
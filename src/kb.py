@@ -6,32 +6,18 @@ import logging
 import asyncio
 from typing import Tuple
 
+from .kb_hotplug import find_keyboard_path
+
 logger = logging.getLogger(__name__)
 
 BS = "<BACKSPACE>"
 
 
-def _list_devices():
-    # List all input devices
-    devices = [evdev.InputDevice(path) for path in evdev.list_devices()]
-    # print(f"{devices=}")
-    return devices
-
-
-def find_keyboard(keyboard_name) -> evdev.InputDevice:
-    """Find your input device with 'keyboard_name'."""
-    #
-    devices = _list_devices()
-    kb_dev = None
-    for device in devices:
-        logger.info("device.path='%s', device.name=%s, device.phys=%s, looking for '%s'",
-                    device.path, device.name, device.phys, keyboard_name)
-        if (device.name == keyboard_name or
-                device.name.endswith(keyboard_name)
-            ):
-            kb_dev = device
-            logger.info("found keyboard kb_dev='%s'", kb_dev)
-
+def find_keyboard(keyboard_name) -> evdev.InputDevice | None:
+    """Find your input device with 'keyboard_name' (only matching
+    device is opened, see 'kb_hotplug.find_keyboard_path')."""
+    path = find_keyboard_path(keyboard_name)
+    kb_dev = evdev.InputDevice(path) if path is not None else None
     logger.info("Found: kb_dev='%s'", kb_dev)
     return kb_dev
 
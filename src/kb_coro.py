@@ -1,16 +1,21 @@
 """Publish subscribe 'spy' aka 'reader'
 """
+from typing import Dict
+from functools import partial
 import asyncio
 import logging
-import random
+import time
 import evdev
 
 from .publish_subsrcibe import Hub, Subscription
-from .constants import TOPICS, RPI
-from .kb import read_keyboard_gen, find_keyboard
+from .constants import TOPICS, RPI, APP_CONTEXT
+from .kb import read_keyboard_gen
+from .kb_hotplug import InputWatcher, find_keyboard_path
 from .helpers import cancel_and_wait
+from .dispatch import Dispatcher
 from .messages import (
-    is_message_type, message_key,
+    message_key,
+    message_keyboard_status,
 )
 
 # ------------------------------------------------------------------
@@ -41,6 +46,13 @@ async def _kb_reader_coro(name: str,
                           ) -> str:
     """Wait for key presses and send keys to 'topic_out'
 
+    Keyboard is attached when its device node appears (see
+    'kb_hotplug.InputWatcher') and detached when it is removed.
+    KEYBOARD_MESSAGES.STATUS is published to 'topic_out' on attach
+    and detach.
+    Latencies plug-to-attach and plug-to-first-key are logged and
+    kept in 'keyboard_latency'.
+
     Parameters
     ----
 
@@ -48,9 +60,6 @@ async def _kb_reader_coro(name: str,
 
     :name: just a string to identify coro
 
-    :action: function/async function to call when message
-    received. Exit if 'action' returns False.
-
     Return
     -----
     Shutdown message
@@ -59,32 +68,104 @@ async def _kb_reader_coro(name: str,
 
     global keyboard
     keyboard = None
+    key = None
 
-    goon = True
-    while goon:
-
-        if keyboard is None:
-            keyboard = find_keyboard(keyboard_name=RPI.KEYBOARD_NAME)
-            if keyboard is None:
-                logger.info("No keyboard: keyboard='%s'", keyboard)
-                await asyncio.sleep(random.random() * 5)
-        else:
-            logger.debug("start reading keyboard: keyboard='%s'", keyboard)
-            async for key in read_keyboard_gen(keyboard=keyboard):
-                logger.debug("reiviced key: key='%s'", key)
-                goon = _kb_action(key=key, hub=hub, topic_out=topic_out)
-                if not goon:
-                    logger.debug("break output from loop : key='%s'", key)
-                    break
+    with InputWatcher() as watcher:
+        goon = True
+        while goon:
+            path = find_keyboard_path(RPI.KEYBOARD_NAME)
+            if path is None:
+                logger.info("No keyboard: wait for input devices")
+                await watcher.wait()
+                continue
+            try:
+                keyboard = evdev.InputDevice(path)
+            except OSError as e:
+                # node created, udev not yet done with permissions
+                logger.info("keyboard path='%s' not ready: '%s'", path, e)
+                await watcher.wait(timeout=APP_CONTEXT.KEYBOARD_HOTPLUG.ATTACH_RETRY)
+                continue
+
+            plugged = watcher.created.get(path)
+            _latency_report(plugged, "attach")
+            logger.info("start reading keyboard: keyboard='%s'", keyboard)
+            hub.publish(topic=topic_out, message=message_keyboard_status(status=True))
+            first_key = True
+            try:
+                async for key in read_keyboard_gen(keyboard=keyboard):
+                    if first_key:
+                        _latency_report(plugged, "first_key")
+                        first_key = False
+                    logger.debug("reiviced key: key='%s'", key)
+                    goon = _kb_action(key=key, hub=hub, topic_out=topic_out)
+                    if not goon:
+                        logger.debug("break output from loop : key='%s'", key)
+                        break
+            except OSError as e:
+                # ENODEV: unplugged
+                logger.info("keyboard detached: path='%s', error='%s'", path, e)
+            finally:
+                keyboard.close()
+                keyboard = None
+                watcher.created.pop(path, None)
+                hub.publish(topic=topic_out, message=message_keyboard_status(status=False))
+            if goon:
+                # node may linger after unplug: no busy find/open loop
+                await watcher.wait(timeout=APP_CONTEXT.KEYBOARD_HOTPLUG.ATTACH_RETRY)
 
     exit_msg = f"kb_coro '{name}' is shutting down on '{key=}'"
     logger.info("%s msg: %s", name, exit_msg)
     return exit_msg
 
+
+# Latest hotplug latencies (secs from device node creation)
+keyboard_latency: Dict[str, float] = {}
+
+
+def _latency_report(plugged: float | None, event: str):
+    """Log and record latency of 'event' since keyboard was 'plugged'
+    (None: keyboard was present at start)."""
+    if plugged is None:
+        return
+    keyboard_latency[event] = time.monotonic() - plugged
+    logger.info("keyboard hotplug: plug-to-%s %.3fs", event, keyboard_latency[event])
+
 # ------------------------------------------------------------------
 # Manage keyboard_task
 
 
+def _keyboard_start(name: str, hub: Hub, topic_out: str):
+    """Start '_kb_reader_coro' in 'keyboard_task', relaunched if it
+    dies (see '_keyboard_task_done')."""
+    global keyboard_task
+    keyboard_task = asyncio.create_task(
+        _kb_reader_coro(name=name, hub=hub, topic_out=topic_out))
+    keyboard_task.add_done_callback(
+        partial(_keyboard_task_done, name=name, hub=hub, topic_out=topic_out))
+
+
+def _keyboard_task_done(task: asyncio.Task, name: str, hub: Hub, topic_out: str):
+    """Log why reader 'task' finished and relaunch it after
+    'APP_CONTEXT.KEYBOARD_HOTPLUG.RELAUNCH' secs (unless stopped or
+    replaced meanwhile)."""
+    if task.cancelled() or task is not keyboard_task:
+        # stopped
+        return
+    if task.exception() is not None:
+        logger.error("%s: keyboard_task died: '%s'", name, task.exception(),
+                     exc_info=task.exception())
+    else:
+        logger.warning("%s: keyboard_task finished: '%s'", name, task.result())
+
+    def _relaunch():
+        if keyboard_task is task:
+            logger.info("%s: relaunch keyboard_task", name)
+            _keyboard_start(name=name, hub=hub, topic_out=topic_out)
+
+    asyncio.get_running_loop().call_later(
+        APP_CONTEXT.KEYBOARD_HOTPLUG.RELAUNCH, _relaunch)
+
+
 async def _keyboard_stop(name: str):
     """Stops keyboard task
 
@@ -120,6 +201,39 @@ def is_keyboard_connected() -> bool:
     return ret
 
 
+# ------------------------------------------------------------------
+# Control message handlers: return False to exit 'kb_coro'
+
+kb_dispatch = Dispatcher("keyboard")
+
+
+@kb_dispatch.on(TOPICS.COMMON_MESSAGES.EXIT)
+async def _kb_msg_exit(msg, name: str, **_) -> bool:
+    await _keyboard_stop(name=name)
+    return False
+
+
+@kb_dispatch.on(TOPICS.KEYBOARD_MESSAGES.START)
+async def _kb_msg_start(msg, name: str, hub: Hub, topic_out: str) -> bool:
+    # msg_start = cast(MsgKeyboardStart, msg)
+    if keyboard_task is None or keyboard_task.done():
+        _keyboard_start(name=name, hub=hub, topic_out=topic_out)
+    return True
+
+
+@kb_dispatch.on(TOPICS.KEYBOARD_MESSAGES.STOP)
+async def _kb_msg_stop(msg, name: str, **_) -> bool:
+    # msg_stop = cast(MsgKeyboardStop, msg)
+    await _keyboard_stop(name=name)
+    return True
+
+
+@kb_dispatch.otherwise
+async def _kb_msg_unknown(msg, name: str, **_) -> bool:
+    logger.warning("kb_coro: '%s' unknown msg='%s'", name, msg)
+    return True
+
+
 async def kb_coro(
         name: str,
         hub: Hub,
@@ -141,38 +255,16 @@ async def kb_coro(
     # await asyncio.sleep(random.random() * 5)
     logger.info("kb_coro: '%s' has decided to subscribe now!", name)
 
-    global keyboard_task
-
-    with Subscription(hub=hub, topic=topic) as queue:
+    stats = hub.stats
+    with Subscription(hub=hub, topic=topic, name=name) as queue:
         goon = True
         while goon:
-            try:
-                msg = await asyncio.wait_for(queue.get(), timeout=5)
-                logger.debug("kb_coro: msg='%s'", msg)
-
-                if is_message_type(msg, TOPICS.COMMON_MESSAGES.EXIT):
-                    await _keyboard_stop(name=name)
-                    goon = False
-
-                elif is_message_type(msg, TOPICS.KEYBOARD_MESSAGES.START):
-                    # msg_start = cast(MsgKeyboardStart, msg)
-                    if keyboard_task is None:
-                        keyboard_task = asyncio.create_task(
-                            _kb_reader_coro(name=name, hub=hub, topic_out=topic_out))
-
-                elif is_message_type(msg, TOPICS.KEYBOARD_MESSAGES.STOP):
-                    # msg_stop = cast(MsgKeyboardStop, msg)
-                    await _keyboard_stop(name=name)
-
-            except asyncio.TimeoutError:
-                # logger.debug("kb_coro: timeout'")
-                if keyboard_task is not None and keyboard_task.done():
-                    # Should be running and finished - relaunc
-                    logger.info(": keyboard_task='%s', done='%s' --> relaunch",
-                                keyboard_task,  keyboard_task.done())
-                    keyboard_task = asyncio.create_task(
-                        _kb_reader_coro(name=name, hub=hub, topic_out=topic_out))
-
+            # reader attaches/detaches keyboard itself: no polling here
+            msg = await queue.get()
+            logger.debug("kb_coro: msg='%s'", msg)
+            start = stats.handling()
+            goon = await kb_dispatch.dispatch(msg, name=name, hub=hub, topic_out=topic_out)
+            stats.handled(name, msg, start)
 
     exit_msg = f"kb_coro '{name}' is shutting down"
     logger.info("%s msg: %s", name, exit_msg)
@@ -0,0 +1,214 @@
+"""Keyboard hotplug detection.
+
+Input device nodes 'event*' in 'APP_CONTEXT.KEYBOARD_HOTPLUG.INPUT_DIR'
+are watched with inotify (created, permissions set by udev, removed).
+Devices are identified from sysfs ('<SYSFS_INPUT>/eventN/device/name',
+'phys') without opening them; identities are cached per device node
+(inode, device number).
+
+Without inotify (non Linux) the directory is polled every
+'POLL_INTERVAL' secs.
+
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import time
+
+import logging
+
+from .constants import APP_CONTEXT
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Device identity
+
+
+@dataclass(frozen=True)
+class InputIdentity:
+    """Input device identified from sysfs"""
+    path: str
+    name: str
+    phys: str = ""
+
+
+def _read_sysfs(node: str, attribute: str) -> str:
+    path = os.path.join(APP_CONTEXT.KEYBOARD_HOTPLUG.SYSFS_INPUT,
+                        node, "device", attribute)
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+# Map device path -> ((st_ino, st_rdev), identity)
+_identities: Dict[str, Tuple[Tuple[int, int], InputIdentity]] = {}
+
+
+def device_identity(path: str) -> InputIdentity | None:
+    """Identity of input device node 'path' (cached until node is
+    re-created), None if node does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        _identities.pop(path, None)
+        return None
+    key = (st.st_ino, st.st_rdev)
+    cached = _identities.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    node = os.path.basename(path)
+    identity = InputIdentity(path=path, name=_read_sysfs(node, "name"),
+                             phys=_read_sysfs(node, "phys"))
+    _identities[path] = (key, identity)
+    logger.info("device_identity: identity='%s'", identity)
+    return identity
+
+
+def is_keyboard(identity: InputIdentity, keyboard_name: str) -> bool:
+    return identity.name == keyboard_name or identity.name.endswith(keyboard_name)
+
+
+def find_keyboard_path(keyboard_name: str) -> str | None:
+    """Path of input device named 'keyboard_name' (no device opened)."""
+    directory = APP_CONTEXT.KEYBOARD_HOTPLUG.INPUT_DIR
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.startswith("event"))
+    except OSError:
+        return None
+    for name in names:
+        identity = device_identity(os.path.join(directory, name))
+        if identity is not None and is_keyboard(identity, keyboard_name):
+            return identity.path
+    return None
+
+# ------------------------------------------------------------------
+# inotify
+
+
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+_EVENT = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal non blocking inotify watch on one directory."""
+
+    _libc = None
+
+    def __init__(self, directory: str, mask: int = IN_CREATE | IN_ATTRIB | IN_DELETE):
+        if Inotify._libc is None:
+            Inotify._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc = Inotify._libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno), directory)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read(self) -> List[Tuple[int, str]]:
+        """Return pending (mask, name) events."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            events.append((mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+# ------------------------------------------------------------------
+# Watcher
+
+
+class InputWatcher:
+    """Wait for changes of 'event*' nodes in input directory.
+
+    Usage (in event loop):
+
+        with InputWatcher() as watcher:
+            await watcher.wait()
+
+    'created' maps device path to monotonic time node appeared.
+    """
+
+    def __init__(self, directory: str | None = None,
+                 poll_interval: float = APP_CONTEXT.KEYBOARD_HOTPLUG.POLL_INTERVAL):
+        self.directory = directory or APP_CONTEXT.KEYBOARD_HOTPLUG.INPUT_DIR
+        self.poll_interval = poll_interval
+        self.created: Dict[str, float] = {}
+        self._inotify: Inotify | None = None
+        self._changed = asyncio.Event()
+
+    @property
+    def event_driven(self) -> bool:
+        return self._inotify is not None
+
+    def __enter__(self):
+        try:
+            self._inotify = Inotify(self.directory)
+            asyncio.get_running_loop().add_reader(self._inotify.fileno(), self._readable)
+        except (OSError, AttributeError) as e:
+            logger.warning("InputWatcher: directory='%s', no inotify error='%s' - poll",
+                           self.directory, e)
+            self._inotify = None
+        return self
+
+    def __exit__(self, *args):
+        if self._inotify is not None:
+            asyncio.get_running_loop().remove_reader(self._inotify.fileno())
+            self._inotify.close()
+            self._inotify = None
+
+    def _readable(self):
+        changed = False
+        for mask, name in self._inotify.read():
+            if not name.startswith("event"):
+                continue
+            path = os.path.join(self.directory, name)
+            if mask & IN_CREATE:
+                self.created[path] = time.monotonic()
+            elif mask & IN_DELETE:
+                self.created.pop(path, None)
+            logger.debug("InputWatcher: mask=0x%x, path='%s'", mask, path)
+            changed = True
+        if changed:
+            self._changed.set()
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait for change (at most 'timeout' secs, poll interval if
+        no inotify).
+
+        :return: True if change was seen
+        """
+        if not self.event_driven:
+            timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._changed.clear()
@@ -1,8 +1,9 @@
 """Manage messages
 """
 
-from typing import (Dict, List, cast, Optional, Iterable)
-from dataclasses import (dataclass, field, fields, asdict)
+from typing import (Callable, Dict, List, Tuple, cast, Optional, Iterable)
+from dataclasses import (dataclass, fields, asdict)
+from functools import cached_property, lru_cache
 import logging
 
 from .constants import TOPICS, COROS, APP_CONTEXT, DSCREEN
@@ -13,13 +14,13 @@ logger = logging.getLogger(__name__)
 # Messages
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgRoot:
     """All message MUST have 'message_type'."""
     message_type: str             # All messages have a type
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgKeyVal:
     """List element for key,val"""
     key: str
@@ -38,7 +39,7 @@ class MsgKeyVal:
         return "" if self.val is None else self.val
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgButton(MsgRoot):
     """"""
     button: int                   # GPIO number
@@ -49,7 +50,7 @@ class MsgButton(MsgRoot):
         return not self.long_press
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgKey(MsgRoot):
     """"""
     key: str                      # GPIO number
@@ -59,90 +60,102 @@ class MsgKey(MsgRoot):
         return key == "\n"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgDelay(MsgRoot):
     """"""
     ms: int                       # milli secs to delay
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgKeyboardStart(MsgRoot):
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgKeyboardStop(MsgRoot):
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgKeyboardStatus(MsgRoot):
     status: bool
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgKeyboardKey(MsgRoot):
     key: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgStreamer(MsgRoot):
     """Parent class for messages sent to strearem"""
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgStreamerStart(MsgStreamer):
     """Start streaming"""
     url: str                      # Url to start streaming from
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgStreamerStop(MsgStreamer):
     """Stop streaming"""
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgStreamerStatusReply(MsgRoot):
     """Reply to status streamer query"""
     status_str: str                   # String status
     running: bool                     # Running/not
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreen(MsgRoot):
     """Parent class for messages sent to screen."""
 
 
-@dataclass
+@dataclass(frozen=True)
 class MsgDScreen(MsgScreen):
-    """Message with generic (key-val) DScreen content."""
+    """Message with generic (key-val) DScreen content.
+
+    'full' message carries all fields, delta message (full=False) only
+    fields changed since previous message.
+    """
     screen_name: str
-    fields: list[MsgKeyVal] = field(default_factory=list)
+    fields: Tuple[MsgKeyVal, ...] = ()
+    full: bool = True
+
+    @cached_property
+    def _index(self) -> Dict[str, MsgKeyVal]:
+        """name -> field, built on first lookup (not a dataclass
+        field: kept out of 'message_keys'/'message_props')."""
+        return {kv.name: kv for kv in reversed(self.fields)}
 
     @property
     def fieldCount(self):
         return len(self.fields)
 
+    def fieldByName(self, name: str) -> MsgKeyVal | None:
+        """Return 'name' -field, None if not found."""
+        return self._index.get(name)
+
     def fieldStrValue(self, name: str) -> str | None:
         """Return string value for 'name' -field. None if no 'name'
         -field not found.
         """
-        for i in range(self.fieldCount):
-            key_val = self.fields[i]
-            if key_val.name == name:
-                return key_val.strValue
-        return None
+        key_val = self.fieldByName(name)
+        return None if key_val is None else key_val.strValue
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgNetwork(MsgRoot):
     """Parent class for network messages."""
     status: bool
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgHalt_HaltAck(MsgRoot):
     """Halt message, distinguish source (knob on GPIO input/SIGTEM)
 
@@ -150,7 +163,7 @@ class MsgHalt_HaltAck(MsgRoot):
     source: TOPICS.HALT_SOURCE
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgExit(MsgRoot):
     """Exit message signals coro to cleanup and exit.
 
@@ -161,7 +174,7 @@ class MsgExit(MsgRoot):
     source: TOPICS.HALT_SOURCE
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenUpdate(MsgRoot):
     """Screen full/fast/partial."""
 
@@ -175,37 +188,48 @@ class MsgScreenUpdate(MsgRoot):
     name: str | None = None                   # screen element to update partially
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgClockUpdate(MsgScreen):
-    """Update clock with status spites."""
+    """Update clock time ("": screen local time)."""
+    time: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class MsgStatusUpdate(MsgScreen):
+    """Status sprites and version (sent when changed)."""
     network_status: bool
     streaming_status: bool
     keyboard_status: bool
     jrr_version: str
 
 
-@dataclass
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenIcon(MsgScreen):
     """Put icon to screen ."""
     icon: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenText(MsgScreen):
     """Put 'text' to screen into screen position 'name' (generic)."""
     name: str
     text: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class MsgScreenNowPlaying(MsgScreen):
+    """Stream title currently playing ('' = nothing known)."""
+    title: str
+
+
+@dataclass(frozen=True, slots=True)
 class MsgScreenError(MsgScreen):
     """Show 'error' and """
     error: str         # short name/classification
     instructions: str  # multiline text
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenQuestion(MsgScreen):
     """Show 'error' and """
     title: str         # short name/classification
@@ -213,7 +237,7 @@ class MsgScreenQuestion(MsgScreen):
     icon: str          # imagepath to icon to show on screen
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenFirmware(MsgScreen):
     """Firmaware version and release notes"""
     header: str        # short name/classification
@@ -221,7 +245,7 @@ class MsgScreenFirmware(MsgScreen):
     notes: str         # relases notes (multiline)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenNetworkInfo(MsgScreen):
     """Show 'error' and """
     title: str
@@ -230,7 +254,7 @@ class MsgScreenNetworkInfo(MsgScreen):
     ip: str            # IP adddress on current network co
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenConfigHeader(MsgScreen):
     """Configuration message to screen.
 
@@ -242,7 +266,7 @@ class MsgScreenConfigHeader(MsgScreen):
     icon: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenButtons(MsgScreen):
     """Button labels 1,2,3,4 """
     label1: str
@@ -251,7 +275,7 @@ class MsgScreenButtons(MsgScreen):
     label4: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MsgScreenStatusIcons(MsgScreen):
     """Streaming and network status"""
     network: bool
@@ -277,6 +301,7 @@ message_constructors = {
 
     # NETWORK messages
     TOPICS.NETWORK_MESSAGES.STATUS: MsgNetwork,
+    TOPICS.NETWORK_MESSAGES.CHANGE: str,
 
     # KEYBOARD messages
     TOPICS.KEYBOARD_MESSAGES.START: MsgKeyboardStart,
@@ -299,6 +324,7 @@ message_constructors = {
     TOPICS.SCREEN_MESSAGES.CLEAR: str,
     TOPICS.SCREEN_MESSAGES.CLOSE: str,
     TOPICS.SCREEN_MESSAGES.CLOCK: MsgClockUpdate,              # update time on clock
+    TOPICS.SCREEN_MESSAGES.STATUS: MsgStatusUpdate,            # status sprites, version
     TOPICS.SCREEN_MESSAGES.SLEEP: str,
     TOPICS.SCREEN_MESSAGES.WAKEUP: str,
     TOPICS.SCREEN_MESSAGES.MSG_INFO: MsgScreenText,             # user message
@@ -312,9 +338,55 @@ message_constructors = {
     # Firmware w. release notes
     TOPICS.SCREEN_MESSAGES.FIRMAWRE: MsgScreenFirmware,
     TOPICS.SCREEN_MESSAGES.NETWORK_INFO: MsgScreenNetworkInfo,  # Wifi info
+    TOPICS.SCREEN_MESSAGES.NOW_PLAYING: MsgScreenNowPlaying,    # stream title
 }
 
 
+def _compile_constructor(message_type: str) -> Callable[[Dict], MsgRoot | str]:
+    """Return function constructing 'message_type' message from dict.
+
+    Messages without payload are interned: all calls return the same
+    instance.
+    """
+    msg_class = message_constructors[message_type]
+
+    if msg_class is str:
+        # very simple message - just string property - no dict values
+        # needed
+        def _construct_str(d: Dict) -> str:
+            return message_type
+        return _construct_str
+
+    if [f.name for f in fields(msg_class)] == ["message_type"]:
+        # payload free message - one shared (immutable) instance
+        singleton = msg_class(message_type=message_type)
+
+        def _construct_singleton(d: Dict) -> MsgRoot:
+            if d and d.keys() != {"message_type"}:
+                return msg_class(message_type=message_type, **d)
+            return singleton
+        return _construct_singleton
+
+    def _construct(d: Dict) -> MsgRoot:
+        try:
+            if "message_type" in d:
+                return msg_class(**{**d, "message_type": message_type})
+            return msg_class(message_type=message_type, **d)
+        except TypeError as e:
+            e.add_note(
+                f"Error in {message_type=}," +
+                f"fields {[f.name for f in fields(msg_class)]}")
+            raise
+    return _construct
+
+
+# Properties for messages created without 'd' (never modified)
+_NO_PROPS: Dict = {}
+
+# Map message_type -> constructor function (compiled on first use)
+_compiled_constructors: Dict[str, Callable[[Dict], MsgRoot | str]] = {}
+
+
 def message_create(
         d: Dict | None = None,
         message_type: str | None = None
@@ -326,7 +398,9 @@ def message_create(
 
     Expect message_type either in 'd' or as 'message_type' paramater.
 
-    Dispatches contructor using 'message_constructors' -dictionary.
+    Dispatches contructor using 'message_constructors' -dictionary
+    (constructors compiled per type on first use, 'd' is not
+    modified).
 
     Parameters
     ----
@@ -341,45 +415,33 @@ def message_create(
 
     """
     if d is None:
-        d = {}
+        d = _NO_PROPS
 
     # query type of message
     class_query = message_type if message_type is not None else d["message_type"]
-    msg_class = message_constructors[class_query]
-
-    # instantiate 'message' for 'msg_class'
-    if msg_class.__name__ == str.__name__:
-        # very simple message - just string property - no dict values
-        # needed
-        message = msg_class(class_query)
-    else:
-        # call constructor 'msg_class' with 'd' -**kwargs.
-        try:
-            d["message_type"] = class_query
-            message = msg_class(**d)
-        except TypeError as e:
-            e.add_note(
-                f"Error in {message_type=}," +
-                f"fields {[f for f in dir(msg_class) if not f.startswith('_')]}")
-            raise
+    try:
+        construct = _compiled_constructors[class_query]
+    except KeyError:
+        construct = _compiled_constructors[class_query] = _compile_constructor(class_query)
 
-    # print(f"message_create: {message=}, {msg_class=}, {class_query=}")
-
-    return message
+    return construct(d)
 
 # ------------------------------------------------------------------
 # Message reflaction and interpretation
 
 
+def message_type_of(msg: str | MsgRoot) -> str:
+    """Return message_type of 'msg'."""
+    if isinstance(msg, str):
+        return msg
+    return msg.message_type
+
+
 def is_message_type(msg: str | MsgRoot, message_type: str | List[str]) -> bool:
     """True if 'msg' is of 'message_type' -type."""
     if isinstance(message_type, str):
-        message_type = [message_type]
-    if isinstance(msg, str):
-        return msg in message_type
-    else:
-        root_message = cast(MsgRoot, msg)
-        return root_message.message_type in message_type
+        return message_type_of(msg) == message_type
+    return message_type_of(msg) in message_type
 
 
 def message_types() -> List[str]:
@@ -406,14 +468,10 @@ def message_props(msg) -> Dict:
 # Some fixed message
 
 
+@lru_cache(maxsize=None)
 def message_screen_update(mode=MsgScreenUpdate.MODE_FULL) -> MsgRoot | str:
-    """Update screen in 'mode'."""
-    msg = message_create(
-        message_type=TOPICS.SCREEN_MESSAGES.UPDATE,
-        d={
-            "mode": mode
-        })
-    return msg
+    """Update screen in 'mode' (interned)."""
+    return MsgScreenUpdate(message_type=TOPICS.SCREEN_MESSAGES.UPDATE, mode=mode)
 
 
 def message_info(line1: str) -> MsgScreenText:
@@ -462,6 +520,14 @@ def message_streamer_stop() -> MsgStreamerStop:
     return msg_streamer
 
 
+@lru_cache(maxsize=16)
+def message_streamer_status_reply(status_str: str, running: bool) -> MsgStreamerStatusReply:
+    """Streamer status: on change and reply to STATUS_QUERY (interned)."""
+    return MsgStreamerStatusReply(
+        message_type=TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY,
+        status_str=status_str, running=running)
+
+
 def message_keyboard_start() -> MsgKeyboardStart:
     """Message to start reading keyboard
 
@@ -484,6 +550,12 @@ def message_keyboard_stop() -> MsgKeyboardStop:
     return msg_kb
 
 
+@lru_cache(maxsize=None)
+def message_keyboard_status(status: bool) -> MsgKeyboardStatus:
+    """Keyboard attached/detached (interned)."""
+    return MsgKeyboardStatus(message_type=TOPICS.KEYBOARD_MESSAGES.STATUS, status=status)
+
+
 def message_screen_stream_icon(icon: str) -> MsgScreenIcon:
     """Message to set stream icon.
 
@@ -500,6 +572,12 @@ def message_screen_stream_icon(icon: str) -> MsgScreenIcon:
     return msg_icon
 
 
+def message_now_playing(title: str) -> MsgScreenNowPlaying:
+    """Message to show stream 'title' now playing ('' to clear)."""
+    return MsgScreenNowPlaying(message_type=TOPICS.SCREEN_MESSAGES.NOW_PLAYING,
+                               title=title)
+
+
 def message_screen_close() -> MsgRoot | str:
     """Clear display content, (keep data), sleep.
 
@@ -516,38 +594,41 @@ def message_screen_refresh() -> MsgRoot | str:
     return msg
 
 
+@lru_cache(maxsize=None)
 def message_network_status(status: bool) -> MsgNetwork:
-    """Network status message."""
-    msg = message_create(message_type=TOPICS.NETWORK_MESSAGES.STATUS,
-                         d={
-                             "status": status
-                         })
-
-    msg_status = cast(MsgNetwork, msg)
-    return msg_status
+    """Network status message (interned)."""
+    return MsgNetwork(message_type=TOPICS.NETWORK_MESSAGES.STATUS, status=status)
 
 
+@lru_cache(maxsize=None)
 def message_status_icons(network: bool,
                          streaming: bool,
                          keyboard: bool) -> MsgScreenStatusIcons:
-    """Message for status sprite."""
-    msg = message_create(message_type=TOPICS.SCREEN_MESSAGES.SPRITE, d={
-        "network": network,
-        "streaming": streaming,
-        "keyboard": keyboard,
-    })
-    msg_icons = cast(MsgScreenStatusIcons, msg)
-    return msg_icons
+    """Message for status sprite (interned)."""
+    return MsgScreenStatusIcons(message_type=TOPICS.SCREEN_MESSAGES.SPRITE,
+                                network=network,
+                                streaming=streaming,
+                                keyboard=keyboard)
+
+
+def message_clock_update(time: str) -> MsgClockUpdate:
+    """Message to update clock on screen.
 
+    :time: time to show (HH:MM:SS)
 
-def message_clock_update(
+    """
+    return MsgClockUpdate(message_type=TOPICS.SCREEN_MESSAGES.CLOCK, time=time)
+
+
+@lru_cache(maxsize=32)
+def message_status_update(
         network_status: bool,
         streaming_status: bool,
         keyboard_status: bool,
         jrr_version: str,
-) -> MsgClockUpdate:
-    """Message to update clock on screen, and possibly
-    'refresh_display'.
+) -> MsgStatusUpdate:
+    """Message to update status sprites and version on screen
+    (interned: same statuses, same message).
 
     :network_status: ok/nok
 
@@ -556,16 +637,11 @@ def message_clock_update(
     :keyboard_status: connected/not connected
 
     """
-    msg = message_create(
-        message_type=TOPICS.SCREEN_MESSAGES.CLOCK,
-        d={
-            "network_status": network_status,
-            "streaming_status": streaming_status,
-            "keyboard_status": keyboard_status,
-            "jrr_version": jrr_version,
-        })
-    msg_clock = cast(MsgClockUpdate, msg)
-    return msg_clock
+    return MsgStatusUpdate(message_type=TOPICS.SCREEN_MESSAGES.STATUS,
+                           network_status=network_status,
+                           streaming_status=streaming_status,
+                           keyboard_status=keyboard_status,
+                           jrr_version=jrr_version)
 
 
 def message_button_labels(
@@ -591,13 +667,8 @@ def message_button(button: int, long_press: bool):
 
     :return: MsgButton
     """
-    # return f"{button}={short_or_long}"
-    msg = message_create(message_type=TOPICS.GPIO_MESSAGES.GPIO,
-                         d={
-                             "button": button,
-                             "long_press": long_press,
-                         })
-    return msg
+    return MsgButton(message_type=TOPICS.GPIO_MESSAGES.GPIO,
+                     button=button, long_press=long_press)
 
 
 def message_config_title(
@@ -630,65 +701,37 @@ def message_key(key: str) -> MsgKey:
 
     :return: MsgKey
     """
-    # return f"{button}={short_or_long}"
-    msg = message_create(message_type=TOPICS.KEYBOARD_MESSAGES.KEY,
-                         d={
-                             "key": key,
-                         })
-    msg_key = cast(MsgKey, msg)
-    return msg_key
+    return MsgKeyboardKey(message_type=TOPICS.KEYBOARD_MESSAGES.KEY, key=key)
 
 
-def message_dscreen(screen_name: str, key_values: Iterable) -> MsgDScreen:
+def message_dscreen(screen_name: str, key_values: Iterable,
+                    full: bool = True) -> MsgDScreen:
     """Message to pass Dscreen fieldValues to screen-coro'.
 
+    :full: False: 'key_values' only changed fields
+
     :return: MsgDScreen
     """
-
-    msg = message_create(message_type=TOPICS.SCREEN_MESSAGES.DSCREEN,
-                         d={
-                             "screen_name": screen_name
-                         }
-                         )
-    msg_dscreen = cast(MsgDScreen, msg)
-    for k, v in key_values:
-        msg_dscreen.fields.append(MsgKeyVal(key=k, val=v))
-
-    return msg_dscreen
+    return MsgDScreen(
+        message_type=TOPICS.SCREEN_MESSAGES.DSCREEN,
+        screen_name=screen_name,
+        fields=tuple(MsgKeyVal(key=k, val=v) for k, v in key_values),
+        full=full)
 
 
+@lru_cache(maxsize=None)
 def message_halt(source: TOPICS.HALT_SOURCE) -> MsgHalt_HaltAck:
-    msg = message_create(message_type=TOPICS.CONTROL_MESSAGES.HALT,
-                         d={
-                             "source": source
-                         }
-                         )
-    msg_halt = cast(MsgHalt_HaltAck, msg)
-
-    return msg_halt
+    return MsgHalt_HaltAck(message_type=TOPICS.CONTROL_MESSAGES.HALT, source=source)
 
 
+@lru_cache(maxsize=None)
 def message_halt_ack(source: TOPICS.HALT_SOURCE) -> MsgHalt_HaltAck:
-    msg = message_create(message_type=TOPICS.CONTROL_MESSAGES.HALT_ACK,
-                         d={
-                             "source": source
-                         }
-                         )
-    msg_halt_ack = cast(MsgHalt_HaltAck, msg)
-
-    return msg_halt_ack
+    return MsgHalt_HaltAck(message_type=TOPICS.CONTROL_MESSAGES.HALT_ACK, source=source)
 
 
+@lru_cache(maxsize=None)
 def message_exit(source: TOPICS.HALT_SOURCE) -> MsgExit:
-    msg = message_create(
-        message_type=TOPICS.COMMON_MESSAGES.EXIT,
-        d={
-            "source": source
-        }
-    )
-    msg_exit = cast(MsgExit, msg)
-
-    return msg_exit
+    return MsgExit(message_type=TOPICS.COMMON_MESSAGES.EXIT, source=source)
 
 
 def message_panik():
@@ -1,14 +1,26 @@
 """Monitor network connectivity
+
+Link, address and route changes are received from rtnetlink (Linux)
+and published as 'NETWORK_MESSAGES.CHANGE' to monitor topic, which
+triggers a connectivity probe ('utils.check_inet') right away. Current
+SSID ('utils.current_ssid') is refreshed on changes.
+
+Between events probes back off: interval doubles while status stays
+the same, from 'APP_CONTEXT.NETWORK_MONITOR.MIN_INTERVAL' up to
+'MAX_INTERVAL_UP/DOWN'. Without rtnetlink probes run every
+'MIN_INTERVAL' secs.
+
 """
 
 import asyncio
 import logging
+import socket
 from typing import Callable, Any
 
-from .utils import check_inet
+from .utils import check_inet, refresh_current_ssid
 from .publish_subsrcibe import Hub, Subscription
-from .constants import TOPICS
-from .messages import message_network_status, is_message_type
+from .constants import TOPICS, APP_CONTEXT
+from .messages import message_network_status, message_create, is_message_type
 
 
 logger = logging.getLogger(__name__)
@@ -28,45 +40,163 @@ def reset_network_status():
     global prev_status
     prev_status = None
 
+# ------------------------------------------------------------------
+# rtnetlink events
+
+
+# rtnetlink multicast groups (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+RTNETLINK_GROUPS = (RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE |
+                    RTMGRP_IPV6_IFADDR | RTMGRP_IPV6_ROUTE)
+
+
+def open_rtnetlink(groups: int = RTNETLINK_GROUPS) -> socket.socket | None:
+    """Non blocking rtnetlink socket subscribed to 'groups', None if
+    not supported."""
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW,
+                             socket.NETLINK_ROUTE)
+    except (AttributeError, OSError) as e:
+        logger.warning("open_rtnetlink: not available, error='%s'", e)
+        return None
+    try:
+        sock.bind((0, groups))
+        sock.setblocking(False)
+    except OSError as e:
+        logger.warning("open_rtnetlink: bind error='%s'", e)
+        sock.close()
+        return None
+    return sock
+
+
+def watch_socket(sock: socket.socket, on_event: Callable[[], None]):
+    """Call 'on_event' once for each burst of datagrams readable in
+    'sock' (drained, content not parsed)."""
+
+    def _readable():
+        events = 0
+        while True:
+            try:
+                if not sock.recv(65536):
+                    break
+                events += 1
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # e.g. ENOBUFS: events lost, still a change
+                logger.info("watch_socket: error='%s'", e)
+                events += 1
+                break
+        if events > 0:
+            on_event()
+
+    asyncio.get_running_loop().add_reader(sock.fileno(), _readable)
+
+
+def unwatch_socket(sock: socket.socket):
+    asyncio.get_running_loop().remove_reader(sock.fileno())
+    sock.close()
+
+# ------------------------------------------------------------------
+# coro
+
+
+def next_interval(interval: float, changed: bool, status: bool,
+                  events: bool = True) -> float:
+    """Probe interval after probe: reset on change, else double up
+    to limit of 'status'. Without 'events' always MIN_INTERVAL."""
+    cnf = APP_CONTEXT.NETWORK_MONITOR
+    if changed or not events:
+        return cnf.MIN_INTERVAL
+    limit = cnf.MAX_INTERVAL_UP if status else cnf.MAX_INTERVAL_DOWN
+    return min(interval * 2, limit)
+
 
 async def network_coro(name: str,
                        hub: Hub,
                        topic: str,
                        action: Callable = _default_action,
                        status_topic: str = TOPICS.CONTROL,
+                       probe: Callable = check_inet,
+                       refresh: Callable = refresh_current_ssid,
                        ) -> str:
-    """Accept control messages from topic, on time-out check for
-    network status.
+    """Accept control messages from topic, check network status on
+    rtnetlink change event and on (adaptive) time-out.
 
-    Messages processed: EXIT
+    Messages processed: EXIT, NETWORK_MESSAGES.CHANGE
 
     :topic: receive control messages
 
     :status_topic: report MsgNetworkStatus message
 
+    :probe: async connectivity check returning bool
+
+    :refresh: async called on network change
+
     """
 
     # await asyncio.sleep(random.random() * 5)
     logger.info("network_coro: '%s' has decided to subscribe now!", name)
 
     global prev_status
-    
-    with Subscription(hub=hub, topic=topic) as queue:
-        goon = True
-        while goon:
-            try:
-                msg = await asyncio.wait_for(queue.get(), timeout=5)
-                goon = action(msg, hub=hub)
-            except asyncio.TimeoutError:
-                network_status = await check_inet()
-                if network_status != prev_status:
-                    logger.info("network_status: %s, prev_status=%s",
-                                network_status, prev_status)
-                    hub.publish(
-                        topic=status_topic,
-                        message=message_network_status(status=network_status)
-                    )
-                    prev_status = network_status
+
+    change_pending = False
+
+    def _on_change():
+        # coalesce burst of events to one CHANGE message
+        nonlocal change_pending
+        if not change_pending:
+            change_pending = True
+            hub.publish(topic=topic, message=message_create(
+                message_type=TOPICS.NETWORK_MESSAGES.CHANGE))
+
+    async def _probe(interval: float, refreshed: bool = False) -> float:
+        global prev_status
+        network_status = await probe()
+        changed = network_status != prev_status
+        if changed:
+            logger.info("network_status: %s, prev_status=%s",
+                        network_status, prev_status)
+            if not refreshed:
+                await refresh()
+            hub.publish(
+                topic=status_topic,
+                message=message_network_status(status=network_status)
+            )
+            prev_status = network_status
+        return next_interval(interval, changed=changed, status=network_status,
+                             events=sock is not None)
+
+    sock = open_rtnetlink()
+    with Subscription(hub=hub, topic=topic, name=name) as queue:
+        if sock is not None:
+            watch_socket(sock, _on_change)
+        try:
+            interval = APP_CONTEXT.NETWORK_MONITOR.MIN_INTERVAL
+            goon = True
+            while goon:
+                try:
+                    msg = await asyncio.wait_for(queue.get(), timeout=interval)
+                except asyncio.TimeoutError:
+                    interval = await _probe(interval)
+                    continue
+                if is_message_type(msg, TOPICS.NETWORK_MESSAGES.CHANGE):
+                    # let addresses and routes settle
+                    await asyncio.sleep(APP_CONTEXT.NETWORK_MONITOR.SETTLE)
+                    change_pending = False
+                    logger.info("network_coro: rtnetlink change")
+                    await refresh()
+                    await _probe(interval, refreshed=True)
+                    interval = APP_CONTEXT.NETWORK_MONITOR.MIN_INTERVAL
+                else:
+                    goon = action(msg, hub=hub)
+        finally:
+            if sock is not None:
+                unwatch_socket(sock)
 
     exit_msg = f"network_coro '{name}' is shutting down"
     logger.info("%s msg: %s", name, exit_msg)
@@ -0,0 +1,132 @@
+"""Non blocking OS command executor.
+
+Commands are run as asyncio subprocesses (argument lists, no shell),
+at most 'APP_CONTEXT.OS_COMMAND.MAX_CONCURRENCY' at a time, killed on
+timeout or when awaiting task is cancelled. Output is captured to
+'CommandResult'.
+
+"""
+
+from dataclasses import dataclass
+from typing import List
+import asyncio
+
+import logging
+
+from .constants import APP_CONTEXT
+from .helpers import background_task
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one command"""
+    args: List[str]
+    returncode: int | None           # None if killed on timeout
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+class CommandExecutor:
+    """Run commands with bounded concurrency in event loop."""
+
+    def __init__(self,
+                 max_concurrency: int = APP_CONTEXT.OS_COMMAND.MAX_CONCURRENCY,
+                 timeout: float = APP_CONTEXT.OS_COMMAND.TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # semaphore is bound to the loop it is used in
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, args: List[str], timeout: float | None = None,
+                  input: str | None = None) -> CommandResult:
+        """Run 'args', return result (failures logged).
+
+        :timeout: secs, default 'self.timeout'
+
+        :input: written to stdin of the command
+        """
+        if timeout is None:
+            timeout = self.timeout
+        args = [str(arg) for arg in args]
+        async with self._get_semaphore():
+            logger.info("CommandExecutor.run: args='%s'", args)
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE)
+            except OSError as e:
+                logger.error("CommandExecutor.run: args='%s', error='%s'", args, e)
+                return CommandResult(args=args, returncode=None, stderr=str(e))
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(
+                        input.encode("utf-8") if input is not None else None),
+                    timeout)
+            except asyncio.TimeoutError:
+                await self._kill(process)
+                logger.error("CommandExecutor.run: args='%s' killed after %ss",
+                             args, timeout)
+                return CommandResult(args=args, returncode=None, timed_out=True)
+            except asyncio.CancelledError:
+                await self._kill(process)
+                raise
+
+        result = CommandResult(
+            args=args, returncode=process.returncode,
+            stdout=stdout.decode("utf-8", errors="replace"),
+            stderr=stderr.decode("utf-8", errors="replace"))
+        log = logger.info if result.ok else logger.error
+        log("CommandExecutor.run: returncode: %s stdout='%s'",
+            result.returncode, result.stdout)
+        log("CommandExecutor.run: returncode: %s stderr='%s'",
+            result.returncode, result.stderr)
+        return result
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process):
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    def submit(self, args: List[str],
+               loop: asyncio.AbstractEventLoop | None = None,
+               **kwargs):
+        """Fire and forget 'run' from event loop or from another thread
+        (e.g. GPIO callback) into 'loop'.
+
+        :return: task/concurrent future, None if no loop to run in
+        """
+        try:
+            asyncio.get_running_loop()
+            return background_task(self.run(args, **kwargs), name="os-command")
+        except RuntimeError:
+            pass
+        if loop is None:
+            loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.error("CommandExecutor.submit: no loop for args='%s'", args)
+            return None
+        return asyncio.run_coroutine_threadsafe(self.run(args, **kwargs), loop)
+
+
+command_executor = CommandExecutor()
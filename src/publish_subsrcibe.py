@@ -2,8 +2,13 @@
 """
 
 # Forward declaration
+from typing import Callable, List
 import asyncio
 
+from .constants import APP_CONTEXT
+from .hub_stats import HubStats
+from .messages import message_type_of
+
 # flake8 noqa: F811
 # pylint disable=function-redefined
 # pylint: disable=invalid-name
@@ -17,10 +22,18 @@ class Hub():
     """Maintain list of topic subscribers and provide services for
     publish-subsribe pattern.
 
+    'stats' counts messages, queue depths and handler latencies (see
+    'hub_stats').
+
+    'taps' are called with 'topic, message' on each publish (see
+    'hub_record').
+
     """
 
-    def __init__(self):
+    def __init__(self, stats: HubStats | None = None):
         self.topics = {}
+        self.stats = HubStats() if stats is None else stats
+        self.taps: List[Callable[[str, object], None]] = []
 
     def _getTopicQ(self, topic: str):
         """Return set of subscribers for 'topic'."""
@@ -33,22 +46,48 @@ class Hub():
         subscriptions = self._getTopicQ(topic)
         for queue in subscriptions:
             queue.put_nowait(message)
+        self.stats.publishing(topic, message, subscriptions)
+        for tap in self.taps:
+            tap(topic, message)
+
+    async def request(self, topic, message, reply_topic, reply_type,
+                      timeout=APP_CONTEXT.HUB_REQUEST.TIMEOUT):
+        """Publish 'message' on 'topic' and wait for first 'reply_type'
+        message on 'reply_topic'.
+
+        Reply is also delivered to other subscribers of 'reply_topic'.
+
+        :return: reply message
+
+        :raises: TimeoutError if no reply within 'timeout' secs
+        """
+        with Subscription(hub=self, topic=reply_topic, name=f"request-{reply_type}") as queue:
+            self.publish(topic=topic, message=message)
+            async with asyncio.timeout(timeout):
+                while True:
+                    reply = await queue.get()
+                    if message_type_of(reply) == reply_type:
+                        return reply
 
     def subscribe(self, topic, subscriber):
         """Add 'subscriber' on 'topic'."""
         self._getTopicQ(topic).add(subscriber.queue)
+        self.stats.subscribed(topic, subscriber.queue, subscriber.name)
 
     def unsubscribe(self, topic, subscriber):
         """Remove 'subscriber' from 'topic'."""
         self._getTopicQ(topic).remove(subscriber)
+        self.stats.unsubscribed(subscriber)
 
 
 class Subscription():
     """Context class for use in with -statement"""
 
-    def __init__(self, hub: Hub, topic: str):
+    def __init__(self, hub: Hub, topic: str, name: str | None = None):
+        """:name: subscriber name in hub stats"""
         self.hub = hub
         self.topic = topic
+        self.name = name
         self.queue: asyncio.Queue = asyncio.Queue()
 
     def __enter__(self):
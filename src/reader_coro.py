@@ -45,7 +45,8 @@ async def reader_coro(name: str,
     logger.info("Reader '%s' has decided to subscribe now!", name)
 
     msg = ""
-    with Subscription(hub=hub, topic=topic) as queue:
+    stats = hub.stats
+    with Subscription(hub=hub, topic=topic, name=name) as queue:
         # while msg not in [TOPICS.COMMON_MESSAGES.EXIT]:
         while not is_message_type(msg, TOPICS.COMMON_MESSAGES.EXIT):
             msg = await queue.get()
@@ -56,12 +57,14 @@ async def reader_coro(name: str,
                 # logger.info("%s call action on msg: '%s'", name, msg)
 
                 # distinguish between co-routine/normal function
+                start = stats.handling()
                 if asyncio.iscoroutinefunction(action):
                     logger.debug("async call: msg='%s'", msg)
                     goon = await action(msg, hub=hub)
                 else:
                     logger.debug("sync call: msg='%s'", msg)
                     goon = action(msg, hub=hub)
+                stats.handled(name, msg, start)
                 logger.info("name: %s - action on msg '%s' finished -> goon: %s",
                             name, msg, goon)
 
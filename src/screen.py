@@ -17,6 +17,7 @@ from .constants import (COROS, APP_CONTEXT, RPI, DSCREEN)
 from .config import app_config
 from .channel_manager import read_file
 from .jrr_converter import image_resize
+from .icon_atlas import atlas_tile
 # from .messages import MsgScreenUpdate
 
 # ------------------------------------------------------------------
@@ -359,6 +360,7 @@ class ScreenEntryImage(ScreenEntryImageBase):
     width: int | None = None                # resize width
     height: int | None = None
     volatile: bool = False                  # True not cached, may not exist
+    atlas_icon: str | None = None           # icon name in icon atlas (preferred)
 
     # ------------------------------------------------------------------
     # Cached image
@@ -398,6 +400,12 @@ class ScreenEntryImage(ScreenEntryImageBase):
             return self.imagepath[7:]  # Remove 'file://' prefix
         return self.imagepath
 
+    def _atlas_img(self) -> Image.Image | None:
+        """Tile for 'atlas_icon' in icon atlas (None if not found)."""
+        if self.atlas_icon is None:
+            return None
+        return atlas_tile(app_config.icon_directory, self.atlas_icon)
+
     @ property
     def img(self) -> Image.Image | None:
         """Cached image for 'imagepath'.
@@ -417,6 +425,10 @@ class ScreenEntryImage(ScreenEntryImageBase):
                 self._img = Image.new(
                     IMAGE_MODE,
                     size=self.size, color=COLOR_BACKGROUND)
+            elif (tile := self._atlas_img()) is not None:
+                # pre-resized raw pixels, no decoding
+                self._img = tile
+                self.maybe_resize()
             elif self.imagepath is not None:
 
                 try:
@@ -607,8 +619,9 @@ class Screen(ScreenRoot):
 
         """
 
-        # data buffer
+        # data buffer (indexed by name)
         self.screen_entries: List[ScreenEntry] = []
+        self._entry_index: Dict[str, ScreenEntry] = {}
 
         # size of display
         self.size = size
@@ -637,6 +650,11 @@ class Screen(ScreenRoot):
 
     # ------------------------------------------------------------------
     # Some helpers
+    def entry(self, name: str) -> ScreenEntry | None:
+        """Return screen entry 'name' in this screen (no recursion),
+        None if not found."""
+        return self._entry_index.get(name)
+
     def named_screen_entry(
             self, name: str,
             screen_entries: List[ScreenEntry] | None = None
@@ -650,31 +668,21 @@ class Screen(ScreenRoot):
 
         """
 
-        if screen_entries is None:
-            screen_entries = self.screen_entries
-
         attribute_path = name.split(sep=".", maxsplit=1)
         base_name = attribute_path[0]
 
-        g_existing_screen_entry = (
-            se for se in screen_entries if se.name == base_name)
-        try:
-            screen_entry: ScreenEntry | None = next(g_existing_screen_entry)
-
-            if len(attribute_path) == 1:
-                return screen_entry
+        if screen_entries is None:
+            screen_entry = self.entry(base_name)
+        else:
+            screen_entry = next(
+                (se for se in screen_entries if se.name == base_name), None)
 
-            # recursion
-            container_entry = cast(ScreenEntryContainer, screen_entry)
-            screen_entry = self.named_screen_entry(
-                name=attribute_path[1],
-                screen_entries=container_entry.screen.screen_entries)
+        if screen_entry is None or len(attribute_path) == 1:
             return screen_entry
 
-        except StopIteration:
-            return None
-
-        return screen_entry
+        # recursion
+        container_entry = cast(ScreenEntryContainer, screen_entry)
+        return container_entry.screen.named_screen_entry(name=attribute_path[1])
 
     # ------------------------------------------------------------------
     # Image cache to put on display
@@ -845,6 +853,7 @@ class Screen(ScreenRoot):
 
             # Put requested proprties on screen entry
             self.screen_entries.append(created_screen_entry)
+            self._entry_index[name] = created_screen_entry
             update_existing_entry(
                 existing_screen_entry=created_screen_entry,
                 entry_props=entry_props)
@@ -856,6 +865,7 @@ class Screen(ScreenRoot):
     def clear(self):
         """Clear content (='screen_entries') and 'invalidate_image_cache'."""
         self.screen_entries = []
+        self._entry_index = {}
         self.invalidate_image_cache()
 
     # ------------------------------------------------------------------
@@ -928,13 +938,7 @@ class ScreenEntryContainer(ScreenEntry):
 
         :return: None if not found
         """
-        g_screen_entry = (
-            se for se in self.screen.screen_entries if se.name == name)
-        try:
-            ret = next(g_screen_entry)
-        except StopIteration:
-            ret = None
-        return ret
+        return self.screen.entry(name)
 
     def __getattr__(self, name: str):
         try:
@@ -1052,6 +1056,12 @@ layout_base: Dict = {
          "text": "jrr-0.0.latest",
          }],
 
+    COROS.Screen.ENTRY_NOW_PLAYING: [
+        ScreenEntryInfo,
+        {"x": COL2, "y": ROW_CLOCK + LINE_SPACING, "text_len": 25,
+         "font_size": 14, "text": "",
+         }],
+
     # COROS.Screen.ENTRY_MSG_L2: [ScreenEntryInfo,
     #                             {"x": COL2, "y": ROW_INFO + LINE_SPACING, "text_len": 10, }],
 }
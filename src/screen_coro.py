@@ -17,19 +17,28 @@ from .utils import delegates
 
 
 from .constants import (TOPICS, COROS, APP_CONTEXT, DSCREEN)
-from .messages import (is_message_type, message_props, MsgScreenUpdate,
-                       MsgScreenIcon, MsgScreenText, MsgClockUpdate, MsgRoot,
+from .messages import (message_props, MsgScreenUpdate,
+                       MsgScreenIcon, MsgScreenText, MsgClockUpdate, MsgStatusUpdate, MsgRoot,
                        MsgDelay, MsgScreenButtons, MsgDScreen, MsgExit,
+                       MsgScreenNowPlaying,
                        message_create, message_halt_ack, message_panik,
                        )
 
 from .screen import Screen, overlay_names
+from .dispatch import Dispatcher
 
 
 # ------------------------------------------------------------------
 # Resolve display used
 from .tft_ili9486 import TFT_DRIVER
 
+
+
+def key_burst_window() -> float:
+    """Window (secs) to coalesce key presses to one screen update on
+    display driver used."""
+    return getattr(TFT_DRIVER, "KEY_BURST_WINDOW", APP_CONTEXT.KEYBOARD_BURST.EPAPER)
+
 # ------------------------------------------------------------------
 # Add driver to Screen
 
@@ -173,12 +182,12 @@ class ScreenDriver():
 logger = logging.getLogger(__name__)
 screen_driver: ScreenDriver | None = None
 
+# Handlers for messages in screen topic (see handlers below)
+screen_dispatch = Dispatcher("screen")
+
 # ------------------------------------------------------------------
 # Actions -method for receiving message from topic
 
-# pylint: disable=too-many-branches
-# pylint: disable=too-many-statements
-
 
 async def _screen_action(msg: Any, hub: Hub):
     """Async actions to work on receiving 'msg' from 'topic'."""
@@ -199,363 +208,451 @@ async def _screen_action(msg: Any, hub: Hub):
             driver=display_driver
         )
 
-    def _msg_to_overlay_props(
-            msg: MsgRoot,
-            keymapper: Callable[[str], str] = lambda k: f"{k}.text") -> Dict[str, str]:
-        """Map message fields (excluding message_type) to dict.
+    return await screen_dispatch.dispatch(msg, hub)
 
-        :keymapper: callable to map message key to dict keys.
-
-        """
+# ------------------------------------------------------------------
+# Message handlers (screen_dispatch)
 
-        overlay_props = {
-            keymapper(k): v
-            for k, v in asdict(msg).items() if k not in ["message_type"]
-        }
-        return overlay_props
 
-    goon = True
-    if is_message_type(msg, TOPICS.SCREEN_MESSAGES.INIT):
-        await screen_driver.init()
+def _msg_to_overlay_props(
+        msg: MsgRoot,
+        keymapper: Callable[[str], str] = lambda k: f"{k}.text") -> Dict[str, str]:
+    """Map message fields (excluding message_type) to dict.
 
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.CLEAR):
-        # clear 'screen' and data
-        await screen_driver.clear(keep_content=False)
+    :keymapper: callable to map message key to dict keys.
 
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.SLEEP):
-        logger.info("%s: sleep-msg='%s'", TOPICS.SCREEN_MESSAGES.SLEEP, msg)
-        # await screen_driver.clear(keep_content=True)
-        # await screen_driver.update(mode=MsgScreenUpdate.MODE_FULL)
-        # await asyncio.sleep(0.1)
-        await screen_driver.sleep()
+    """
 
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.WAKEUP):
-        # Refresh screen = awake
-        logger.info("%s: awake-msg='%s'", TOPICS.SCREEN_MESSAGES.WAKEUP, msg)
-        await screen_driver.wake_up()
+    overlay_props = {
+        keymapper(k): v
+        for k, v in asdict(msg).items() if k not in ["message_type"]
+    }
+    return overlay_props
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.INIT)
+async def _screen_init(msg: Any, hub: Hub) -> bool:
+    await screen_driver.init()
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.CLEAR)
+async def _screen_clear(msg: Any, hub: Hub) -> bool:
+    # clear 'screen' and data
+    await screen_driver.clear(keep_content=False)
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.SLEEP)
+async def _screen_sleep(msg: Any, hub: Hub) -> bool:
+    logger.info("%s: sleep-msg='%s'", TOPICS.SCREEN_MESSAGES.SLEEP, msg)
+    # await screen_driver.clear(keep_content=True)
+    # await screen_driver.update(mode=MsgScreenUpdate.MODE_FULL)
+    # await asyncio.sleep(0.1)
+    await screen_driver.sleep()
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.WAKEUP)
+async def _screen_wakeup(msg: Any, hub: Hub) -> bool:
+    # Refresh screen = awake
+    logger.info("%s: awake-msg='%s'", TOPICS.SCREEN_MESSAGES.WAKEUP, msg)
+    await screen_driver.wake_up()
+    await screen_driver.update(mode=MsgScreenUpdate.MODE_FULL)
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.CLOSE)
+async def _screen_close(msg: Any, hub: Hub) -> bool:
+    # full-clear && sleep
+    raise NotImplementedError
+    # await screen_driver.clear(keep_content=True)
+    # await asyncio.sleep(0.1)
+    # TODO: sleep needed or NOT
+    # await screen_driver.sleep()
+    # for _ in range(2):
+    #     # must clear twice to actually clear the display
+    #     await screen_driver.clear(keep_content=True)
+    #     await screen_driver.sleep()
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.UPDATE)
+async def _screen_update(msg: Any, hub: Hub) -> bool:
+    # msg.mode --> update display fully/partially
+    msg_show = cast(MsgScreenUpdate, msg)
+    logger.debug("%s: msg_show: %s, partial=%s",
+                 TOPICS.SCREEN_MESSAGES.UPDATE,
+                 msg_show,
+                 msg_show.mode
+                 )
+    await screen_driver.update(mode=msg_show.mode, name=msg_show.name)
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.BUTTON_TXT)
+async def _screen_button_txt(msg: Any, hub: Hub) -> bool:
+    msg_button = cast(MsgScreenButtons, msg)
+    logger.debug("%s-msg , msg='%s'",
+                 TOPICS.SCREEN_MESSAGES.BUTTON_TXT,
+                 msg_button,
+                 )
+    # add button labels (no update)
+    updated = False
+    updated |= await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_B1,
+        entry_props={"text": msg_button.label1},
+        mode=MsgScreenUpdate.MODE_NONE,
+    )
+    updated |= await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_B2,
+        entry_props={"text": msg_button.label2},
+        mode=MsgScreenUpdate.MODE_NONE,
+    )
+    logger.info("update-2: updated='%s'", updated)
+    updated |= await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_B3,
+        entry_props={"text": msg_button.label3},
+        mode=MsgScreenUpdate.MODE_NONE,
+    )
+    updated |= await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_B4,
+        entry_props={"text": msg_button.label4},
+        mode=MsgScreenUpdate.MODE_NONE,
+    )
+    # Icons infron of key labels
+    updated |= await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_ICON_KEY1,
+        entry_props={"imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH},
+        mode=MsgScreenUpdate.MODE_NONE,
+    )
+    updated |= await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_ICON_KEY2,
+        entry_props={"imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH},
+        mode=MsgScreenUpdate.MODE_NONE,
+    )
+    # after all buttons do full update
+    if updated:
+        logger.info("_screen_action: msg_button='%s' - updated",
+                    msg_button)
         await screen_driver.update(mode=MsgScreenUpdate.MODE_FULL)
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.SPRITE)
+async def _screen_sprite(msg: Any, hub: Hub) -> bool:
+    # find image sprite in a fixed path, take sprite status from
+    # message
+    props = {
+        "imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH
+    } | message_props(msg)
+    updated = await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_SPRITE_ICONS,
+        entry_props=props,
+        mode=MsgScreenUpdate.MODE_PARTIAL,
+    )
+    if updated:
+        logger.info("%s: msg='%s'", COROS.Screen.ENTRY_SPRITE_ICONS, msg)
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.MSG_INFO)
+async def _screen_msg_info(msg: Any, hub: Hub) -> bool:
+    msg_text = cast(MsgScreenText, msg)
+    logger.debug("%s-msg   name=%s, text='%s'",
+                 TOPICS.SCREEN_MESSAGES.MSG_INFO,
+                 msg_text.name,
+                 msg_text.text,
+                 )
+    # Put on screen && partial update
+    updated = await screen_driver.add_or_update(
+        name=msg_text.name,
+        entry_props={"text": msg_text.text},
+        mode=MsgScreenUpdate.MODE_PARTIAL,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.CLOCK)
+async def _screen_clock(msg: Any, hub: Hub) -> bool:
+    # Add/update current time on screen entry 'ENTRY_CLOCK'
+    msg_clock: MsgClockUpdate = cast(MsgClockUpdate, msg)
+    hh_mi = msg_clock.time or time.strftime("%H:%M:%S")
+    logger.debug("clock: hh_mi= %s", hh_mi)
+
+    # Allow clock message - but update only screen state if not awake
+    update_mode = MsgScreenUpdate.MODE_PARTIAL if screen_driver.awake else MsgScreenUpdate.MODE_NONE
+
+    # Time updated
+    updated = False
+    updated = await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_CLOCK,
+        entry_props={"text": hh_mi},
+        mode=update_mode,
+    )
+
+    # MSG_L1 = ""
+    updated |= await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_MSG_L1,
+        entry_props={
+            "text": ""
+        },
+        mode=update_mode,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.STATUS)
+async def _screen_status(msg: Any, hub: Hub) -> bool:
+    # Status sprites and version (sent on status change)
+    msg_status: MsgStatusUpdate = cast(MsgStatusUpdate, msg)
+
+    # update only screen state if not awake
+    update_mode = MsgScreenUpdate.MODE_PARTIAL if screen_driver.awake else MsgScreenUpdate.MODE_NONE
+
+    await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_VERSION,
+        entry_props={"text": msg_status.jrr_version},
+        mode=update_mode,
+    )
+
+    # Sprite icons
+    props = {
+        "imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH,
+        "network": msg_status.network_status,
+        "streaming": msg_status.streaming_status,
+        "keyboard": msg_status.keyboard_status,
+    }
+    await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_SPRITE_ICONS,
+        entry_props=props,
+        mode=update_mode,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.ERROR)
+async def _screen_error(msg: Any, hub: Hub) -> bool:
+    logger.debug("ERROR: msg='%s'", msg)
+
+    # Only one active from alternatives
+    screen_driver.xor_alternatives(
+        name=COROS.Screen.ENTRY_ERROR_OVL)
+
+    # _overlay_props = {
+    #     f"{k}.text": v
+    #     for k, v in asdict(msg).items() if k not in ["message_type"]
+    # }
+    _overlay_props = _msg_to_overlay_props(msg)
+
+    await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_ERROR_OVL,
+        entry_props=_overlay_props,
+        mode=MsgScreenUpdate.MODE_FULL,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.QUESTION)
+async def _screen_question(msg: Any, hub: Hub) -> bool:
+    logger.debug("QUESTION: msg='%s'", msg)
+
+    # Only one active from alternatives
+    screen_driver.xor_alternatives(
+        name=COROS.Screen.ENTRY_QUESTION_OVL)
+
+    def _key2prop(k) -> str:
+        """Icon field tells point to icon file to show."""
+        if k == TOPICS.QUESTION_MESSAGE.ICON:
+            return f"{k}.imagepath"
+        return f"{k}.text"
+
+    _overlay_props = _msg_to_overlay_props(msg, keymapper=_key2prop)
+
+    await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_QUESTION_OVL,
+        entry_props=_overlay_props,
+        mode=MsgScreenUpdate.MODE_FULL,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.FIRMAWRE)
+async def _screen_firmawre(msg: Any, hub: Hub) -> bool:
+    logger.debug("firmware: msg='%s'", msg)
+
+    # Only one active from alternatives
+    screen_driver.xor_alternatives(
+        name=COROS.Screen.ENTRY_FIRMWARE2_OVL)
+
+    _overlay_props = _msg_to_overlay_props(msg)
+
+    await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_FIRMWARE2_OVL,
+        entry_props=_overlay_props,
+        mode=MsgScreenUpdate.MODE_FULL,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.NOW_PLAYING)
+async def _screen_now_playing(msg: Any, hub: Hub) -> bool:
+    # Stream title: sender publishes only changes
+    msg_now_playing = cast(MsgScreenNowPlaying, msg)
+    logger.debug("%s: title='%s'",
+                 TOPICS.SCREEN_MESSAGES.NOW_PLAYING, msg_now_playing.title)
+    update_mode = MsgScreenUpdate.MODE_PARTIAL if screen_driver.awake else MsgScreenUpdate.MODE_NONE
+    await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_NOW_PLAYING,
+        entry_props={"text": msg_now_playing.title},
+        mode=update_mode,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.NETWORK_INFO)
+async def _screen_network_info(msg: Any, hub: Hub) -> bool:
+    logger.debug("NETWORK_INFO: msg='%s'", msg)
+
+    # Only one active from alternatives
+    screen_name = COROS.Screen.ENTRY_NETWORK_INFO_OVL
+    screen_driver.xor_alternatives(
+        name=screen_name)
+
+    _overlay_props = _msg_to_overlay_props(msg)
+
+    await screen_driver.add_or_update(
+        name=screen_name,
+        entry_props=_overlay_props,
+        mode=MsgScreenUpdate.MODE_FULL,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.CONFIG_TITLE)
+async def _screen_config_title(msg: Any, hub: Hub) -> bool:
+    # Show 'msg.text' on screen entry 'msg.name'
+    logger.debug("CONFIG_MENU: msg='%s'", msg)
+
+    # Only one active from alternatives
+    screen_driver.xor_alternatives(
+        name=COROS.Screen.ENTRY_CONFIG_TITLE)
+
+    def _key2prop(k) -> str:
+        """Icon field tells point to icon file to show."""
+        if k == TOPICS.CONFIG_TITLE_MESSAGE.ICON:
+            return f"{k}.imagepath"
+        return f"{k}.text"
+
+    # 'msg_field'.text
+    _overlay_props = _msg_to_overlay_props(msg, keymapper=_key2prop)
+    logger.debug("CONFIG_TITLE: _overlay_props='%s'", _overlay_props)
+
+    await screen_driver.add_or_update(
+        name=COROS.Screen.ENTRY_CONFIG_TITLE,
+        entry_props=_overlay_props,
+        mode=MsgScreenUpdate.MODE_FULL,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.DSCREEN)
+async def _screen_dscreen(msg: Any, hub: Hub) -> bool:
+    # Show 'msg.text' on screen entry 'msg.name'
+    logger.debug("SCREEN_MESSAGES.DSCREEN: msg='%s'", msg)
+    msg_dscreen = cast(MsgDScreen, msg)
+
+    # Notice: not all message fields, delta message only changed
+    # fields (touching only their text entries)
+    _overlay_props = {
+        f"{kv.key}.text": kv.val
+        for kv in msg_dscreen.fields
+    }
+
+    # Only one active from alternatives
+    screen_driver.xor_alternatives(
+        name=msg_dscreen.screen_name)
+
+    await screen_driver.add_or_update(
+        name=msg_dscreen.screen_name,
+        entry_props=_overlay_props,
+        mode=MsgScreenUpdate.MODE_FULL if msg_dscreen.full else MsgScreenUpdate.MODE_PARTIAL,
+    )
+    return True
+
+
+@screen_dispatch.on(TOPICS.SCREEN_MESSAGES.STREAM_ICON)
+async def _screen_stream_icon(msg: Any, hub: Hub) -> bool:
+    # Put stream icon to screen
+    msg_icon = cast(MsgScreenIcon, msg)
+    if len(msg_icon.icon) == 0:
+        # TODO: disable screen here (may not needed?)
+        screen_driver.screen.activate_entry(
+            name=COROS.Screen.ENTRY_STREAM_ICON, active=False)
+
+        # screen_driver.remove_entry(
+        #     name=COROS.Screen.ENTRY_STREAM_ICON,
+        # )
+        # await screen_driver.update(mode=MsgScreenUpdate.MODE_FULL)
 
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.CLOSE):
-        # full-clear && sleep
-        raise NotImplementedError
-        # await screen_driver.clear(keep_content=True)
-        # await asyncio.sleep(0.1)
-        # TODO: sleep needed or NOT
-        # await screen_driver.sleep()
-        # for _ in range(2):
-        #     # must clear twice to actually clear the display
-        #     await screen_driver.clear(keep_content=True)
-        #     await screen_driver.sleep()
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.UPDATE):
-        # msg.mode --> update display fully/partially
-        msg_show = cast(MsgScreenUpdate, msg)
-        logger.debug("%s: msg_show: %s, partial=%s",
-                     TOPICS.SCREEN_MESSAGES.UPDATE,
-                     msg_show,
-                     msg_show.mode
-                     )
-        await screen_driver.update(mode=msg_show.mode, name=msg_show.name)
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.BUTTON_TXT):
-
-        msg_button = cast(MsgScreenButtons, msg)
-        logger.debug("%s-msg , msg='%s'",
-                     TOPICS.SCREEN_MESSAGES.BUTTON_TXT,
-                     msg_button,
-                     )
-        # add button labels (no update)
-        updated = False
-        updated |= await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_B1,
-            entry_props={"text": msg_button.label1},
-            mode=MsgScreenUpdate.MODE_NONE,
-        )
-        updated |= await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_B2,
-            entry_props={"text": msg_button.label2},
-            mode=MsgScreenUpdate.MODE_NONE,
-        )
-        logger.info("update-2: updated='%s'", updated)
-        updated |= await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_B3,
-            entry_props={"text": msg_button.label3},
-            mode=MsgScreenUpdate.MODE_NONE,
-        )
-        updated |= await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_B4,
-            entry_props={"text": msg_button.label4},
-            mode=MsgScreenUpdate.MODE_NONE,
-        )
-        # Icons infron of key labels
-        updated |= await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_ICON_KEY1,
-            entry_props={"imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH},
-            mode=MsgScreenUpdate.MODE_NONE,
-        )
-        updated |= await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_ICON_KEY2,
-            entry_props={"imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH},
-            mode=MsgScreenUpdate.MODE_NONE,
-        )
-        # after all buttons do full update
-        if updated:
-            logger.info("_screen_action: msg_button='%s' - updated",
-                        msg_button)
-            await screen_driver.update(mode=MsgScreenUpdate.MODE_FULL)
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.SPRITE):
-
-        # find image sprite in a fixed path, take sprite status from
-        # message
-        props = {
-            "imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH
-        } | message_props(msg)
-        updated = await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_SPRITE_ICONS,
-            entry_props=props,
-            mode=MsgScreenUpdate.MODE_PARTIAL,
-        )
-        if updated:
-            logger.info("%s: msg='%s'", COROS.Screen.ENTRY_SPRITE_ICONS, msg)
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.MSG_INFO):
-
-        msg_text = cast(MsgScreenText, msg)
-        logger.debug("%s-msg   name=%s, text='%s'",
-                     TOPICS.SCREEN_MESSAGES.MSG_INFO,
-                     msg_text.name,
-                     msg_text.text,
-                     )
-        # Put on screen && partial update
-        updated = await screen_driver.add_or_update(
-            name=msg_text.name,
-            entry_props={"text": msg_text.text},
-            mode=MsgScreenUpdate.MODE_PARTIAL,
-        )
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.CLOCK):
-        # Add/update current time on screen entry 'ENTRY_CLOCK'
-        msg_clock: MsgClockUpdate = cast(MsgClockUpdate, msg)
-        hh_mi = time.strftime("%H:%M:%S")
-        logger.debug("clock: hh_mi= %s", hh_mi)
-
-        # Allow clock message - but update only screen state if not awake
-        update_mode = MsgScreenUpdate.MODE_PARTIAL if screen_driver.awake else MsgScreenUpdate.MODE_NONE
-
-        # Time updated
-        updated = False
-        updated = await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_CLOCK,
-            entry_props={"text": hh_mi},
-            mode=update_mode,
-        )
-
-        await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_VERSION,
-            entry_props={"text": msg_clock.jrr_version},
-            mode=update_mode,
-        )
-
-        # Sprite icons
-        props = {
-            "imagepath": APP_CONTEXT.ICON_SPRITE_FILE_PATH,
-            "network": msg_clock.network_status,
-            "streaming": msg_clock.streaming_status,
-            "keyboard": msg_clock.keyboard_status,
-        }
-        updated = await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_SPRITE_ICONS,
-            entry_props=props,
-            mode=update_mode,
-        )
-
-        # MSG_L1 = ""
-        updated |= await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_MSG_L1,
-            entry_props={
-                "text": ""
-            },
-            mode=update_mode,
-        )
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.ERROR):
-        logger.debug("ERROR: msg='%s'", msg)
-
-        # Only one active from alternatives
-        screen_driver.xor_alternatives(
-            name=COROS.Screen.ENTRY_ERROR_OVL)
-
-        # _overlay_props = {
-        #     f"{k}.text": v
-        #     for k, v in asdict(msg).items() if k not in ["message_type"]
-        # }
-        _overlay_props = _msg_to_overlay_props(msg)
-
-        await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_ERROR_OVL,
-            entry_props=_overlay_props,
-            mode=MsgScreenUpdate.MODE_FULL,
-        )
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.QUESTION):
-        logger.debug("QUESTION: msg='%s'", msg)
-
-        # Only one active from alternatives
-        screen_driver.xor_alternatives(
-            name=COROS.Screen.ENTRY_QUESTION_OVL)
-
-        def _key2prop(k) -> str:
-            """Icon field tells point to icon file to show."""
-            if k == TOPICS.QUESTION_MESSAGE.ICON:
-                return f"{k}.imagepath"
-            return f"{k}.text"
-
-        _overlay_props = _msg_to_overlay_props(msg, keymapper=_key2prop)
-
-        await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_QUESTION_OVL,
-            entry_props=_overlay_props,
-            mode=MsgScreenUpdate.MODE_FULL,
-        )
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.FIRMAWRE):
-        logger.debug("firmware: msg='%s'", msg)
-
-        # Only one active from alternatives
-        screen_driver.xor_alternatives(
-            name=COROS.Screen.ENTRY_FIRMWARE2_OVL)
-
-        _overlay_props = _msg_to_overlay_props(msg)
-
-        await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_FIRMWARE2_OVL,
-            entry_props=_overlay_props,
-            mode=MsgScreenUpdate.MODE_FULL,
-        )
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.NETWORK_INFO):
-        logger.debug("NETWORK_INFO: msg='%s'", msg)
-
-        # Only one active from alternatives
-        screen_name = COROS.Screen.ENTRY_NETWORK_INFO_OVL
+    else:
+        # add or update screen
         screen_driver.xor_alternatives(
-            name=screen_name)
+            name=COROS.Screen.ENTRY_STREAM_ICON)
 
-        _overlay_props = _msg_to_overlay_props(msg)
+        imagepath = os.path.join(app_config.icon_directory, msg_icon.icon)
+        logger.debug("%s:  icon: %s, imagepath=%s",
+                     TOPICS.SCREEN_MESSAGES.STREAM_ICON,
+                     msg_icon.icon,
+                     imagepath,
+                     )
 
+        # Adds: ScreenEntryImage, default
         await screen_driver.add_or_update(
-            name=screen_name,
-            entry_props=_overlay_props,
-            mode=MsgScreenUpdate.MODE_FULL,
+            name=COROS.Screen.ENTRY_STREAM_ICON,
+            entry_props={"imagepath": imagepath,
+                         "atlas_icon": msg_icon.icon},
+            mode=MsgScreenUpdate.MODE_PARTIAL,
         )
+    return True
 
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.CONFIG_TITLE):
-        # Show 'msg.text' on screen entry 'msg.name'
-        logger.debug("CONFIG_MENU: msg='%s'", msg)
 
-        # Only one active from alternatives
-        screen_driver.xor_alternatives(
-            name=COROS.Screen.ENTRY_CONFIG_TITLE)
+@screen_dispatch.on(TOPICS.COMMON_MESSAGES.CLOCK_TICK)
+async def _screen_clock_tick(msg: Any, hub: Hub) -> bool:
+    raise NotImplementedError(
+        f"message {TOPICS.COMMON_MESSAGES.CLOCK_TICK}", )
 
-        def _key2prop(k) -> str:
-            """Icon field tells point to icon file to show."""
-            if k == TOPICS.CONFIG_TITLE_MESSAGE.ICON:
-                return f"{k}.imagepath"
-            return f"{k}.text"
 
-        # 'msg_field'.text
-        _overlay_props = _msg_to_overlay_props(msg, keymapper=_key2prop)
-        logger.debug("CONFIG_TITLE: _overlay_props='%s'", _overlay_props)
+@screen_dispatch.on(TOPICS.COMMON_MESSAGES.EXIT)
+async def _screen_exit(msg: Any, hub: Hub) -> bool:
+    msg_exit = cast(MsgExit, msg)
+    await screen_driver.full_close()
+    # Allow all other coros to EXIT
+    await asyncio.sleep(0.5)
+    hub.publish(TOPICS.CONTROL,
+                message_halt_ack(source=msg_exit.source))
+    # exit
+    return False
 
-        await screen_driver.add_or_update(
-            name=COROS.Screen.ENTRY_CONFIG_TITLE,
-            entry_props=_overlay_props,
-            mode=MsgScreenUpdate.MODE_FULL,
-        )
 
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.DSCREEN):
-        # Show 'msg.text' on screen entry 'msg.name'
-        logger.debug("SCREEN_MESSAGES.DSCREEN: msg='%s'", msg)
-        msg_dscreen = cast(MsgDScreen, msg)
+@screen_dispatch.on(TOPICS.COMMON_MESSAGES.PING)
+async def _screen_ping(msg: Any, hub: Hub) -> bool:
+    # # Application init - reply PING to CONTROL topic
+    # await screen.update(mode=MsgScreenUpdate.MODE_FULL)
 
-        # Notice: not all message fields
-        _overlay_props = {
-            f"{kv.key}.text": kv.val
-            for kv in msg_dscreen.fields
-        }
+    # Application init - reply PING to CONTROL topic (assume that
+    # screen content all there)
+    hub.publish(
+        topic=TOPICS.CONTROL,
+        message=message_create(message_type=TOPICS.COMMON_MESSAGES.PING)
+    )
+    return True
 
-        # Only one active from alternatives
-        screen_driver.xor_alternatives(
-            name=msg_dscreen.screen_name)
 
-        await screen_driver.add_or_update(
-            name=msg_dscreen.screen_name,
-            entry_props=_overlay_props,
-            mode=MsgScreenUpdate.MODE_FULL,
-        )
-
-    elif is_message_type(msg, TOPICS.SCREEN_MESSAGES.STREAM_ICON):
-        # Put stream icon to screen
-        msg_icon = cast(MsgScreenIcon, msg)
-        if len(msg_icon.icon) == 0:
-            # TODO: disable screen here (may not needed?)
-            screen_driver.screen.activate_entry(
-                name=COROS.Screen.ENTRY_STREAM_ICON, active=False)
-
-            # screen_driver.remove_entry(
-            #     name=COROS.Screen.ENTRY_STREAM_ICON,
-            # )
-            # await screen_driver.update(mode=MsgScreenUpdate.MODE_FULL)
-
-        else:
-            # add or update screen
-            screen_driver.xor_alternatives(
-                name=COROS.Screen.ENTRY_STREAM_ICON)
-
-            imagepath = os.path.join(app_config.icon_directory, msg_icon.icon)
-            logger.debug("%s:  icon: %s, imagepath=%s",
-                         TOPICS.SCREEN_MESSAGES.STREAM_ICON,
-                         msg_icon.icon,
-                         imagepath,
-                         )
-
-            # Adds: ScreenEntryImage, default
-            await screen_driver.add_or_update(
-                name=COROS.Screen.ENTRY_STREAM_ICON,
-                entry_props={"imagepath": imagepath},
-                mode=MsgScreenUpdate.MODE_PARTIAL,
-            )
-
-    elif is_message_type(msg, TOPICS.COMMON_MESSAGES.CLOCK_TICK):
-        raise NotImplementedError(
-            f"message {TOPICS.COMMON_MESSAGES.CLOCK_TICK}", )
-
-    elif is_message_type(msg, TOPICS.COMMON_MESSAGES.EXIT):
-        msg_exit = cast(MsgExit, msg)
-        await screen_driver.full_close()
-        # Allow all other coros to EXIT
-        await asyncio.sleep(0.5)
-        hub.publish(TOPICS.CONTROL,
-                    message_halt_ack(source=msg_exit.source))
-        # exit
-        goon = False
-
-    elif is_message_type(msg, TOPICS.COMMON_MESSAGES.PING):
-        # # Application init - reply PING to CONTROL topic
-        # await screen.update(mode=MsgScreenUpdate.MODE_FULL)
-
-        # Application init - reply PING to CONTROL topic (assume that
-        # screen content all there)
-        hub.publish(
-            topic=TOPICS.CONTROL,
-            message=message_create(message_type=TOPICS.COMMON_MESSAGES.PING)
-        )
-
-    else:
-        logging.warning("_screen_action: unknown msg: %s", msg)
+@screen_dispatch.otherwise
+async def _screen_unknown(msg: Any, hub: Hub) -> bool:
+    logging.warning("_screen_action: unknown msg: %s", msg)
+    return True
 
-    return goon
 
 # ------------------------------------------------------------------
 # Plumb _screen_action with framework
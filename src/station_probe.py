@@ -0,0 +1,222 @@
+"""Probe radio stations for liveness and responsiveness.
+
+Opens station url, reads ICY response headers and the first few
+kilobytes of the stream. Measures connect time, time-to-first-byte
+and advertised bitrate. Results are cached for
+'APP_CONTEXT.STATION_PROBE.CACHE_TTL' seconds so that menus can mark
+dead stations without touching the network.
+
+Usage:
+
+- 'probe_stations' probes a list of urls concurrently (bounded by
+  'APP_CONTEXT.STATION_PROBE.CONCURRENCY')
+
+- 'probe_cached' returns cached result (or None) for an url
+
+- 'rank_stations' orders probe results: alive first, then by time to
+  first byte
+
+"""
+
+from typing import Dict, List, Iterable
+from dataclasses import dataclass
+import asyncio
+import time
+
+import logging
+
+from .constants import APP_CONTEXT
+from .icy import icy_open, bitrate
+from .helpers import background_task
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Data classes
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing one station url."""
+    url: str                          # station url probed
+    alive: bool                       # got audio bytes from station
+    connect_time: float | None = None  # secs to open TCP(/TLS) connection
+    ttfb: float | None = None         # secs to first body byte
+    bitrate: int | None = None        # 'icy-br' header (kbit/s)
+    status: int | None = None         # http status code
+    content_type: str | None = None   # 'content-type' header
+    icy_name: str | None = None       # 'icy-name' header
+    error: str | None = None          # failure reason
+    probed_at: float = 0.0            # time.monotonic() of probe
+
+
+# ------------------------------------------------------------------
+# Module state
+
+# Map url -> ProbeResult
+_probe_cache: Dict[str, ProbeResult] = {}
+
+
+def probe_cache_clear():
+    """Forget all cached probe results."""
+    _probe_cache.clear()
+
+
+def probe_cached(url: str, ttl: float | None = None) -> ProbeResult | None:
+    """Return cached 'ProbeResult' for 'url' or None if not probed or
+    probe result older than 'ttl' seconds.
+
+    :ttl: defaults to 'APP_CONTEXT.STATION_PROBE.CACHE_TTL'
+
+    """
+    if ttl is None:
+        ttl = APP_CONTEXT.STATION_PROBE.CACHE_TTL
+    result = _probe_cache.get(url)
+    if result is None:
+        return None
+    if time.monotonic() - result.probed_at > ttl:
+        return None
+    return result
+
+
+def is_station_dead(url: str) -> bool:
+    """True if cached probe says 'url' is not alive.
+
+    Unknown (=not probed or expired) stations are not dead.
+    """
+    result = probe_cached(url)
+    return result is not None and not result.alive
+
+
+# ------------------------------------------------------------------
+# Probing
+
+
+async def _probe_once(url: str, read_bytes: int) -> ProbeResult:
+    """Open 'url', read headers and 'read_bytes' of body."""
+    start = time.monotonic()
+    response = await icy_open(url)
+    try:
+        result = ProbeResult(
+            url=url,
+            alive=False,
+            connect_time=response.connect_time,
+            status=response.status,
+            bitrate=bitrate(response.headers),
+            content_type=response.headers.get("content-type"),
+            icy_name=response.headers.get("icy-name"),
+        )
+        if response.status != 200:
+            result.error = f"HTTP status {response.status}"
+            return result
+
+        # Time to first byte of stream content
+        first = await response.reader.read(1)
+        if len(first) == 0:
+            result.error = "No content"
+            return result
+        result.ttfb = time.monotonic() - start
+
+        # ... and some more to make sure stream flows
+        body = first
+        while len(body) < read_bytes:
+            chunk = await response.reader.read(read_bytes - len(body))
+            if len(chunk) == 0:
+                break
+            body += chunk
+        result.alive = True
+        return result
+    finally:
+        await response.close()
+
+
+async def probe_station(
+        url: str,
+        timeout: float | None = None,
+        read_bytes: int | None = None,
+) -> ProbeResult:
+    """Probe one station 'url' and cache the result.
+
+    Never raises: failures are reported in 'ProbeResult.error'.
+
+    :timeout: total timeout for probe (connect + read)
+
+    :read_bytes: how many bytes of stream content to read
+
+    """
+    if timeout is None:
+        timeout = APP_CONTEXT.STATION_PROBE.TIMEOUT
+    if read_bytes is None:
+        read_bytes = APP_CONTEXT.STATION_PROBE.READ_BYTES
+
+    try:
+        result = await asyncio.wait_for(
+            _probe_once(url, read_bytes=read_bytes), timeout=timeout)
+    except asyncio.TimeoutError:
+        result = ProbeResult(url=url, alive=False, error="Timeout")
+    except (OSError, asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError, ValueError) as e:
+        result = ProbeResult(url=url, alive=False, error=f"{e}")
+
+    # cache under the url asked (even if redirected)
+    result.url = url
+    result.probed_at = time.monotonic()
+    _probe_cache[url] = result
+    logger.info("probe_station: result='%s'", result)
+    return result
+
+
+async def probe_stations(
+        urls: Iterable[str],
+        concurrency: int | None = None,
+        timeout: float | None = None,
+        use_cache: bool = True,
+) -> List[ProbeResult]:
+    """Probe 'urls' concurrently, at most 'concurrency' at a time.
+
+    :use_cache: return fresh cached results without probing
+
+    :return: probe results in the order of 'urls'
+
+    """
+    if concurrency is None:
+        concurrency = APP_CONTEXT.STATION_PROBE.CONCURRENCY
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(url: str) -> ProbeResult:
+        if use_cache:
+            cached = probe_cached(url)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            return await probe_station(url, timeout=timeout)
+
+    return list(await asyncio.gather(*[_bounded(url) for url in urls]))
+
+
+def rank_stations(results: Iterable[ProbeResult]) -> List[ProbeResult]:
+    """Order 'results': alive stations first, fastest first byte
+    first, dead stations last.
+
+    """
+    def _key(result: ProbeResult):
+        ttfb = result.ttfb if result.ttfb is not None else float("inf")
+        return (not result.alive, ttfb)
+    return sorted(results, key=_key)
+
+
+def probe_in_background(urls: Iterable[str]) -> asyncio.Task | None:
+    """Schedule 'probe_stations' for 'urls' in running event loop.
+
+    Used from (synchronous) controller actions: results land in cache
+    and are visible next time menus are built.
+
+    :return: task created, None if no running loop
+
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("probe_in_background: no running loop")
+        return None
+    return background_task(probe_stations(list(urls)), name="probe")
@@ -1,6 +1,6 @@
 """Manage ffmpeg streamer."""
 
-from typing import cast, Tuple
+from typing import Callable, cast, Tuple
 import asyncio
 import logging
 import os
@@ -9,8 +9,11 @@ import signal
 
 from .constants import (TOPICS, APP_CONTEXT)
 from .publish_subsrcibe import Hub, Subscription
-from .messages import (MsgStreamerStart, is_message_type, message_create)
+from .messages import (MsgStreamerStart, message_now_playing,
+                       message_streamer_status_reply)
+from .dispatch import Dispatcher
 from .helpers import cancel_and_wait
+from .icy import icy_open, IcyResponse, IcyMetadataParser
 
 # ------------------------------------------------------------------
 # Module state
@@ -20,9 +23,22 @@ logger = logging.getLogger(__name__)
 # Stremer task managing os-process 'streamer_proc'
 runner_task: asyncio.Task | None = None
 
+# Done callback on 'runner_task' publishing status when streamer dies
+# by itself (removed before stopping the task)
+runner_done: Callable[[asyncio.Task], None] | None = None
+
 # Os-process streaming audio - running within 'runner_task'
 streamer_proc: asyncio.subprocess.Process | None = None
 
+# Last stream title published (de-duplicate NOW_PLAYING messages)
+now_playing_title: str = ""
+
+# Last running status published (edge-triggered STREAMER_STATUS_REPLY)
+streamer_status_published: bool | None = None
+
+# Urls without in-band metadata: passed to streamer without 'icy_open'
+no_metaint_urls: set[str] = set()
+
 # ------------------------------------------------------------------
 # Module actions managing asyncio task and os-process
 
@@ -43,6 +59,12 @@ async def _streamer_stop(name: str):
     logger.debug("_streamer_stop starting")
     global streamer_proc
 
+    # stopped on purpose: no 'not running' status from dying task
+    global runner_task, runner_done
+    if runner_task is not None and runner_done is not None:
+        runner_task.remove_done_callback(runner_done)
+    runner_done = None
+
     if streamer_proc is not None:
         logger.info(
             "Stopping streamer streamer proc %s (and its childs)", streamer_proc)
@@ -80,7 +102,6 @@ async def _streamer_stop(name: str):
         #     "Returned await runner_proc.communicate: %s", streamer_proc)
 
     # Cancel runner task (this may be gone already -> try)
-    global runner_task
     try:
         if runner_task is not None:
             logger.info(
@@ -97,27 +118,21 @@ async def _streamer_stop(name: str):
         runner_task = None
 
 
-async def _streamer_run(url: str):
-    """
-    Start sub-process and wait for its returns.
+def _publish_now_playing(hub: Hub, title: str):
+    """Publish 'title' to screen if changed since last publish."""
+    global now_playing_title
+    if title == now_playing_title:
+        return
+    now_playing_title = title
+    logger.info("_publish_now_playing: title='%s'", title)
+    hub.publish(topic=TOPICS.SCREEN, message=message_now_playing(title))
 
-    Details
-    ----
-    Ref: https://superfastpython.com/asyncio-subprocess/#Create_Process_with_create_subprocess_shell
 
-    Launches shell script 'APP_CONTEXT.STREAMER_SCRIPT'
-
-    Updates globals 'runner_task' and 'runner_proc'.
+async def _streamer_proc_start(url: str, stdin=None) -> asyncio.subprocess.Process:
+    """Launch 'APP_CONTEXT.STREAMER_SCRIPT' playing 'url'.
 
-    Parameters
-    ----
-    :url: to stream
-
-    Return
-    -----
+    Updates global 'streamer_proc'.
     """
-
-
     global streamer_proc
     params = [
         APP_CONTEXT.STREAMER_SCRIPT,
@@ -131,30 +146,127 @@ async def _streamer_run(url: str):
     logger.info("create_subprocess: param='%s'", ' '.join([ str(p) for p in params]))
     streamer_proc = await asyncio.create_subprocess_exec(
         *params,
+        stdin=stdin,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         # https://stackoverflow.com/questions/32222681/how-to-kill-a-process-group-using-python-subprocess
         preexec_fn=os.setsid
     )
-    # streamer_proc = await asyncio.create_subprocess_exec(
-    #     APP_CONTEXT.STREAMER_SCRIPT,
-    #     "--mono",
-    #     "--file", url,
-    #     "--gain", "1",
-    #     cmd,
-    #     stdout=asyncio.subprocess.PIPE,
-    #     stderr=asyncio.subprocess.PIPE,
-    #     # https://stackoverflow.com/questions/32222681/how-to-kill-a-process-group-using-python-subprocess
-    #     preexec_fn=os.setsid
-    # )
+    return streamer_proc
+
+
+async def _streamer_pump(
+        hub: Hub,
+        response: IcyResponse,
+        proc: asyncio.subprocess.Process):
+    """Copy audio from 'response' to 'proc' stdin, publish stream
+    title changes from in-band metadata.
+
+    Returns when stream ends, stalls for 'APP_CONTEXT.ICY.READ_TIMEOUT'
+    or 'proc' stops reading.
+    """
+    parser = IcyMetadataParser(response.metaint)
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(
+                    response.reader.read(APP_CONTEXT.ICY.READ_CHUNK),
+                    timeout=APP_CONTEXT.ICY.READ_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("_streamer_pump: url='%s', no data in %ss",
+                               response.url, APP_CONTEXT.ICY.READ_TIMEOUT)
+                break
+            if len(chunk) == 0:
+                logger.info("_streamer_pump: end of stream url='%s'", response.url)
+                break
+            audio, metadata = parser.feed(chunk)
+            for meta in metadata:
+                if "StreamTitle" in meta:
+                    _publish_now_playing(hub, meta["StreamTitle"])
+            proc.stdin.write(audio)
+            await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError) as e:
+        logger.warning("_streamer_pump: url='%s', error '%s'", response.url, e)
+    finally:
+        await response.close()
+        if not proc.stdin.is_closing():
+            proc.stdin.close()
+
+
+async def _streamer_run(url: str, hub: Hub):
+    """
+    Start sub-process and wait for its returns.
+
+    Details
+    ----
+    Ref: https://superfastpython.com/asyncio-subprocess/#Create_Process_with_create_subprocess_shell
+
+    Launches shell script 'APP_CONTEXT.STREAMER_SCRIPT'
+
+    For http(s) streams announcing 'icy-metaint' python reads the
+    stream (requesting in-band metadata) and pipes audio to
+    streamer. Stream title changes are published to
+    TOPICS.SCREEN. Other streams, and streams not answering within
+    'APP_CONTEXT.ICY.READ_TIMEOUT', are passed to streamer as 'url'
+    (remembered in 'no_metaint_urls', not probed again).
+
+    Updates globals 'runner_task' and 'runner_proc'.
+
+    Parameters
+    ----
+    :url: to stream
+
+    :hub: for publishing now playing messages
+
+    Return
+    -----
+    """
+
+    response = None
+    try:
+        if url not in no_metaint_urls:
+            response = await asyncio.wait_for(
+                icy_open(url), timeout=APP_CONTEXT.ICY.READ_TIMEOUT)
+            if response.status != 200 or response.metaint is None:
+                logger.info("_streamer_run: no in-band metadata status=%s, url='%s'",
+                            response.status, url)
+                no_metaint_urls.add(url)
+                await response.close()
+                response = None
+    except TimeoutError:
+        # no response headers: let streamer try (and not probe again)
+        logger.info("_streamer_run: url='%s', icy_open timeout %ss", url,
+                    APP_CONTEXT.ICY.READ_TIMEOUT)
+        no_metaint_urls.add(url)
+        response = None
+    except ValueError as e:
+        # not icy/http response
+        logger.info("_streamer_run: url='%s', icy_open error '%s'", url, e)
+        no_metaint_urls.add(url)
+        response = None
+    except (OSError, asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError) as e:
+        logger.info("_streamer_run: url='%s', icy_open error '%s'", url, e)
+        response = None
+
+    if response is None:
+        proc = await _streamer_proc_start(url)
+    else:
+        proc = await _streamer_proc_start(
+            APP_CONTEXT.ICY.PIPE_INPUT, stdin=asyncio.subprocess.PIPE)
+        try:
+            await _streamer_pump(hub, response=response, proc=proc)
+        finally:
+            _publish_now_playing(hub, "")
+
     logger.info(
-        "_streamer_runner: call 'await streamer_proc.wait', streamer_proc: %s", streamer_proc)
-    await streamer_proc.wait()
+        "_streamer_runner: call 'await streamer_proc.wait', streamer_proc: %s", proc)
+    await proc.wait()
     # stdout, stderr = await runner_proc.communicate()
     # logger.info("_streamer_runner  communicate return runner_proc: %s  %s %s",
     #             runner_proc, stdout, stderr)
     # await runner_proc.wait()
-    istat = streamer_proc.returncode
+    istat = proc.returncode
     logger.info(
         "_streamer_runner:  url: %s, streamer_proc.returncode: %s", url, istat)
     return istat
@@ -181,9 +293,93 @@ def is_streaming(name: str) -> Tuple[str, bool]:
     return status_string, running
 
 
+def _publish_streamer_status(hub: Hub, name: str):
+    """Publish streamer status to TOPICS.CONTROL if changed since last
+    publish."""
+    global streamer_status_published
+    status_string, running = is_streaming(name=name)
+    if running == streamer_status_published:
+        return
+    streamer_status_published = running
+    logger.info("_publish_streamer_status: running=%s", running)
+    hub.publish(topic=TOPICS.CONTROL, message=message_streamer_status_reply(
+        status_str=status_string, running=running))
+
+
+# ------------------------------------------------------------------
+# Message handlers: return False to exit 'streamer_coro'
+
+streamer_dispatch = Dispatcher("streamer")
+
+
+@streamer_dispatch.on(TOPICS.STREAMER_MESSAGES.START)
+async def _streamer_msg_start(msg, hub: Hub, name: str) -> bool:
+    # Maybe stop previous stream
+    _, running = is_streaming(name=name)
+    await _streamer_stop(name=name)
+
+    if running:
+        # short sleep befero starting new stream
+        await asyncio.sleep(2)
+
+    # START - streaming
+    global runner_task, runner_done
+    msg_start = cast(MsgStreamerStart, msg)
+    logger.info(
+        "streamer_coro: start streaming from url '%s'", msg_start.url)
+    runner_task = asyncio.create_task(
+        _streamer_run(url=msg_start.url, hub=hub))
+
+    def _runner_done(task: asyncio.Task):
+        # streamer died by itself (not stopped/replaced)
+        _publish_streamer_status(hub, name=name)
+    runner_done = _runner_done
+    runner_task.add_done_callback(runner_done)
+    _publish_streamer_status(hub, name=name)
+    return True
+
+
+@streamer_dispatch.on(TOPICS.STREAMER_MESSAGES.STATUS_QUERY)
+async def _streamer_msg_status_query(msg, hub: Hub, name: str) -> bool:
+    # explicit query (Hub.request): reply even if not changed
+    global streamer_status_published
+    status_string, running = is_streaming(name=name)
+    streamer_status_published = running
+    status_reply = message_streamer_status_reply(
+        status_str=status_string, running=running)
+    hub.publish(topic=TOPICS.CONTROL, message=status_reply)
+    return True
+
+
+@streamer_dispatch.on(TOPICS.COMMON_MESSAGES.EXIT)
+async def _streamer_msg_exit(msg, hub: Hub, name: str) -> bool:
+    # EXIT - rememeber to stop child processes!
+    await _streamer_stop(name=name)
+    return False
+
+
+@streamer_dispatch.on(TOPICS.STREAMER_MESSAGES.STOP)
+async def _streamer_msg_stop(msg, hub: Hub, name: str) -> bool:
+    logger.info("streamer_coro: %s message stop on msg: '%s'",
+                name, msg)
+    # Rememeber to stop child processes!
+    await _streamer_stop(name=name)
+    logger.debug("await _streamer_stop - done")
+    _publish_streamer_status(hub, name=name)
+    return True
+
+
+@streamer_dispatch.otherwise
+async def _streamer_msg_unknown(msg, hub: Hub, name: str) -> bool:
+    logger.warning("%s: unknown message '%s':%s",
+                   name, msg, type(msg))
+    return True
+
+
 # ------------------------------------------------------------------
 # Corourintine listening on topic
 
+
 async def streamer_coro(
         name: str,
         hub: Hub,
@@ -198,6 +394,9 @@ async def streamer_coro(
     - STREAM_START
     - STREAM_STOP
     - STATUS_QUERY : -> publish on TOPICS.CONTROL
+
+    Publishes streamer status on TOPICS.CONTROL when streamer
+    starts, stops or dies.
     - EXIT
 
     Parameters
@@ -215,57 +414,17 @@ async def streamer_coro(
 
     """
     logger.info("streamer_coro '%s' has decided to subscribe now!", name)
-    global runner_task
 
-    with Subscription(hub, topic=topic) as queue:
-        msg = ""
-        while msg not in [TOPICS.COMMON_MESSAGES.EXIT]:
+    stats = hub.stats
+    with Subscription(hub, topic=topic, name=name) as queue:
+        goon = True
+        while goon:
             msg = await queue.get()
 
             logger.debug("streamer_coro: %s got msg: '%s'", name, msg)
-
-            if is_message_type(msg, TOPICS.STREAMER_MESSAGES.START):
-                # Maybe stop previous stream
-                _, running = is_streaming(name=name)
-                await _streamer_stop(name=name)
-
-                if running:
-                    # short sleep befero starting new stream
-                    await asyncio.sleep(2)
-
-                # START - streaming
-                msg_start = cast(MsgStreamerStart, msg)
-                logger.info(
-                    "streamer_coro: start streaming from url '%s'", msg_start.url)
-                runner_task = asyncio.create_task(
-                    _streamer_run(url=msg_start.url))
-
-            elif is_message_type(msg, TOPICS.STREAMER_MESSAGES.STATUS_QUERY):
-                # STATUS_QUERY
-                status_string, running = is_streaming(name=name)
-                status_reply = message_create(
-                    d={"status_str": status_string,
-                       "running": running,
-                       },
-                    message_type=TOPICS.CONTROL_MESSAGES.STREAMER_STATUS_REPLY
-                )
-                hub.publish(topic=TOPICS.CONTROL, message=status_reply)
-
-            elif is_message_type(msg, TOPICS.COMMON_MESSAGES.EXIT):
-                # EXIT - rememeber to stop child processes!
-                await _streamer_stop(name=name)
-                break
-            elif is_message_type(msg, TOPICS.STREAMER_MESSAGES.STOP):
-                # STOP
-                logger.info("streamer_coro: %s message stop on msg: '%s'",
-                            name, msg)
-                # Rememeber to stop child processes!
-                await _streamer_stop(name=name)
-                logger.debug("await _streamer_stop - done")
-                # Send signal to the running process
-            else:
-                logger.warning("%s: unknown message '%s':%s",
-                               name, msg, type(msg))
+            start = stats.handling()
+            goon = await streamer_dispatch.dispatch(msg, hub=hub, name=name)
+            stats.handled(name, msg, start)
 
     exit_msg = f"streamer_coro '{name}' is exiting on '{msg=}'"
     logger.info("'%s' exit_msg: '%s'", name, exit_msg)
@@ -19,6 +19,11 @@ except ModuleNotFoundError:
     pass
 from PIL import Image
 
+try:
+    from .constants import APP_CONTEXT
+except ImportError:
+    from constants import APP_CONTEXT
+
 SCREEN_WIDTH = LCD.LCD_WIDTH
 SCREEN_HEIGHT = LCD.LCD_HEIGHT
 
@@ -31,6 +36,9 @@ logger = logging.getLogger(__name__)
 class TFT_DRIVER:
     """Async driver for ILI9486."""
 
+    # Keyboard burst window (secs) for screen updates
+    KEY_BURST_WINDOW = APP_CONTEXT.KEYBOARD_BURST.TFT
+
     def __init__(self, dc: int, spi_bus: int, spi_device: int, rst: int = None, ):
         logger.info("Display.init: dc='%s', rst='%s'", dc, rst)
         # GPIO.setmode(GPIO.BCM)
@@ -6,10 +6,10 @@ import asyncio
 import io
 import os
 import glob
-import subprocess
 import shutil
 import re
 import socket
+import tempfile
 import urllib.request
 from urllib.parse import urlparse
 from urllib.request import urlopen
@@ -17,6 +17,7 @@ from urllib.error import HTTPError
 from typing import Generator
 
 from .constants import APP_CONTEXT
+from .os_command import command_executor
 
 logger = logging.getLogger(__name__)
 
@@ -59,22 +60,55 @@ def delegates(method_names, to):
 # check_inet
 
 
-async def check_inet(url: str = "www.google.com", port: int = 80):
-    """Async check for internet connectivity.
+# Map (host, port) -> (expires, resolved address) for 'check_inet'
+_inet_addresses = {}
+
+
+async def _inet_address(url: str, port: int) -> str:
+    """Return address for 'url', resolved at most once per
+    'APP_CONTEXT.NETWORK_MONITOR.DNS_TTL' secs."""
+    now = asyncio.get_running_loop().time()
+    cached = _inet_addresses.get((url, port))
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        url, port, type=socket.SOCK_STREAM)
+    address = infos[0][4][0]
+    _inet_addresses[(url, port)] = (
+        now + APP_CONTEXT.NETWORK_MONITOR.DNS_TTL, address)
+    return address
+
+
+async def check_inet(url: str = APP_CONTEXT.NETWORK_MONITOR.PROBE_HOST,
+                     port: int = APP_CONTEXT.NETWORK_MONITOR.PROBE_PORT,
+                     timeout: float = APP_CONTEXT.NETWORK_MONITOR.PROBE_TIMEOUT):
+    """Async check for internet connectivity: TCP connect to 'url'
+    (DNS cached), connection closed right away.
 
     :url: address to monitor (default www.google.com)
 
     :port: to use in check (default 80)
     """
+    writer = None
     try:
         logger.debug(
             "use url: %s to check inet connection on port=%s", url, port)
-        # await asyncio.to_thread(request.urlopen(url))
-        reader, writer = await asyncio.open_connection(url, port)
+        address = await asyncio.wait_for(_inet_address(url, port), timeout)
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(address, port), timeout)
         status = True
     except Exception as err:
         logger.info("err: %s", err)
+        # address may have changed
+        _inet_addresses.pop((url, port), None)
         status = False
+    finally:
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
 
     logger.debug("Check_inet: status= %s, url=%s", status, url)
     return status
@@ -83,26 +117,35 @@ async def check_inet(url: str = "www.google.com", port: int = 80):
 # ------------------------------------------------------------------
 
 
-def current_ssid() -> str:
-    """Return SSID for current network connection.
+# SSID of current connection, refreshed by 'refresh_current_ssid'
+_current_ssid: str | None = None
 
-    :return: emtpy string if no current SSID 
 
-    """
-    os_command = "iwgetid"
-    result = subprocess.run(os_command, shell=True,
-                            capture_output=True,
-                            encoding="UTF-8")
+def parse_iwgetid(stdout: str) -> str:
+    """SSID in 'iwgetid' output, empty string if none."""
+    matchi = re.search(r'ESSID:"(?P<ssid>[^"]*)"', stdout)
+    return matchi["ssid"] if matchi else ""
+
 
-    pattern = r'ESSID:"(?P<ssid>\w+)"'
-    matchi = re.search(pattern, result.stdout)
-    ssid = ""
-    if matchi:
-        ssid = matchi["ssid"]
+async def refresh_current_ssid() -> str:
+    """Read SSID for current network connection (without blocking
+    event loop) to 'current_ssid'."""
+    global _current_ssid
+    result = await command_executor.run(["iwgetid"])
+    _current_ssid = parse_iwgetid(result.stdout)
+    logger.info("refresh_current_ssid: ssid='%s'", _current_ssid)
+    return _current_ssid
 
-    logger.info("current_ssid: stdoud='%s'", result.stdout)
-    logger.info("current_ssid: ssid='%s'", ssid)
-    return ssid
+
+def current_ssid() -> str:
+    """Return SSID for current network connection (as of latest
+    'refresh_current_ssid', network monitor refreshes it on network
+    changes).
+
+    :return: emtpy string if no current SSID
+
+    """
+    return _current_ssid or ""
 
 
 def current_IP() -> str:
@@ -155,6 +198,39 @@ def copy_files_with_wildcard(src_dir: str, dest_dir: str, pattern: str):
             shutil.copy(file_path, dest_dir)
             print(f"Copied: {file_path} -> {dest_dir}")
 
+# ------------------------------------------------------------------
+# write_file_atomic
+
+
+def write_file_atomic(path: str, content: str | bytes, encoding: str = "UTF-8"):
+    """Replace 'path' with 'content' so that readers (or power cut)
+    never see a truncated file.
+
+    Writes temporary file in the same directory, fsyncs it, renames
+    it over 'path' and fsyncs the directory.
+
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content.encode(encoding) if isinstance(content, str) else content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
 # ------------------------------------------------------------------
 # copy_file_or_directorty
 
@@ -186,7 +262,7 @@ def _copy_http(src_url: str, dest_path: str) -> str:
 
     with open(tempfile, "wb") as fhandle:
         with urllib.request.urlopen(src_url) as response:
-            fhandle.write(response.read())
+            shutil.copyfileobj(response, fhandle, 64 * 1024)
 
     dest_path = os.path.join(dest_dir, filename)
     shutil.move(tempfile, dest_path)
@@ -236,7 +312,7 @@ def read_url(url: str) -> str | None:
 # run script
 
 
-def set_wifi_password(ssid: str, password: str):
+async def set_wifi_password(ssid: str, password: str) -> bool:
     """Choose wifi ssid/configure ssid/password.
 
     :password: if empty choose 'ssid' (assumed that it has been
@@ -244,62 +320,41 @@ def set_wifi_password(ssid: str, password: str):
 
     Use wrapper script to set 'password' for 'ssid' -wifi.
 
+    :return: False in failure
     """
     script = APP_CONTEXT.STREAMER_SCRIPT
     script_command = APP_CONTEXT.STREAMER_COMMANDS.WIFI_SETUP
-    os_command = f"{script} {script_command} {ssid} {password}"
-    status = _run_os_command(os_command)
-    if not status:
-        logger.error("set_wifi_password: error in running='%s'", os_command)
-
-
-def download_extract_pending(url: str):
-    """Download from firmware from remote repo url and make it pending.
-
-    """
-    script = APP_CONTEXT.STREAMER_SCRIPT
-    script_command = APP_CONTEXT.STREAMER_COMMANDS.FIRMWARE_ACTIVATE
-    os_command = f"{script} {script_command} {url}"
-    status = _run_os_command(os_command)
-    if not status:
-        logger.error("download_extract_pending: error in running='%s'",
-                     os_command)
+    args = [script, script_command, ssid] + ([password] if password else [])
+    result = await command_executor.run(args)
+    if not result.ok:
+        logger.error("set_wifi_password: error in running script_command='%s', ssid='%s'",
+                     script_command, ssid)
+    return result.ok
 
 
 # ------------------------------------------------------------------
 # send dmesg
 
-def send_dmesg(msg: str):
-    script = APP_CONTEXT.STREAMER_SCRIPT
-    os_command = f'{script} dmesg "{msg}"'
-    _run_os_command(os_command=os_command)
-
-
-def _run_os_command(os_command: str) -> bool:
-    """Run 'os_command' in shell.
+def send_dmesg(msg: str, loop: asyncio.AbstractEventLoop | None = None) -> bool:
+    """Write 'msg' to kernel log 'APP_CONTEXT.OS_COMMAND.KMSG'.
 
-    Log errors on failure
+    Written in-process, if not permitted 'sudo tee' is submitted to
+    'command_executor' (in 'loop' when called from other thread).
 
-    :return: False in failure
+    :return: True if written in-process
     """
+    line = f"{APP_CONTEXT.OS_COMMAND.KMSG_PREFIX}: {msg}\n"
+    try:
+        with open(APP_CONTEXT.OS_COMMAND.KMSG, "w", encoding="utf-8") as f:
+            f.write(line)
+        return True
+    except OSError as e:
+        logger.info("send_dmesg: error='%s' - use sudo", e)
+    command_executor.submit(
+        ["sudo", "-n", "tee", APP_CONTEXT.OS_COMMAND.KMSG],
+        loop=loop, input=line)
+    return False
 
-    logger.info("_run_os_command: os_command='%s'", os_command)
-
-    result = subprocess.run(os_command, shell=True,
-                            capture_output=True,
-                            encoding="UTF-8")
-    if result.returncode != 0:
-        logger.error("_run_os_command: returncode: %s stdout='%s'",
-                     result.returncode, result.stdout)
-        logger.error("_run_os_command: returncode: %s stderr='%s'",
-                     result.returncode, result.stderr)
-    else:
-        logger.info("_run_os_command: returncode: %s stdout='%s'",
-                    result.returncode, result.stdout)
-        logger.info("_run_os_command: returncode: %s stderr='%s'",
-                    result.returncode, result.stderr)
-
-    return result.returncode == 0
 
 # Stadalone test
 
@@ -1,24 +1,163 @@
 # https://raspberrypi.stackexchange.com/questions/7686/detect-available-open-wifi-networks-using-python
+"""Wifi network scanning.
 
+'iwlist <interface> scanning' is run as asyncio subprocess, its
+output parsed to 'WifiNetwork' entries (SSID, signal, frequency,
+security), strongest signal first.
+
+'wifi_scanner' keeps latest results for 'APP_CONTEXT.WIFI_SCAN.TTL'
+secs: menus show cached results right away while a refresh runs in
+background.
+
+"""
+
+from dataclasses import dataclass
 from typing import List
+import asyncio
 import re
-import os
+import subprocess
+import time
 
 import logging
+
+from .constants import APP_CONTEXT
+from .helpers import background_task
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class WifiNetwork:
+    """Wifi network found in scan"""
+    ssid: str
+    signal: float | None = None      # dBm
+    frequency: float | None = None   # GHz
+    security: str = "open"           # open, WEP, WPA, WPA2
+
+
+def _cell_network(cell: str) -> WifiNetwork | None:
+    """Parse one 'Cell NN - Address' block of iwlist output."""
+    essid = re.search(r'ESSID:"(.*)"', cell)
+    if essid is None or re.fullmatch(r"(\\x00)*", essid.group(1)):
+        # hidden network
+        return None
+    signal = re.search(r"Signal level[=:]\s*(-?\d+(?:\.\d+)?)\s*dBm", cell)
+    frequency = re.search(r"Frequency[=:]\s*(\d+(?:\.\d+)?)\s*GHz", cell)
+    if re.search(r"Encryption key:on", cell) is None:
+        security = "open"
+    elif re.search(r"IEEE 802\.11i/WPA2", cell):
+        security = "WPA2"
+    elif re.search(r"IE:\s*WPA Version", cell):
+        security = "WPA"
+    else:
+        security = "WEP"
+    return WifiNetwork(
+        ssid=essid.group(1),
+        signal=float(signal.group(1)) if signal else None,
+        frequency=float(frequency.group(1)) if frequency else None,
+        security=security)
+
+
+def rank_wifis(networks: List[WifiNetwork]) -> List[WifiNetwork]:
+    """One entry per SSID (strongest access point), strongest first."""
+    best = {}
+    for network in networks:
+        current = best.get(network.ssid)
+        if current is None or (network.signal or -999) > (current.signal or -999):
+            best[network.ssid] = network
+    return sorted(best.values(),
+                  key=lambda network: (-(network.signal or -999), network.ssid))
+
+
+def parse_iwlist(output: str) -> List[WifiNetwork]:
+    """Return ranked networks in 'iwlist scanning' 'output'."""
+    cells = re.split(r"\n\s*Cell \d+ - ", output)[1:]
+    networks = [n for n in (_cell_network(cell) for cell in cells) if n is not None]
+    return rank_wifis(networks)
+
+
+def _scan_command(interface: str) -> List[str]:
+    return [*APP_CONTEXT.WIFI_SCAN.COMMAND, interface, "scanning"]
+
+
+async def scan_wifis(interface: str = APP_CONTEXT.WIFI_SCAN.INTERFACE) -> List[WifiNetwork]:
+    """Scan wifi networks without blocking event loop.
+
+    :raises: RuntimeError if scan fails or times out
+    """
+    command = _scan_command(interface)
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(), APP_CONTEXT.WIFI_SCAN.TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RuntimeError(f"scan_wifis: timeout in '{' '.join(command)}'")
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"scan_wifis: '{' '.join(command)}' failed: {stderr.decode(errors='replace')}")
+    networks = parse_iwlist(stdout.decode("utf-8", errors="replace"))
+    logger.info("scan_wifis: networks='%s'", networks)
+    return networks
+
+
+class WifiScanner:
+    """Latest scan results, refreshed in background."""
+
+    def __init__(self, ttl: float = APP_CONTEXT.WIFI_SCAN.TTL,
+                 interface: str = APP_CONTEXT.WIFI_SCAN.INTERFACE):
+        self.ttl = ttl
+        self.interface = interface
+        self.networks: List[WifiNetwork] | None = None
+        self.scanned_at: float | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def stale(self) -> bool:
+        return self.scanned_at is None or time.monotonic() - self.scanned_at > self.ttl
+
+    def cached(self) -> List[WifiNetwork] | None:
+        """Latest results (possibly stale), None if never scanned."""
+        return self.networks
+
+    def refresh_in_background(self) -> asyncio.Task | None:
+        """Start scan unless results are fresh or scan is running.
+
+        :return: running scan task, None if results are fresh
+        """
+        if self.task is not None and not self.task.done():
+            return self.task
+        if not self.stale:
+            return None
+        self.task = background_task(self._refresh(), name="wifi-scan")
+        return self.task
+
+    async def scan(self) -> List[WifiNetwork]:
+        """Return fresh results (waits for running scan)."""
+        task = self.refresh_in_background()
+        if task is not None:
+            await task
+        return self.networks or []
+
+    async def _refresh(self) -> List[WifiNetwork]:
+        self.networks = await scan_wifis(self.interface)
+        self.scanned_at = time.monotonic()
+        return self.networks
+
+
+wifi_scanner = WifiScanner()
+
+
 def list_wifis() -> List[str]:
-    """Return list of wife networks found."""
-    # os.popen(): https://www.tutorialspoint.com/python3/os_popen.htm
-    networks = os.popen('sudo iwlist wlan0 scanning | grep ESSID').read()
-    # Parse all found networks list in a clean list 'networkslist'
-    networkslist = re.findall(r'"(.+?)"', networks)
-    networkset = set(networkslist)
-    logger.info("list_wifis: networks='%s', networkslist=%s, networkset=%s",
-                networks, networkslist, networkset)
-
-    return list(networkset)
+    """Return SSIDs of wifi networks found, strongest first (blocks,
+    see 'wifi_scanner' for event loop use)."""
+    result = subprocess.run(_scan_command(APP_CONTEXT.WIFI_SCAN.INTERFACE),
+                            capture_output=True, text=True)
+    networks = parse_iwlist(result.stdout)
+    logger.info("list_wifis: networks='%s'", networks)
+    return [network.ssid for network in networks]
 
 
 def main():
@@ -0,0 +1,110 @@
+"""Loading YAML configuration files with binary snapshots.
+
+YAML is parsed with libyaml C loader ('yaml.CSafeLoader') when PyYAML
+has been built with it, pure Python 'yaml.SafeLoader' otherwise.
+
+Parsed content of a YAML file 'path' is stored in a marshal snapshot
+'.<name>.snap' next to it. Snapshot is keyed by path, mtime, ctime,
+size and inode of the YAML file: when the key matches, YAML parsing
+is skipped altogether. Any mismatch (or unreadable snapshot) falls back to
+parsing YAML and rewriting the snapshot.
+
+Content, which marshal cannot represent (e.g. YAML timestamps) is
+not snapshotted.
+
+"""
+
+from typing import Any, Tuple
+import marshal
+import os
+
+import yaml
+
+import logging
+
+from .constants import APP_CONTEXT
+from .utils import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# C loader/dumper if available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# ------------------------------------------------------------------
+# Parsing
+
+
+def yaml_load(yaml_str: str) -> Any:
+    """Parse 'yaml_str' (safe loader)."""
+    return yaml.load(yaml_str, Loader=YamlLoader)
+
+# ------------------------------------------------------------------
+# Snapshots
+
+
+def snapshot_path(path: str) -> str:
+    """Return snapshot file path for YAML 'path'."""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}{APP_CONTEXT.YAML_SNAPSHOT.SUFFIX}")
+
+
+def _snapshot_key(path: str) -> Tuple | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_ctime_ns,
+            st.st_size, st.st_ino)
+
+
+def _read_snapshot(path: str, key: Tuple) -> Tuple[bool, Any]:
+    """Return (True, data) if snapshot for 'path' matches 'key'."""
+    try:
+        with open(snapshot_path(path), "rb") as f:
+            version, snapshot_key, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return False, None
+    if version != APP_CONTEXT.YAML_SNAPSHOT.VERSION or snapshot_key != key:
+        return False, None
+    return True, data
+
+
+def _write_snapshot(path: str, key: Tuple, data: Any):
+    try:
+        content = marshal.dumps(
+            (APP_CONTEXT.YAML_SNAPSHOT.VERSION, key, data))
+        write_file_atomic(snapshot_path(path), content)
+    except (ValueError, OSError) as e:
+        logger.info("_write_snapshot: path='%s', not snapshotted: %s", path, e)
+
+
+def load_yaml_file(path: str) -> Any:
+    """Return parsed content of YAML file 'path' (from snapshot if
+    'path' unchanged).
+
+    :raises: FileNotFoundError if 'path' does not exist
+
+    """
+    key = _snapshot_key(path)
+    if key is None:
+        raise FileNotFoundError(path)
+    found, data = _read_snapshot(path, key)
+    if found:
+        logger.debug("load_yaml_file: path='%s' from snapshot", path)
+        return data
+
+    logger.info("load_yaml_file: path='%s' parse YAML", path)
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml_load(f.read())
+    _write_snapshot(path, key, data)
+    return data
+
+
+def dump_yaml_file(path: str, data: Any):
+    """Write 'data' atomically as YAML to 'path' and refresh its
+    snapshot (next load does not parse YAML)."""
+    write_file_atomic(path, yaml.dump(data, Dumper=YamlDumper))
+    key = _snapshot_key(path)
+    if key is not None:
+        _write_snapshot(path, key, data)